@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+import time
+
+# Añadir el directorio 'backend' al path para importar las cachés
+sys.path.append(os.path.dirname(__file__))
+from cache_sqlite import CacheSQLite, DIRECTORIO_CACHE
+from directorio_empresas import CacheTTL
+
+# --- Caché Persistente de Consultas de RUC ---
+# Cada consulta a datosperu.org abre un Chrome headless y tarda varios segundos. Los resultados
+# se guardan en SQLite (sobreviven reinicios y se comparten entre procesos) con vencimiento, y
+# delante hay una copia en memoria para que las repeticiones dentro del proceso no toquen el disco.
+# Los RUCs sin datos también se recuerdan, con un TTL más corto; los errores nunca se guardan.
+
+RUTA_CACHE_RUC = os.path.join(DIRECTORIO_CACHE, "ruc.sqlite3")
+VERSION_CACHE_RUC = "3" # Cambiarla si cambia el formato de lo que devuelven las fuentes
+TTL_RUC_SEGUNDOS = 30 * 24 * 60 * 60
+TTL_RUC_NO_ENCONTRADO_SEGUNDOS = 24 * 60 * 60
+TAMANO_MAXIMO_MEMORIA = 5000
+
+# Fuentes conocidas (nombre usado en la clave de la caché)
+FUENTES = ('datosperu_ficha', 'datosperu_buscador')
+
+ENCONTRADO = 'encontrado'
+NO_ENCONTRADO = 'no_encontrado'
+ERROR = 'error'
+
+_cache_disco = None
+_cache_memoria = CacheTTL(TTL_RUC_SEGUNDOS, TAMANO_MAXIMO_MEMORIA)
+_lock = threading.Lock()
+
+def obtener_cache_ruc() -> CacheSQLite:
+    """Caché en disco de consultas de RUC, creada en el primer uso."""
+    global _cache_disco
+    if _cache_disco is None:
+        with _lock:
+            if _cache_disco is None:
+                _cache_disco = CacheSQLite(RUTA_CACHE_RUC, VERSION_CACHE_RUC, max_entradas=50000, tabla="ruc")
+    return _cache_disco
+
+def consultar_con_cache(fuente: str, ruc: str, consultar, clasificar):
+    """
+    Devuelve el resultado de 'consultar(ruc)' para la fuente dada, pasando primero por la caché.
+    'clasificar(resultado)' indica si es ENCONTRADO, NO_ENCONTRADO o ERROR; solo los dos primeros
+    se guardan, cada uno con su TTL.
+    """
+    clave = f"{fuente}:{str(ruc).strip()}"
+    resultado = _cache_memoria.obtener(clave)
+    if resultado is not None:
+        return resultado
+
+    entrada = obtener_cache_ruc().obtener(clave)
+    if entrada is not None:
+        restante = entrada["vence_en"] - time.time()
+        if restante > 0:
+            _cache_memoria.guardar(clave, entrada["resultado"], ttl_segundos=restante)
+            return entrada["resultado"]
+        obtener_cache_ruc().eliminar(clave)
+
+    resultado = consultar(ruc)
+    estado = clasificar(resultado)
+    if estado != ERROR:
+        ttl = TTL_RUC_SEGUNDOS if estado == ENCONTRADO else TTL_RUC_NO_ENCONTRADO_SEGUNDOS
+        obtener_cache_ruc().guardar(clave, {"resultado": resultado, "vence_en": time.time() + ttl})
+        _cache_memoria.guardar(clave, resultado, ttl_segundos=ttl)
+    return resultado
+
+def invalidar_ruc(ruc: str, fuente: str = None) -> None:
+    """Olvida lo guardado para un RUC (en una fuente, o en todas si fuente es None)."""
+    fuentes = [fuente] if fuente else list(FUENTES)
+    for nombre in fuentes:
+        clave = f"{nombre}:{str(ruc).strip()}"
+        obtener_cache_ruc().eliminar(clave)
+        _cache_memoria.eliminar(clave)
+
+def estadisticas_cache_ruc() -> dict:
+    return {"memoria": _cache_memoria.estadisticas(), "disco": obtener_cache_ruc().estadisticas()}
@@ -0,0 +1,115 @@
+import contextlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+# --- Caché Persistente en SQLite ---
+# Almacén clave -> valor JSON en un archivo SQLite local, compartido por procesos y hilos
+# (cada operación abre su propia conexión). Cada entrada guarda la versión con la que se
+# generó: al abrir la caché se descartan las de otras versiones. El tamaño está acotado:
+# al superar 'max_entradas' se eliminan las entradas usadas hace más tiempo (LRU).
+
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(__file__), "cache")
+# El nombre de la tabla se interpola en el SQL (no admite parámetros), así que solo se aceptan identificadores simples
+NOMBRE_TABLA_RE = re.compile(r'^[A-Za-z_]\w*$', re.ASCII)
+
+class CacheSQLite:
+    def __init__(self, ruta: str, version: str, max_entradas: int = 5000, tabla: str = "cache"):
+        """
+        ruta: archivo SQLite (se crea junto con su carpeta si no existe).
+        version: versión del productor de los valores; cambiarla invalida las entradas anteriores.
+        tabla: nombre de la tabla; debe ser un identificador simple (letras, dígitos y '_').
+        """
+        if not isinstance(tabla, str) or not NOMBRE_TABLA_RE.fullmatch(tabla):
+            raise ValueError(f"Nombre de tabla no válido para la caché: {tabla!r}")
+        self.ruta = ruta
+        self.version = version
+        self.max_entradas = max_entradas
+        self.tabla = tabla
+        self.aciertos = 0
+        self.fallos = 0
+
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with self._conectar() as conexion:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.tabla} ("
+                "clave TEXT PRIMARY KEY, version TEXT NOT NULL, valor TEXT NOT NULL, "
+                "creado_en REAL NOT NULL, usado_en REAL NOT NULL)"
+            )
+            conexion.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.tabla}_usado_en ON {self.tabla} (usado_en)")
+        self.invalidar_versiones_anteriores()
+
+    @contextlib.contextmanager
+    def _conectar(self):
+        """Conexión de corta duración: confirma la transacción al salir y siempre se cierra."""
+        conexion = sqlite3.connect(self.ruta, timeout=10)
+        try:
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def obtener(self, clave: str):
+        """Devuelve el valor guardado para 'clave' o None si no existe (o es de otra versión)."""
+        with self._conectar() as conexion:
+            fila = conexion.execute(
+                f"SELECT valor FROM {self.tabla} WHERE clave = ? AND version = ?", (clave, self.version)
+            ).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return None
+            conexion.execute(f"UPDATE {self.tabla} SET usado_en = ? WHERE clave = ?", (time.time(), clave))
+        self.aciertos += 1
+        return json.loads(fila[0])
+
+    def guardar(self, clave: str, valor) -> None:
+        """Guarda 'valor' (serializable a JSON) y aplica el límite de tamaño."""
+        ahora = time.time()
+        with self._conectar() as conexion:
+            conexion.execute(
+                f"INSERT OR REPLACE INTO {self.tabla} (clave, version, valor, creado_en, usado_en) VALUES (?, ?, ?, ?, ?)",
+                (clave, self.version, json.dumps(valor), ahora, ahora)
+            )
+            self._desalojar(conexion)
+
+    def _desalojar(self, conexion: sqlite3.Connection) -> None:
+        """Elimina las entradas menos usadas recientemente que excedan 'max_entradas'."""
+        conexion.execute(
+            f"DELETE FROM {self.tabla} WHERE clave IN ("
+            f"SELECT clave FROM {self.tabla} ORDER BY usado_en DESC LIMIT -1 OFFSET ?)",
+            (self.max_entradas,)
+        )
+
+    def eliminar(self, clave: str) -> None:
+        with self._conectar() as conexion:
+            conexion.execute(f"DELETE FROM {self.tabla} WHERE clave = ?", (clave,))
+
+    def invalidar_versiones_anteriores(self) -> int:
+        """Elimina las entradas generadas con otra versión. Devuelve cuántas se eliminaron."""
+        with self._conectar() as conexion:
+            return conexion.execute(f"DELETE FROM {self.tabla} WHERE version != ?", (self.version,)).rowcount
+
+    def limpiar(self) -> None:
+        """Vacía la caché y reinicia sus contadores."""
+        with self._conectar() as conexion:
+            conexion.execute(f"DELETE FROM {self.tabla}")
+        self.aciertos = 0
+        self.fallos = 0
+
+    def estadisticas(self) -> dict:
+        with self._conectar() as conexion:
+            entradas = conexion.execute(f"SELECT COUNT(*) FROM {self.tabla}").fetchone()[0]
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+            "entradas": entradas,
+            "max_entradas": self.max_entradas,
+            "version": self.version
+        }
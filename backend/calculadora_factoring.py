@@ -2,6 +2,12 @@
 
 import datetime
 import math
+import os
+import sys
+
+# Añadir el directorio 'backend' al path para importar la tabla de factores compartida
+sys.path.append(os.path.dirname(__file__))
+from factor_interes import factor_interes_compuesto
 
 def calcular_desembolso_inicial(
     plazo_operacion: int,
@@ -32,8 +38,7 @@ def calcular_desembolso_inicial(
     capital = valor_neto_real * tasa_avance
 
     # --- Paso 2: Calcular Intereses (COMPUESTO) ---
-    tasa_diaria = interes_mensual / 30
-    interes = capital * (((1 + tasa_diaria) ** plazo_operacion) - 1)
+    interes = capital * factor_interes_compuesto(interes_mensual, plazo_operacion)
     igv_interes = interes * igv_pct
 
     # --- Paso 3: Comisión de estructuración ---
@@ -105,8 +110,7 @@ def encontrar_tasa_de_avance(
 
     # --- Lógica de Cálculo Inverso ---
     # Factores de costo
-    tasa_diaria = interes_mensual / 30
-    factor_interes = ((1 + tasa_diaria) ** plazo_operacion) - 1
+    factor_interes = factor_interes_compuesto(interes_mensual, plazo_operacion)
     factor_comision_estructuracion = comision_estructuracion_pct
 
     # Costo total como un factor del capital
@@ -4,6 +4,13 @@
 import datetime
 import math
 import json
+import os
+import sys
+import numpy as np
+
+# Añadir el directorio 'backend' al path para importar la tabla de factores compartida
+sys.path.append(os.path.dirname(__file__))
+from factor_interes import factor_interes_compuesto, factores_interes_compuesto
 
 def calcular_desembolso_inicial(
     plazo_operacion: int,
@@ -19,34 +26,31 @@ def calcular_desembolso_inicial(
     """
     Función adaptadora para mantener compatibilidad con interfaces antiguas (como Streamlit)
     que envían una factura a la vez.
+    Un lote de una sola factura no necesita el motor columnar: la decisión agregada de comisión
+    se reduce a comparar la comisión porcentual con la mínima, y el desglose usa el camino escalar.
     """
-    # 1. Empaquetar los argumentos de la factura individual en un diccionario.
-    datos_factura = {
-        "plazo_operacion": plazo_operacion,
-        "mfn": mfn,
-        "tasa_avance": tasa_avance,
-        "interes_mensual": interes_mensual,
-        "comision_estructuracion_pct": comision_estructuracion_pct,
-        "comision_minima_aplicable": comision_minima_aplicable,
-        "igv_pct": igv_pct,
-        "comision_afiliacion_aplicable": comision_afiliacion_aplicable,
-        "aplicar_comision_afiliacion": aplicar_comision_afiliacion
-    }
-
-    # 2. Convertir la factura individual en un lote de una sola factura.
-    lote_de_una_factura = [datos_factura]
-
-    # 3. Llamar a la nueva función de procesamiento de lotes.
-    resultado_lote = procesar_lote_desembolso_inicial(lote_de_una_factura)
-
-    # 4. Extraer y devolver el resultado de la única factura del lote.
-    if resultado_lote and resultado_lote.get("resultados_por_factura"):
-        return resultado_lote["resultados_por_factura"][0]
-    else:
-        # Devuelve el error que pudo haber generado la función de lote
-        return resultado_lote if isinstance(resultado_lote, dict) and "error" in resultado_lote else {
-            "error": "El cálculo para el lote no produjo resultados."
-        }
+    _, comision_estructuracion = _decidir_comision_factura(mfn * tasa_avance, comision_estructuracion_pct, comision_minima_aplicable)
+
+    return _calcular_desglose_factura(
+        plazo_operacion=plazo_operacion,
+        mfn=mfn,
+        tasa_avance=tasa_avance,
+        interes_mensual=interes_mensual,
+        comision_estructuracion_fija=comision_estructuracion,
+        igv_pct=igv_pct,
+        comision_afiliacion_aplicable=comision_afiliacion_aplicable,
+        aplicar_comision_afiliacion=aplicar_comision_afiliacion
+    )
+
+def _decidir_comision_factura(capital: float, comision_estructuracion_pct: float, comision_minima_aplicable: float) -> tuple:
+    """
+    Decisión de comisión de UNA factura (la del lote cuando el lote tiene una sola factura).
+    Devuelve (metodo, comision_estructuracion).
+    """
+    comision_porcentual = capital * comision_estructuracion_pct
+    if comision_porcentual > comision_minima_aplicable:
+        return "PORCENTAJE", comision_porcentual
+    return "PRORRATEADO", comision_minima_aplicable
 
 def _calcular_desglose_factura(
     plazo_operacion: int,
@@ -61,14 +65,15 @@ def _calcular_desglose_factura(
     """
     Calcula los detalles de una operación de factoring para UNA factura.
     Esta es una función auxiliar que asume que la lógica de comisión ya fue resuelta.
+    Camino escalar (sin NumPy) para el caso común de una sola factura; aplica las mismas
+    fórmulas que '_calcular_columnas_desglose'.
     """
     if plazo_operacion < 0:
         return {"error": "El plazo de operación no puede ser negativo."}
 
     valor_neto_real = mfn
     capital = valor_neto_real * tasa_avance
-    tasa_diaria = interes_mensual / 30
-    interes = capital * (((1 + tasa_diaria) ** plazo_operacion) - 1)
+    interes = capital * factor_interes_compuesto(interes_mensual, plazo_operacion)
     igv_interes = interes * igv_pct
 
     # La comisión de estructuración ahora es un valor fijo que se pasa como argumento
@@ -101,60 +106,169 @@ def _calcular_desglose_factura(
         "plazo_operacion": plazo_operacion
     }
 
+def _calcular_columnas_desglose(
+    plazo_operacion: np.ndarray,
+    mfn: np.ndarray,
+    tasa_avance: np.ndarray,
+    interes_mensual: np.ndarray,
+    comision_estructuracion: np.ndarray,
+    igv_pct: np.ndarray,
+    comision_afiliacion: np.ndarray
+) -> dict:
+    """
+    Núcleo vectorizado del desglose: aplica las fórmulas de una factura a columnas completas.
+    La comisión de afiliación llega ya en cero para las facturas que no la aplican.
+    """
+    valor_neto_real = mfn
+    capital = valor_neto_real * tasa_avance
+    interes = capital * factores_interes_compuesto(interes_mensual, plazo_operacion)
+    igv_interes = interes * igv_pct
+
+    igv_comision = comision_estructuracion * igv_pct
+    abono_real_teorico = capital - interes - igv_interes - comision_estructuracion - igv_comision
+
+    igv_afiliacion = comision_afiliacion * igv_pct
+    abono_real_teorico = abono_real_teorico - (comision_afiliacion + igv_afiliacion)
+
+    return {
+        "capital": capital,
+        "interes": interes,
+        "igv_interes": igv_interes,
+        "comision_estructuracion": comision_estructuracion,
+        "igv_comision": igv_comision,
+        "comision_afiliacion": comision_afiliacion,
+        "igv_afiliacion": igv_afiliacion,
+        "abono_real_teorico": abono_real_teorico,
+        "monto_desembolsado": np.floor(abono_real_teorico),
+        "margen_seguridad": valor_neto_real - capital,
+        "plazo_operacion": plazo_operacion
+    }
+
+def _columna_numerica(nombre: str, valores, dtype=float) -> np.ndarray:
+    """
+    Convierte una columna de entrada a arreglo. NumPy convertiría None en NaN (o en un arreglo de
+    objetos) y el error aparecería como montos NaN; aquí se rechaza igual que en el cálculo escalar.
+    """
+    if valores is None or (isinstance(valores, (list, tuple)) and any(valor is None for valor in valores)):
+        raise TypeError(f"'{nombre}' debe ser numérico en todas las facturas (se recibió None).")
+    return np.asarray(valores, dtype=dtype)
+
+def calcular_lote_columnar(
+    plazo_operacion,
+    mfn,
+    tasa_avance,
+    interes_mensual,
+    comision_minima_aplicable,
+    comision_estructuracion_pct: float,
+    igv_pct,
+    comision_afiliacion_aplicable=0.0,
+    aplicar_comision_afiliacion=False
+) -> dict:
+    """
+    Motor columnar del desembolso inicial. Recibe arreglos (o escalares, que se expanden)
+    con una posición por factura y calcula todo el lote en una sola pasada vectorizada.
+    La decisión PORCENTAJE/PRORRATEADO se toma como una reducción sobre el capital del lote.
+    Devuelve un diccionario de arreglos NumPy; 'vista_por_factura' lo convierte a la salida clásica.
+    """
+    columnas_entrada = np.broadcast_arrays(
+        _columna_numerica("mfn", mfn),
+        _columna_numerica("tasa_avance", tasa_avance),
+        _columna_numerica("interes_mensual", interes_mensual),
+        _columna_numerica("comision_minima_aplicable", comision_minima_aplicable),
+        _columna_numerica("igv_pct", igv_pct),
+        _columna_numerica("comision_afiliacion_aplicable", comision_afiliacion_aplicable),
+        np.asarray(aplicar_comision_afiliacion, dtype=bool),
+        _columna_numerica("plazo_operacion", plazo_operacion, dtype=None)
+    )
+    mfn, tasa_avance, interes_mensual, comision_minima_aplicable, igv_pct, \
+        comision_afiliacion_aplicable, aplicar_comision_afiliacion, plazo_operacion = columnas_entrada
+
+    # --- FASE 1: Decisión Agregada sobre la Comisión (reducción sobre el lote) ---
+    capital_individual = mfn * tasa_avance
+    comision_prorrateada_total = comision_minima_aplicable.sum()
+    comision_porcentual_agregada = capital_individual.sum() * comision_estructuracion_pct
+
+    if comision_porcentual_agregada > comision_prorrateada_total:
+        metodo_de_comision_elegido = "PORCENTAJE"
+        comision_estructuracion = capital_individual * comision_estructuracion_pct
+    else:
+        metodo_de_comision_elegido = "PRORRATEADO"
+        comision_estructuracion = comision_minima_aplicable
+
+    # --- FASE 2: Desglose de todas las facturas en una sola pasada ---
+    valido = plazo_operacion >= 0
+    columnas = _calcular_columnas_desglose(
+        plazo_operacion=np.where(valido, plazo_operacion, 0),
+        mfn=mfn,
+        tasa_avance=tasa_avance,
+        interes_mensual=interes_mensual,
+        comision_estructuracion=comision_estructuracion,
+        igv_pct=igv_pct,
+        comision_afiliacion=np.where(aplicar_comision_afiliacion, comision_afiliacion_aplicable, 0.0)
+    )
+    columnas["plazo_operacion"] = plazo_operacion
+    columnas["valido"] = valido
+    columnas["metodo_comision_elegido"] = metodo_de_comision_elegido
+    columnas["comision_prorrateada_total"] = float(comision_prorrateada_total)
+    return columnas
+
+def vista_por_factura(columnas: dict) -> list:
+    """
+    Vista fina sobre el resultado columnar: devuelve la lista de diccionarios por factura
+    con el mismo formato (y redondeo) que produce '_calcular_desglose_factura'.
+    """
+    campos_redondeados = [
+        "capital", "interes", "igv_interes", "comision_estructuracion", "igv_comision",
+        "comision_afiliacion", "igv_afiliacion", "abono_real_teorico"
+    ]
+    listas = {campo: columnas[campo].tolist() for campo in campos_redondeados}
+    margenes = columnas["margen_seguridad"].tolist()
+    montos_desembolsados = columnas["monto_desembolsado"].tolist()
+    plazos = columnas["plazo_operacion"].tolist()
+
+    resultados = []
+    for i, es_valido in enumerate(columnas["valido"].tolist()):
+        if not es_valido:
+            resultados.append({"error": "El plazo de operación no puede ser negativo."})
+            continue
+        resultado = {campo: round(listas[campo][i], 2) for campo in campos_redondeados}
+        resultado["monto_desembolsado"] = int(montos_desembolsados[i])
+        resultado["margen_seguridad"] = round(margenes[i], 2)
+        resultado["plazo_operacion"] = plazos[i]
+        resultados.append(resultado)
+    return resultados
+
 def procesar_lote_desembolso_inicial(lote_datos: list) -> dict:
     """
     Orquesta el cálculo del desembolso para un lote de facturas,
     aplicando la lógica de comisión agregada y corrigiendo el total por redondeo.
+    Los datos se pasan a columnas y se calculan con 'calcular_lote_columnar'.
     """
     if not lote_datos:
         return {"error": "El lote de datos no puede estar vacío."}
 
-    # --- FASE 1: Decisión Agregada sobre la Comisión ---
-    capital_total_agregado = 0
-    comision_prorrateada_total = 0
-    
     parametros_generales = lote_datos[0]
     comision_estructuracion_pct = parametros_generales.get("comision_estructuracion_pct", 0)
-    
-    for datos_factura in lote_datos:
-        capital_individual = datos_factura.get("mfn", 0) * datos_factura.get("tasa_avance", 0)
-        capital_total_agregado += capital_individual
-        comision_prorrateada_total += datos_factura.get("comision_minima_aplicable", 0)
 
-    comision_porcentual_agregada = capital_total_agregado * comision_estructuracion_pct
+    columnas = calcular_lote_columnar(
+        plazo_operacion=[datos_factura.get("plazo_operacion") for datos_factura in lote_datos],
+        mfn=[datos_factura.get("mfn", 0) for datos_factura in lote_datos],
+        tasa_avance=[datos_factura.get("tasa_avance", 0) for datos_factura in lote_datos],
+        interes_mensual=[datos_factura.get("interes_mensual") for datos_factura in lote_datos],
+        comision_minima_aplicable=[datos_factura.get("comision_minima_aplicable", 0) for datos_factura in lote_datos],
+        comision_estructuracion_pct=comision_estructuracion_pct,
+        igv_pct=[datos_factura.get("igv_pct") for datos_factura in lote_datos],
+        comision_afiliacion_aplicable=[datos_factura.get("comision_afiliacion_aplicable", 0) for datos_factura in lote_datos],
+        aplicar_comision_afiliacion=[datos_factura.get("aplicar_comision_afiliacion", False) for datos_factura in lote_datos]
+    )
+    resultados_finales = vista_por_factura(columnas)
+    metodo_de_comision_elegido = columnas["metodo_comision_elegido"]
 
-    if comision_porcentual_agregada > comision_prorrateada_total:
-        metodo_de_comision_elegido = "PORCENTAJE"
-    else:
-        metodo_de_comision_elegido = "PRORRATEADO"
-
-    # --- FASE 2: Cálculo Individual con la Decisión ya Tomada ---
-    resultados_finales = []
-    for datos_factura in lote_datos:
-        capital_individual = datos_factura.get("mfn", 0) * datos_factura.get("tasa_avance", 0)
-        
-        if metodo_de_comision_elegido == "PORCENTAJE":
-            comision_para_esta_factura = capital_individual * comision_estructuracion_pct
-        else: # PRORRATEADO
-            comision_para_esta_factura = datos_factura.get("comision_minima_aplicable", 0)
-            
-        resultado_factura = _calcular_desglose_factura(
-            plazo_operacion=datos_factura.get("plazo_operacion"),
-            mfn=datos_factura.get("mfn"),
-            tasa_avance=datos_factura.get("tasa_avance"),
-            interes_mensual=datos_factura.get("interes_mensual"),
-            comision_estructuracion_fija=comision_para_esta_factura,
-            igv_pct=datos_factura.get("igv_pct"),
-            comision_afiliacion_aplicable=datos_factura.get("comision_afiliacion_aplicable", 0),
-            aplicar_comision_afiliacion=datos_factura.get("aplicar_comision_afiliacion", False)
-        )
-        resultados_finales.append(resultado_factura)
-        
     # --- FASE 3: Corrección de Totales por Redondeo ---
     if metodo_de_comision_elegido == "PRORRATEADO":
-        total_comision_corregido = comision_prorrateada_total
+        total_comision_corregido = columnas["comision_prorrateada_total"]
     else:
-        total_comision_corregido = sum(c['comision_estructuracion'] for c in resultados_finales)
+        total_comision_corregido = sum(c['comision_estructuracion'] for c in resultados_finales if 'error' not in c)
 
     return {
         "metodo_comision_elegido": metodo_de_comision_elegido,
@@ -163,34 +277,22 @@ def procesar_lote_desembolso_inicial(lote_datos: list) -> dict:
     }
 
 
-def encontrar_tasa_de_avance(
+def _capitales_por_metodo(
     plazo_operacion: int,
-    mfn: float,
     interes_mensual: float,
     comision_estructuracion_pct: float,
     igv_pct: float,
     monto_objetivo: float,
     comision_minima_aplicable: float,
     comision_afiliacion_aplicable: float = 0.0,
-    aplicar_comision_afiliacion: bool = False,
-    # Parámetros no utilizados de la versión anterior, se mantienen por compatibilidad
-    tasa_avance_min: float = 0.90,
-    tasa_avance_max: float = 1.00,
-    tolerancia: float = 0.01,
-    max_iteraciones: int = 100
-) -> dict:
+    aplicar_comision_afiliacion: bool = False
+) -> tuple:
     """
-    (NOTA: Esta función aún contiene la lógica de comisión individual y necesita ser refactorizada
-    de manera similar a 'procesar_lote_desembolso_inicial' para funcionar por lotes.)
-    Encuentra la tasa de avance necesaria para un monto objetivo, usando la lógica de doble cálculo agnóstica.
+    Resuelve el capital necesario para un monto objetivo bajo los dos supuestos de comisión.
+    Devuelve (factor_interes, capital_porcentaje, capital_minimo_fijo).
     """
-    valor_neto_real = mfn
-    if valor_neto_real == 0:
-        return {"error": "El Monto Neto de Factura (mfn) no puede ser cero."}
+    factor_interes = factor_interes_compuesto(interes_mensual, plazo_operacion)
 
-    tasa_diaria = interes_mensual / 30
-    factor_interes = ((1 + tasa_diaria) ** plazo_operacion) - 1
-    
     costo_fijo_afiliacion = 0.0
     if aplicar_comision_afiliacion:
         costo_fijo_afiliacion = comision_afiliacion_aplicable * (1 + igv_pct)
@@ -209,25 +311,40 @@ def encontrar_tasa_de_avance(
     if (1 - costo_variable_B) > 0:
         capital_B = (monto_objetivo + costos_fijos_totales_B) / (1 - costo_variable_B)
 
-    capital_necesario = max(capital_A, capital_B)
+    return factor_interes, capital_A, capital_B
 
-    capital = capital_necesario
+def _construir_resultado_busqueda(
+    capital: float,
+    valor_neto_real: float,
+    factor_interes: float,
+    comision_estructuracion: float,
+    igv_pct: float,
+    monto_objetivo: float,
+    plazo_operacion: int,
+    comision_afiliacion_aplicable: float = 0.0,
+    aplicar_comision_afiliacion: bool = False,
+    solucion_exacta: dict = None
+) -> dict:
+    """
+    Arma el resultado de la búsqueda de tasa (resultado, cálculo y desglose detallado)
+    a partir del capital encontrado y de la comisión de estructuración ya decidida.
+    Con 'solucion_exacta' (modo "exacto") la tasa se informa sin redondear, junto con su convergencia.
+    """
     interes = capital * factor_interes
     igv_interes = interes * igv_pct
-    
-    comision_estructuracion = max(capital * comision_estructuracion_pct, comision_minima_aplicable)
+
     igv_comision_estructuracion = comision_estructuracion * igv_pct
-    
+
     comision_afiliacion = 0.0
     igv_afiliacion = 0.0
     if aplicar_comision_afiliacion:
         comision_afiliacion = comision_afiliacion_aplicable
         igv_afiliacion = comision_afiliacion * igv_pct
-    
+
     abono_real = capital - interes - igv_interes - comision_estructuracion - igv_comision_estructuracion - comision_afiliacion - igv_afiliacion
     margen_seguridad = valor_neto_real - capital
     total_igv = igv_interes + igv_comision_estructuracion + igv_afiliacion
-    
+
     tasa_avance_encontrada = capital / valor_neto_real if valor_neto_real else 0
 
     desglose_final_detallado = {}
@@ -241,12 +358,19 @@ def encontrar_tasa_de_avance(
             "margen_seguridad": { "monto": round(margen_seguridad, 2), "porcentaje": round((margen_seguridad / valor_neto_real) * 100, 3) }
         }
 
+    resultado_busqueda = {
+        "tasa_avance_encontrada": round(tasa_avance_encontrada, 6),
+        "abono_real_calculado": round(abono_real, 2),
+        "monto_objetivo": monto_objetivo
+    }
+    if solucion_exacta is not None:
+        # La tasa redondeada a 6 decimales no reproduce el objetivo al céntimo en montos grandes
+        resultado_busqueda["tasa_avance_encontrada"] = solucion_exacta["tasa_avance"]
+        resultado_busqueda["convergio"] = solucion_exacta["convergio"]
+        resultado_busqueda["iteraciones"] = solucion_exacta["iteraciones"]
+
     return {
-        "resultado_busqueda": {
-            "tasa_avance_encontrada": round(tasa_avance_encontrada, 6),
-            "abono_real_calculado": round(abono_real, 2),
-            "monto_objetivo": monto_objetivo
-        },
+        "resultado_busqueda": resultado_busqueda,
         "calculo_con_tasa_encontrada": {
             "capital": round(capital, 2),
             "interes": round(interes, 2),
@@ -261,6 +385,530 @@ def encontrar_tasa_de_avance(
         "desglose_final_detallado": desglose_final_detallado
     }
 
+# Ancho máximo de la ventana de aceptación del solver exacto: con más de un céntimo, un abono
+# dentro de [objetivo, objetivo + tolerancia / 2) puede redondear a un céntimo por encima del objetivo
+TOLERANCIA_MAXIMA = 0.01
+
+def _validar_tolerancia(tolerancia: float) -> None:
+    if not 0 < tolerancia <= TOLERANCIA_MAXIMA:
+        raise ValueError(f"tolerancia debe estar en (0, {TOLERANCIA_MAXIMA}], no {tolerancia!r}")
+
+def resolver_tasas_exactas(
+    plazo_operacion,
+    mfn,
+    interes_mensual,
+    igv_pct,
+    monto_objetivo,
+    usa_comision_porcentual,
+    comision_estructuracion_pct: float,
+    comision_minima_aplicable,
+    comision_afiliacion_aplicable=0.0,
+    aplicar_comision_afiliacion=False,
+    tasa_avance_min=0.90,
+    tasa_avance_max=1.00,
+    tolerancia: float = 0.01,
+    max_iteraciones: int = 100
+) -> dict:
+    """
+    Solver vectorizado de tasas de avance que reproducen el monto objetivo al céntimo.
+    1. Parte de la solución cerrada del capital (apuntando al centro de la ventana aceptada).
+    2. Si el redondeo de punto flotante la deja fuera, refina por bisección dentro de
+       [tasa_avance_min, tasa_avance_max] evaluando exactamente las fórmulas del desglose.
+    Una tasa es aceptada cuando el abono teórico cae en [monto_objetivo, monto_objetivo + tolerancia / 2),
+    de modo que tanto el redondeo a 2 decimales como el 'floor' del desembolso devuelven el objetivo;
+    eso solo se cumple con tolerancia <= TOLERANCIA_MAXIMA (un céntimo), así que una mayor lanza ValueError.
+    'usa_comision_porcentual' indica, por factura, si la comisión es capital * % o el mínimo fijo.
+    """
+    _validar_tolerancia(tolerancia)
+    columnas_entrada = np.broadcast_arrays(
+        np.asarray(mfn, dtype=float),
+        np.asarray(interes_mensual, dtype=float),
+        np.asarray(igv_pct, dtype=float),
+        np.asarray(monto_objetivo, dtype=float),
+        np.asarray(usa_comision_porcentual, dtype=bool),
+        np.asarray(comision_minima_aplicable, dtype=float),
+        np.asarray(comision_afiliacion_aplicable, dtype=float),
+        np.asarray(aplicar_comision_afiliacion, dtype=bool),
+        np.asarray(tasa_avance_min, dtype=float),
+        np.asarray(tasa_avance_max, dtype=float),
+        np.asarray(plazo_operacion)
+    )
+    mfn, interes_mensual, igv_pct, monto_objetivo, usa_comision_porcentual, comision_minima_aplicable, \
+        comision_afiliacion_aplicable, aplicar_comision_afiliacion, tasa_avance_min, tasa_avance_max, \
+        plazo_operacion = columnas_entrada
+
+    comision_afiliacion = np.where(aplicar_comision_afiliacion, comision_afiliacion_aplicable, 0.0)
+    factor_interes = factores_interes_compuesto(interes_mensual, plazo_operacion)
+
+    def abono_para(tasa_avance):
+        comision = np.where(usa_comision_porcentual, (mfn * tasa_avance) * comision_estructuracion_pct, comision_minima_aplicable)
+        return _calcular_columnas_desglose(
+            plazo_operacion=plazo_operacion,
+            mfn=mfn,
+            tasa_avance=tasa_avance,
+            interes_mensual=interes_mensual,
+            comision_estructuracion=comision,
+            igv_pct=igv_pct,
+            comision_afiliacion=comision_afiliacion
+        )["abono_real_teorico"]
+
+    limite_superior = monto_objetivo + tolerancia / 2
+
+    # --- PASO 1: Solución cerrada, apuntando al centro de la ventana ---
+    objetivo_central = monto_objetivo + tolerancia / 4
+    costo_fijo = (comision_afiliacion + np.where(usa_comision_porcentual, 0.0, comision_minima_aplicable)) * (1 + igv_pct)
+    costo_variable = (factor_interes + np.where(usa_comision_porcentual, comision_estructuracion_pct, 0.0)) * (1 + igv_pct)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        capital_cerrado = np.where((1 - costo_variable) > 0, (objetivo_central + costo_fijo) / (1 - costo_variable), 0.0)
+        tasa_avance = np.where(mfn != 0, capital_cerrado / mfn, tasa_avance_min)
+    tasa_avance = np.clip(tasa_avance, tasa_avance_min, tasa_avance_max)
+
+    abono = abono_para(tasa_avance)
+    convergio = (abono >= monto_objetivo) & (abono < limite_superior) & (mfn != 0)
+    iteraciones = np.zeros(tasa_avance.shape, dtype=int)
+
+    # --- PASO 2: Refinamiento por bisección dentro de los límites ---
+    # El abono crece con la tasa: si quedó por debajo del objetivo la solución está a la derecha.
+    # Los objetivos fuera del alcance de [tasa_avance_min, tasa_avance_max] se descartan sin iterar.
+    alcanzable = (abono_para(tasa_avance_max) >= monto_objetivo) & (abono_para(tasa_avance_min) < limite_superior)
+    pendiente = ~convergio & (mfn != 0) & alcanzable
+    limite_inferior_tasa = np.where(abono < monto_objetivo, tasa_avance, tasa_avance_min)
+    limite_superior_tasa = np.where(abono < monto_objetivo, tasa_avance_max, tasa_avance)
+    for _ in range(max_iteraciones):
+        if not pendiente.any():
+            break
+        tasa_media = (limite_inferior_tasa + limite_superior_tasa) / 2
+        abono_medio = abono_para(tasa_media)
+        acepta = pendiente & (abono_medio >= monto_objetivo) & (abono_medio < limite_superior)
+        corto = abono_medio < monto_objetivo
+
+        tasa_avance = np.where(pendiente, tasa_media, tasa_avance)
+        iteraciones = iteraciones + pendiente
+        convergio = convergio | acepta
+        limite_inferior_tasa = np.where(pendiente & corto, tasa_media, limite_inferior_tasa)
+        limite_superior_tasa = np.where(pendiente & ~corto, tasa_media, limite_superior_tasa)
+        pendiente = pendiente & ~acepta
+
+    return {
+        "tasa_avance": tasa_avance,
+        "capital": mfn * tasa_avance,
+        "factor_interes": factor_interes,
+        "abono_real_teorico": abono_para(tasa_avance),
+        "convergio": convergio,
+        "iteraciones": iteraciones
+    }
+
+MODOS_BUSQUEDA = ("cerrado", "exacto")
+
+def _validar_modo(modo: str) -> None:
+    if modo not in MODOS_BUSQUEDA:
+        raise ValueError(f"modo debe ser 'cerrado' o 'exacto', no {modo!r}")
+
+def encontrar_tasa_de_avance(
+    plazo_operacion: int,
+    mfn: float,
+    interes_mensual: float,
+    comision_estructuracion_pct: float,
+    igv_pct: float,
+    monto_objetivo: float,
+    comision_minima_aplicable: float,
+    comision_afiliacion_aplicable: float = 0.0,
+    aplicar_comision_afiliacion: bool = False,
+    # Límites y criterio de parada: solo se usan en modo "exacto" (ver 'resolver_tasas_exactas')
+    tasa_avance_min: float = 0.90,
+    tasa_avance_max: float = 1.00,
+    tolerancia: float = 0.01,
+    max_iteraciones: int = 100,
+    modo: str = "cerrado"
+) -> dict:
+    """
+    Encuentra la tasa de avance necesaria para un monto objetivo de UNA factura, usando la lógica
+    de doble cálculo agnóstica con la comisión decidida individualmente.
+    modo="cerrado" usa solo la solución cerrada; modo="exacto" la refina dentro de los límites
+    para que el abono reproduzca el monto objetivo al céntimo.
+    Para lotes con la decisión de comisión agregada, usar 'procesar_lote_encontrar_tasa'.
+    """
+    resultado, _ = _encontrar_tasa_factura(
+        plazo_operacion=plazo_operacion,
+        mfn=mfn,
+        interes_mensual=interes_mensual,
+        comision_estructuracion_pct=comision_estructuracion_pct,
+        igv_pct=igv_pct,
+        monto_objetivo=monto_objetivo,
+        comision_minima_aplicable=comision_minima_aplicable,
+        comision_afiliacion_aplicable=comision_afiliacion_aplicable,
+        aplicar_comision_afiliacion=aplicar_comision_afiliacion,
+        tasa_avance_min=tasa_avance_min,
+        tasa_avance_max=tasa_avance_max,
+        tolerancia=tolerancia,
+        max_iteraciones=max_iteraciones,
+        modo=modo
+    )
+    return resultado
+
+def _encontrar_tasa_factura(
+    plazo_operacion: int,
+    mfn: float,
+    interes_mensual: float,
+    comision_estructuracion_pct: float,
+    igv_pct: float,
+    monto_objetivo: float,
+    comision_minima_aplicable: float,
+    comision_afiliacion_aplicable: float = 0.0,
+    aplicar_comision_afiliacion: bool = False,
+    # Límites y criterio de parada: solo se usan en modo "exacto" (ver 'resolver_tasas_exactas')
+    tasa_avance_min: float = 0.90,
+    tasa_avance_max: float = 1.00,
+    tolerancia: float = 0.01,
+    max_iteraciones: int = 100,
+    modo: str = "cerrado"
+) -> tuple:
+    """
+    Núcleo de 'encontrar_tasa_de_avance'. Devuelve (resultado, metodo), donde metodo es la
+    comisión que resultó elegida para la factura ("PORCENTAJE" o "PRORRATEADO").
+    """
+    _validar_modo(modo)
+    valor_neto_real = mfn
+    if valor_neto_real == 0:
+        return {"error": "El Monto Neto de Factura (mfn) no puede ser cero."}, None
+
+    factor_interes, capital_A, capital_B = _capitales_por_metodo(
+        plazo_operacion=plazo_operacion,
+        interes_mensual=interes_mensual,
+        comision_estructuracion_pct=comision_estructuracion_pct,
+        igv_pct=igv_pct,
+        monto_objetivo=monto_objetivo,
+        comision_minima_aplicable=comision_minima_aplicable,
+        comision_afiliacion_aplicable=comision_afiliacion_aplicable,
+        aplicar_comision_afiliacion=aplicar_comision_afiliacion
+    )
+
+    capital = max(capital_A, capital_B)
+    metodo, comision_estructuracion = _decidir_comision_factura(capital, comision_estructuracion_pct, comision_minima_aplicable)
+
+    solucion_exacta = None
+    if modo == "exacto":
+        solucion = resolver_tasas_exactas(
+            plazo_operacion=[plazo_operacion],
+            mfn=[mfn],
+            interes_mensual=[interes_mensual],
+            igv_pct=[igv_pct],
+            monto_objetivo=[monto_objetivo],
+            usa_comision_porcentual=[capital_A > capital_B],
+            comision_estructuracion_pct=comision_estructuracion_pct,
+            comision_minima_aplicable=[comision_minima_aplicable],
+            comision_afiliacion_aplicable=[comision_afiliacion_aplicable],
+            aplicar_comision_afiliacion=[aplicar_comision_afiliacion],
+            tasa_avance_min=tasa_avance_min,
+            tasa_avance_max=tasa_avance_max,
+            tolerancia=tolerancia,
+            max_iteraciones=max_iteraciones
+        )
+        capital = float(solucion["capital"][0])
+        metodo = "PORCENTAJE" if capital_A > capital_B else "PRORRATEADO"
+        comision_estructuracion = capital * comision_estructuracion_pct if metodo == "PORCENTAJE" else comision_minima_aplicable
+        solucion_exacta = {
+            "tasa_avance": float(solucion["tasa_avance"][0]),
+            "convergio": bool(solucion["convergio"][0]),
+            "iteraciones": int(solucion["iteraciones"][0])
+        }
+
+    resultado = _construir_resultado_busqueda(
+        capital=capital,
+        valor_neto_real=valor_neto_real,
+        factor_interes=factor_interes,
+        comision_estructuracion=comision_estructuracion,
+        igv_pct=igv_pct,
+        monto_objetivo=monto_objetivo,
+        plazo_operacion=plazo_operacion,
+        comision_afiliacion_aplicable=comision_afiliacion_aplicable,
+        aplicar_comision_afiliacion=aplicar_comision_afiliacion,
+        solucion_exacta=solucion_exacta
+    )
+    return resultado, metodo
+
+def _totales_busqueda(resultados_finales: list) -> dict:
+    """Suma los resultados de búsqueda de tasa de un lote, ignorando las facturas con error."""
+    resultados_validos = [r for r in resultados_finales if r and "error" not in r]
+    totales = {}
+    for campo in ["capital", "interes", "igv_interes", "comision_estructuracion", "igv_comision_estructuracion",
+                  "comision_afiliacion", "igv_afiliacion", "margen_seguridad"]:
+        totales[campo] = round(sum(r["calculo_con_tasa_encontrada"][campo] for r in resultados_validos), 2)
+    totales["abono_real_calculado"] = round(sum(r["resultado_busqueda"]["abono_real_calculado"] for r in resultados_validos), 2)
+    totales["monto_objetivo"] = round(sum(r["resultado_busqueda"]["monto_objetivo"] for r in resultados_validos), 2)
+    return totales
+
+def procesar_lote_encontrar_tasa(lote_datos: list, modo: str = "cerrado", metodo_comision: str = None) -> dict:
+    """
+    Encuentra la tasa de avance de cada factura de un lote para su monto objetivo,
+    aplicando la misma decisión de comisión agregada que 'procesar_lote_desembolso_inicial'.
+    Con modo="exacto" todas las tasas se refinan juntas con 'resolver_tasas_exactas'.
+    'metodo_comision' ("PORCENTAJE" o "PRORRATEADO") impone una decisión ya tomada en lugar de
+    volver a decidirla con los capitales de la búsqueda.
+    Devuelve los resultados por factura (mismo formato que 'encontrar_tasa_de_avance') y los totales del lote.
+    """
+    _validar_modo(modo)
+    if not lote_datos:
+        return {"error": "El lote de datos no puede estar vacío."}
+
+    parametros_generales = lote_datos[0]
+    comision_estructuracion_pct = parametros_generales.get("comision_estructuracion_pct", 0)
+
+    # --- FASE 1: Capital necesario bajo ambos supuestos y Decisión Agregada ---
+    capitales = []
+    capital_porcentaje_total = 0
+    comision_prorrateada_total = 0
+    for datos_factura in lote_datos:
+        if not datos_factura.get("mfn"):
+            capitales.append(None)
+            continue
+        capitales_factura = _capitales_por_metodo(
+            plazo_operacion=datos_factura.get("plazo_operacion"),
+            interes_mensual=datos_factura.get("interes_mensual"),
+            comision_estructuracion_pct=comision_estructuracion_pct,
+            igv_pct=datos_factura.get("igv_pct"),
+            monto_objetivo=datos_factura.get("monto_objetivo"),
+            comision_minima_aplicable=datos_factura.get("comision_minima_aplicable", 0),
+            comision_afiliacion_aplicable=datos_factura.get("comision_afiliacion_aplicable", 0),
+            aplicar_comision_afiliacion=datos_factura.get("aplicar_comision_afiliacion", False)
+        )
+        capitales.append(capitales_factura)
+        capital_porcentaje_total += capitales_factura[1]
+        comision_prorrateada_total += datos_factura.get("comision_minima_aplicable", 0)
+
+    comision_porcentual_agregada = capital_porcentaje_total * comision_estructuracion_pct
+
+    if metodo_comision is not None:
+        metodo_de_comision_elegido = metodo_comision
+    elif comision_porcentual_agregada > comision_prorrateada_total:
+        metodo_de_comision_elegido = "PORCENTAJE"
+    else:
+        metodo_de_comision_elegido = "PRORRATEADO"
+
+    # --- FASE 1b (modo exacto): Refinamiento vectorizado de todas las tasas del lote ---
+    soluciones_exactas = {}
+    if modo == "exacto":
+        lote_valido = [datos_factura for datos_factura, capitales_factura in zip(lote_datos, capitales) if capitales_factura is not None]
+        indices_validos = [indice for indice, capitales_factura in enumerate(capitales) if capitales_factura is not None]
+        if lote_valido:
+            solucion = resolver_tasas_exactas(
+                plazo_operacion=[datos_factura.get("plazo_operacion") for datos_factura in lote_valido],
+                mfn=[datos_factura.get("mfn") for datos_factura in lote_valido],
+                interes_mensual=[datos_factura.get("interes_mensual") for datos_factura in lote_valido],
+                igv_pct=[datos_factura.get("igv_pct") for datos_factura in lote_valido],
+                monto_objetivo=[datos_factura.get("monto_objetivo") for datos_factura in lote_valido],
+                usa_comision_porcentual=metodo_de_comision_elegido == "PORCENTAJE",
+                comision_estructuracion_pct=comision_estructuracion_pct,
+                comision_minima_aplicable=[datos_factura.get("comision_minima_aplicable", 0) for datos_factura in lote_valido],
+                comision_afiliacion_aplicable=[datos_factura.get("comision_afiliacion_aplicable", 0) for datos_factura in lote_valido],
+                aplicar_comision_afiliacion=[datos_factura.get("aplicar_comision_afiliacion", False) for datos_factura in lote_valido],
+                tasa_avance_min=[datos_factura.get("tasa_avance_min", 0.90) for datos_factura in lote_valido],
+                tasa_avance_max=[datos_factura.get("tasa_avance_max", 1.00) for datos_factura in lote_valido],
+                tolerancia=parametros_generales.get("tolerancia", 0.01),
+                max_iteraciones=parametros_generales.get("max_iteraciones", 100)
+            )
+            for posicion, indice in enumerate(indices_validos):
+                soluciones_exactas[indice] = {
+                    "capital": float(solucion["capital"][posicion]),
+                    "tasa_avance": float(solucion["tasa_avance"][posicion]),
+                    "convergio": bool(solucion["convergio"][posicion]),
+                    "iteraciones": int(solucion["iteraciones"][posicion])
+                }
+
+    # --- FASE 2: Cálculo Individual con la Decisión ya Tomada ---
+    resultados_finales = []
+    for indice, (datos_factura, capitales_factura) in enumerate(zip(lote_datos, capitales)):
+        if capitales_factura is None:
+            resultados_finales.append({"error": "El Monto Neto de Factura (mfn) no puede ser cero."})
+            continue
+        factor_interes, capital_A, capital_B = capitales_factura
+        solucion_exacta = soluciones_exactas.get(indice)
+
+        if metodo_de_comision_elegido == "PORCENTAJE":
+            capital = capital_A
+        else: # PRORRATEADO
+            capital = capital_B
+        if solucion_exacta is not None:
+            capital = solucion_exacta["capital"]
+
+        if metodo_de_comision_elegido == "PORCENTAJE":
+            comision_para_esta_factura = capital * comision_estructuracion_pct
+        else: # PRORRATEADO
+            comision_para_esta_factura = datos_factura.get("comision_minima_aplicable", 0)
+
+        resultados_finales.append(_construir_resultado_busqueda(
+            capital=capital,
+            valor_neto_real=datos_factura.get("mfn"),
+            factor_interes=factor_interes,
+            comision_estructuracion=comision_para_esta_factura,
+            igv_pct=datos_factura.get("igv_pct"),
+            monto_objetivo=datos_factura.get("monto_objetivo"),
+            plazo_operacion=datos_factura.get("plazo_operacion"),
+            comision_afiliacion_aplicable=datos_factura.get("comision_afiliacion_aplicable", 0),
+            aplicar_comision_afiliacion=datos_factura.get("aplicar_comision_afiliacion", False),
+            solucion_exacta=solucion_exacta
+        ))
+
+    # --- FASE 3: Totales del Lote (con corrección por redondeo de la comisión) ---
+    totales = _totales_busqueda(resultados_finales)
+
+    if metodo_de_comision_elegido == "PRORRATEADO":
+        total_comision_corregido = comision_prorrateada_total
+    else:
+        total_comision_corregido = totales["comision_estructuracion"]
+
+    return {
+        "metodo_comision_elegido": metodo_de_comision_elegido,
+        "comision_estructuracion_total_corregida": round(total_comision_corregido, 2),
+        "resultados_por_factura": resultados_finales,
+        "totales": totales
+    }
+
+def calcular_monto_objetivo_desembolso(abono_real_teorico: float) -> float:
+    """
+    Regla de redondeo del monto a desembolsar: el abono teórico se lleva
+    al múltiplo de 10 inmediatamente inferior.
+    """
+    return (abono_real_teorico // 10) * 10
+
+def _lote_busqueda_desde_calculo_inicial(lote_datos: list, resultados_iniciales: list) -> tuple:
+    """
+    Arma el lote de búsqueda de tasa a partir del cálculo inicial: el monto objetivo de cada factura
+    es su abono teórico redondeado. Devuelve (lote_busqueda, indices) de las facturas sin error.
+    """
+    lote_busqueda = []
+    indices_busqueda = []
+    for indice, (datos_factura, calculo_inicial) in enumerate(zip(lote_datos, resultados_iniciales)):
+        if "abono_real_teorico" not in calculo_inicial:
+            continue
+        datos_busqueda = {clave: valor for clave, valor in datos_factura.items() if clave != "tasa_avance"}
+        datos_busqueda["monto_objetivo"] = calcular_monto_objetivo_desembolso(calculo_inicial["abono_real_teorico"])
+        # El objetivo sale de la tasa ingresada, que puede estar fuera del rango por defecto [0.90, 1.00]
+        datos_busqueda.setdefault("tasa_avance_min", 0.0)
+        datos_busqueda.setdefault("tasa_avance_max", max(1.0, datos_factura.get("tasa_avance", 1.0)))
+        lote_busqueda.append(datos_busqueda)
+        indices_busqueda.append(indice)
+    return lote_busqueda, indices_busqueda
+
+def procesar_lote_calcular_y_recalcular(lote_datos: list, modo: str = "cerrado", decision_comision: str = "factura") -> dict:
+    """
+    Pipeline completo de un lote en una sola llamada:
+    1. Cálculo inicial con la tasa de avance ingresada.
+    2. Redondeo del abono teórico de cada factura a su monto objetivo.
+    3. Búsqueda de la tasa de avance para esos objetivos (en el 'modo' indicado).
+    decision_comision="factura" decide la comisión de cada factura por separado, igual que llamar a
+    /calcular_desembolso y /encontrar_tasa factura por factura (los montos que ve el usuario no cambian).
+    decision_comision="lote" usa la decisión agregada del lote ('procesar_lote_desembolso_inicial'),
+    y la búsqueda reutiliza esa misma decisión para que ambos pasos cobren la comisión igual.
+    Devuelve, por factura, 'initial_calc_result', 'recalculate_result' y el método de comisión de cada paso.
+    """
+    _validar_modo(modo)
+    if decision_comision == "factura":
+        return _calcular_y_recalcular_por_factura(lote_datos, modo)
+    if decision_comision != "lote":
+        raise ValueError(f"decision_comision debe ser 'factura' o 'lote', no {decision_comision!r}")
+
+    resultado_inicial = procesar_lote_desembolso_inicial(lote_datos)
+    if "error" in resultado_inicial:
+        return resultado_inicial
+    metodo_inicial = resultado_inicial["metodo_comision_elegido"]
+
+    lote_busqueda, indices_busqueda = _lote_busqueda_desde_calculo_inicial(lote_datos, resultado_inicial["resultados_por_factura"])
+    recalculos = [None] * len(lote_datos)
+    resultado_busqueda = {}
+    if lote_busqueda:
+        resultado_busqueda = procesar_lote_encontrar_tasa(lote_busqueda, modo=modo, metodo_comision=metodo_inicial)
+        for indice, recalculo in zip(indices_busqueda, resultado_busqueda.get("resultados_por_factura", [])):
+            recalculos[indice] = recalculo
+    metodo_recalculo = resultado_busqueda.get("metodo_comision_elegido", metodo_inicial)
+    if metodo_recalculo != metodo_inicial:
+        return {"error": f"La búsqueda de tasa usó la comisión {metodo_recalculo} y el cálculo inicial {metodo_inicial}."}
+
+    resultados_finales = [
+        {
+            "initial_calc_result": calculo_inicial,
+            "recalculate_result": recalculo,
+            "metodo_comision_inicial": metodo_inicial,
+            "metodo_comision_recalculo": metodo_recalculo if recalculo is not None else None
+        }
+        for calculo_inicial, recalculo in zip(resultado_inicial["resultados_por_factura"], recalculos)
+    ]
+
+    return {
+        "decision_comision": "lote",
+        "metodo_comision_elegido": metodo_inicial,
+        "metodo_comision_inicial": metodo_inicial,
+        "metodo_comision_recalculo": metodo_recalculo,
+        "comision_estructuracion_total_corregida": resultado_busqueda.get(
+            "comision_estructuracion_total_corregida", resultado_inicial["comision_estructuracion_total_corregida"]
+        ),
+        "resultados_por_factura": resultados_finales,
+        "totales": resultado_busqueda.get("totales", {})
+    }
+
+def _calcular_y_recalcular_por_factura(lote_datos: list, modo: str = "cerrado") -> dict:
+    """
+    Pipeline con la comisión decidida factura por factura ('calcular_desembolso_inicial' y
+    '_encontrar_tasa_factura'). Los dos pasos deciden por separado y pueden elegir métodos
+    distintos cerca del umbral; se informan ambos por factura.
+    """
+    if not lote_datos:
+        return {"error": "El lote de datos no puede estar vacío."}
+
+    resultados_finales = []
+    for datos_factura in lote_datos:
+        metodo_inicial, _ = _decidir_comision_factura(
+            datos_factura.get("mfn") * datos_factura.get("tasa_avance"),
+            datos_factura.get("comision_estructuracion_pct", 0),
+            datos_factura.get("comision_minima_aplicable", 0)
+        )
+        calculo_inicial = calcular_desembolso_inicial(
+            plazo_operacion=datos_factura.get("plazo_operacion"),
+            mfn=datos_factura.get("mfn"),
+            tasa_avance=datos_factura.get("tasa_avance"),
+            interes_mensual=datos_factura.get("interes_mensual"),
+            comision_estructuracion_pct=datos_factura.get("comision_estructuracion_pct", 0),
+            comision_minima_aplicable=datos_factura.get("comision_minima_aplicable", 0),
+            igv_pct=datos_factura.get("igv_pct"),
+            comision_afiliacion_aplicable=datos_factura.get("comision_afiliacion_aplicable", 0),
+            aplicar_comision_afiliacion=datos_factura.get("aplicar_comision_afiliacion", False)
+        )
+        recalculo, metodo_recalculo = None, None
+        lote_busqueda, _ = _lote_busqueda_desde_calculo_inicial([datos_factura], [calculo_inicial])
+        if lote_busqueda:
+            datos_busqueda = lote_busqueda[0]
+            recalculo, metodo_recalculo = _encontrar_tasa_factura(
+                plazo_operacion=datos_busqueda.get("plazo_operacion"),
+                mfn=datos_busqueda.get("mfn"),
+                interes_mensual=datos_busqueda.get("interes_mensual"),
+                comision_estructuracion_pct=datos_busqueda.get("comision_estructuracion_pct", 0),
+                igv_pct=datos_busqueda.get("igv_pct"),
+                monto_objetivo=datos_busqueda["monto_objetivo"],
+                comision_minima_aplicable=datos_busqueda.get("comision_minima_aplicable", 0),
+                comision_afiliacion_aplicable=datos_busqueda.get("comision_afiliacion_aplicable", 0),
+                aplicar_comision_afiliacion=datos_busqueda.get("aplicar_comision_afiliacion", False),
+                tasa_avance_min=datos_busqueda["tasa_avance_min"],
+                tasa_avance_max=datos_busqueda["tasa_avance_max"],
+                tolerancia=datos_busqueda.get("tolerancia", 0.01),
+                max_iteraciones=datos_busqueda.get("max_iteraciones", 100),
+                modo=modo
+            )
+        resultados_finales.append({
+            "initial_calc_result": calculo_inicial,
+            "recalculate_result": recalculo,
+            "metodo_comision_inicial": metodo_inicial if "error" not in calculo_inicial else None,
+            "metodo_comision_recalculo": metodo_recalculo
+        })
+
+    recalculos = [r["recalculate_result"] for r in resultados_finales]
+    totales = _totales_busqueda(recalculos)
+    return {
+        "decision_comision": "factura",
+        "comision_estructuracion_total_corregida": totales["comision_estructuracion"],
+        "resultados_por_factura": resultados_finales,
+        "totales": totales
+    }
+
 if __name__ == '__main__':
     # --- CASO 1: Prueba donde gana el método PORCENTAJE ---
     print("--- CASO 1: GANA MÉTODO PORCENTAJE ---")
@@ -290,5 +938,23 @@ if __name__ == '__main__':
     print(f"Suma de Comisiones Individuales (potencialmente con error): {round(sum(comisiones_2), 2)}")
     print(f"TOTAL OFICIAL CORREGIDO: {resultado_lote_2['comision_estructuracion_total_corregida']}")
 
-
-
+    # --- CASO 3: Benchmark del modo exacto frente al cerrado (fuera de la suite: depende de la máquina) ---
+    print("\n--- CASO 3: COSTO POR FACTURA DE LA BÚSQUEDA DE TASA ---")
+    import random
+    import time
+    rng = random.Random(7)
+    lote_caso_3 = []
+    for _ in range(2000):
+        mfn = round(rng.uniform(1000, 500000), 2)
+        lote_caso_3.append({
+            "plazo_operacion": rng.randint(1, 120), "mfn": mfn, "interes_mensual": 0.02,
+            "comision_estructuracion_pct": 0.005, "comision_minima_aplicable": 66.67, "igv_pct": 0.18,
+            "monto_objetivo": (mfn * rng.uniform(0.90, 0.93)) // 10 * 10,
+        })
+    for modo in MODOS_BUSQUEDA:
+        procesar_lote_encontrar_tasa(lote_caso_3[:10], modo=modo)
+        inicio = time.perf_counter()
+        resultado_lote_3 = procesar_lote_encontrar_tasa(lote_caso_3, modo=modo)
+        por_factura = (time.perf_counter() - inicio) / len(lote_caso_3)
+        errores = sum("error" in r for r in resultado_lote_3["resultados_por_factura"])
+        print(f"Modo {modo}: {por_factura * 1000:.3f} ms por factura ({errores} errores)")
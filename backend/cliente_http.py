@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- Cliente HTTP Compartido para datosperu.org ---
+# Las páginas de datosperu son HTML estático: se pueden descargar con una sesión HTTP (conexiones
+# keep-alive reutilizadas, decenas de milisegundos por página) en lugar de un navegador. Si la
+# respuesta parece un desafío anti-bots o una página que necesita JavaScript, se lanza
+# RequiereNavegador para que quien llama repita la consulta con Selenium.
+#
+# Límite de tasa: SOLICITUDES_POR_SEGUNDO (variable de entorno DATOSPERU_MAX_RPS) es el único límite
+# hacia datosperu.org y el que manda. Lo aplica esperar_turno_datosperu() antes de cada página que se
+# pide al sitio, por HTTP o con el navegador, y lo comparten todos los hilos del proceso. Las capas de
+# arriba (p. ej. enriquecimiento_rucs) no agregan otro: las respuestas en caché no cuentan.
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+TIMEOUT_SEGUNDOS = 10
+CONEXIONES_POR_HOST = 10
+SOLICITUDES_POR_SEGUNDO = float(os.environ.get("DATOSPERU_MAX_RPS", "5"))
+
+# Códigos y textos típicos de las páginas de verificación (Cloudflare y similares)
+CODIGOS_REQUIERE_NAVEGADOR = {403, 429, 503}
+MARCAS_REQUIERE_NAVEGADOR = ("cf-browser-verification", "challenge-platform", "<title>Just a moment...</title>")
+
+class RequiereNavegador(Exception):
+    """La página no se pudo obtener como HTML estático; hay que cargarla con un navegador."""
+
+class LimitadorTasa:
+    """Espacia las solicitudes para no superar 'por_segundo' en total, compartido entre hilos."""
+
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._siguiente = 0.0
+        self._lock = threading.Lock()
+
+    def esperar(self) -> None:
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+        if turno > ahora:
+            time.sleep(turno - ahora)
+
+_sesion = None
+_lock_sesion = threading.Lock()
+limitador_datosperu = LimitadorTasa(SOLICITUDES_POR_SEGUNDO)
+
+def obtener_sesion_http() -> requests.Session:
+    """Sesión compartida del proceso, con un pool de conexiones keep-alive por host."""
+    global _sesion
+    if _sesion is None:
+        with _lock_sesion:
+            if _sesion is None:
+                sesion = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=CONEXIONES_POR_HOST, pool_maxsize=CONEXIONES_POR_HOST)
+                sesion.mount("http://", adaptador)
+                sesion.mount("https://", adaptador)
+                sesion.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "es-PE,es;q=0.9"})
+                _sesion = sesion
+    return _sesion
+
+def esperar_turno_datosperu() -> None:
+    """Espera hasta poder pedir otra página a datosperu.org sin superar SOLICITUDES_POR_SEGUNDO."""
+    limitador_datosperu.esperar()
+
+def descargar_pagina(url: str, timeout: float = TIMEOUT_SEGUNDOS) -> str:
+    """
+    Devuelve el HTML de 'url'. Lanza RequiereNavegador si el sitio responde con un desafío
+    anti-bots, y las excepciones de requests ante errores de red.
+    """
+    esperar_turno_datosperu()
+    respuesta = obtener_sesion_http().get(url, timeout=timeout)
+    if respuesta.status_code in CODIGOS_REQUIERE_NAVEGADOR:
+        raise RequiereNavegador(f"HTTP {respuesta.status_code} en {url}")
+    respuesta.raise_for_status()
+    if "charset" not in respuesta.headers.get("Content-Type", "").lower():
+        # Sin charset declarado requests asume ISO-8859-1 y rompe las tildes ('DIRECCIÓN')
+        respuesta.encoding = respuesta.apparent_encoding
+    html = respuesta.text
+    if any(marca in html for marca in MARCAS_REQUIERE_NAVEGADOR):
+        raise RequiereNavegador(f"La página {url} requiere JavaScript")
+    return html
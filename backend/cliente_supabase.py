@@ -0,0 +1,56 @@
+import os
+import threading
+from dotenv import load_dotenv
+
+# --- Cliente de Supabase Compartido ---
+# Un solo cliente por proceso, creado la primera vez que se necesita (importar el backend ya no
+# lee el .env ni prepara conexiones). El cliente reutiliza su sesión HTTP, así que las consultas
+# siguientes aprovechan la conexión abierta (keep-alive) en vez de repetir el handshake TLS.
+
+# Ubicaciones del .env, en orden de preferencia
+RUTAS_ENV = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'supabase_client', '.env'),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'supabase', '.env'),
+]
+
+_cliente = None
+_inicializado = False
+_lock = threading.Lock()
+
+def _crear_cliente():
+    for dotenv_path in RUTAS_ENV:
+        if os.path.exists(dotenv_path):
+            load_dotenv(dotenv_path=dotenv_path)
+
+    SUPABASE_URL = os.environ.get("SUPABASE_URL")
+    SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print(f"Error: No se pudieron cargar las variables de entorno SUPABASE_URL/SUPABASE_KEY desde {RUTAS_ENV}")
+        return None
+
+    try:
+        from supabase import create_client
+        return create_client(SUPABASE_URL, SUPABASE_KEY)
+    except Exception as e:
+        print(f"Error al inicializar Supabase: {e}")
+        return None
+
+def obtener_cliente_supabase():
+    """
+    Devuelve el cliente compartido de Supabase, creándolo en la primera llamada.
+    Devuelve None si no hay credenciales o si la inicialización falló.
+    """
+    global _cliente, _inicializado
+    if not _inicializado:
+        with _lock:
+            if not _inicializado:
+                _cliente = _crear_cliente()
+                _inicializado = True
+    return _cliente
+
+def reiniciar_cliente_supabase() -> None:
+    """Descarta el cliente actual; el siguiente 'obtener_cliente_supabase' crea uno nuevo."""
+    global _cliente, _inicializado
+    with _lock:
+        _cliente = None
+        _inicializado = False
@@ -1,32 +1,18 @@
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.pdfgen import canvas # Necesario para el footer
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 import json
 import datetime
 import os
+import sys
 
-# Custom styles
-styles = getSampleStyleSheet()
-styles.add(ParagraphStyle(name='RightAlign', alignment=TA_RIGHT))
-styles.add(ParagraphStyle(name='CenterAlign', alignment=TA_CENTER))
-styles.add(ParagraphStyle(name='LeftAlign', alignment=TA_LEFT))
-styles.add(ParagraphStyle(name='SmallFont', fontSize=7))
-styles.add(ParagraphStyle(name='BoldSmallFont', fontSize=6, fontName='Helvetica-Bold'))
-styles.add(ParagraphStyle(name='BoldNormal', fontName='Helvetica-Bold'))
-styles.add(ParagraphStyle(name='BoldNormalRight', parent=styles['BoldNormal'], alignment=TA_RIGHT))
-styles.add(ParagraphStyle(name='BoldSmallFontRight', parent=styles['BoldSmallFont'], alignment=TA_RIGHT))
-styles.add(ParagraphStyle(name='BoldSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER))
-styles.add(ParagraphStyle(name='BoldExtraSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER, fontSize=6, textColor=colors.blue))
-styles.add(ParagraphStyle(name='BoldNormalCenter', parent=styles['BoldNormal'], alignment=TA_CENTER))
-styles.add(ParagraphStyle(name='SmallFontCenter', parent=styles['SmallFont'], alignment=TA_CENTER))
-styles.add(ParagraphStyle(name='BlueSmallFont', fontSize=7, fontName='Helvetica', textColor=colors.blue))
-styles.add(ParagraphStyle(name='TinyFont', fontSize=5))
-styles.add(ParagraphStyle(name='SmallTinyFont', fontSize=5, leading=5))
-styles.add(ParagraphStyle(name='BoldExtraExtraSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER, fontSize=5, textColor=colors.blue))
+# Styles shared by every PDF generator (built once per process)
+sys.path.append(os.path.dirname(__file__))
+from estilos_pdf import obtener_estilos
+
+styles = obtener_estilos()
 
 def generate_consolidated_report_pdf(output_filepath, all_invoices_data, print_date_str):
     doc = SimpleDocTemplate(output_filepath, pagesize=landscape(letter),
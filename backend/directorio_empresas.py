@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import OrderedDict
+
+# --- Directorio de Empresas (EMISORES.DEUDORES) en Memoria ---
+# Las razones sociales y datos de firmantes cambian muy poco, así que las filas de
+# EMISORES.DEUDORES se guardan en una caché compartida por proceso, con vencimiento (TTL)
+# y tamaño acotado (LRU). Los RUCs que no existen también se recuerdan, con un TTL más corto,
+# para que una empresa recién registrada aparezca pronto.
+
+TABLA_DIRECTORIO = 'EMISORES.DEUDORES'
+TTL_SEGUNDOS = 6 * 60 * 60
+TTL_NO_ENCONTRADO_SEGUNDOS = 5 * 60
+TAMANO_MAXIMO = 20000
+TAMANO_PAGINA_PRECARGA = 1000
+TAMANO_LOTE_RUCS = 200 # Tamaño máximo de cada lista 'in' para no exceder el largo de URL de PostgREST
+
+_NO_ENCONTRADO = object()
+
+class CacheTTL:
+    """Caché clave -> valor con vencimiento por entrada, desalojo LRU y contadores, segura entre hilos."""
+
+    def __init__(self, ttl_segundos: float, tamano_maximo: int):
+        self.ttl_segundos = ttl_segundos
+        self.tamano_maximo = tamano_maximo
+        self._entradas = OrderedDict() # clave -> (valor, guardado_en, vence_en)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expirados = 0
+        self._suma_edad_aciertos = 0.0
+        self.ultima_precarga = None
+
+    def obtener(self, clave, predeterminado=None):
+        ahora = time.time()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return predeterminado
+            valor, guardado_en, vence_en = entrada
+            if ahora >= vence_en:
+                del self._entradas[clave]
+                self.expirados += 1
+                self.fallos += 1
+                return predeterminado
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            self._suma_edad_aciertos += ahora - guardado_en
+            return valor
+
+    def guardar(self, clave, valor, ttl_segundos: float = None) -> None:
+        ahora = time.time()
+        vence_en = ahora + (self.ttl_segundos if ttl_segundos is None else ttl_segundos)
+        with self._lock:
+            self._entradas[clave] = (valor, ahora, vence_en)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+
+    def eliminar(self, clave) -> None:
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = self.fallos = self.expirados = 0
+            self._suma_edad_aciertos = 0.0
+            self.ultima_precarga = None
+
+    def estadisticas(self) -> dict:
+        """Tasa de aciertos y antigüedad (en segundos) de los datos servidos y almacenados."""
+        ahora = time.time()
+        with self._lock:
+            edades = [ahora - guardado_en for _, guardado_en, _ in self._entradas.values()]
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expirados": self.expirados,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+                "entradas": len(self._entradas),
+                "tamano_maximo": self.tamano_maximo,
+                "edad_promedio_aciertos_s": round(self._suma_edad_aciertos / self.aciertos, 1) if self.aciertos else 0.0,
+                "edad_maxima_s": round(max(edades), 1) if edades else 0.0,
+                "segundos_desde_precarga": round(ahora - self.ultima_precarga, 1) if self.ultima_precarga else None
+            }
+
+cache_directorio = CacheTTL(TTL_SEGUNDOS, TAMANO_MAXIMO)
+
+def _normalizar_ruc(ruc) -> str:
+    return str(ruc).strip()
+
+def obtener_empresas(rucs, fabrica_cliente) -> dict:
+    """
+    Devuelve {ruc: fila de EMISORES.DEUDORES o None} para los RUCs dados.
+    Los que no están en caché se consultan juntos con 'in'; 'fabrica_cliente' es una función
+    que devuelve el cliente de Supabase y solo se invoca si hay que ir a la base de datos.
+    """
+    empresas = {}
+    pendientes = []
+    for ruc in {_normalizar_ruc(ruc) for ruc in rucs if ruc}:
+        fila = cache_directorio.obtener(ruc, predeterminado=None)
+        if fila is None:
+            pendientes.append(ruc)
+        else:
+            empresas[ruc] = None if fila is _NO_ENCONTRADO else fila
+    if not pendientes:
+        return empresas
+
+    cliente = fabrica_cliente()
+    if not cliente:
+        return {**empresas, **{ruc: None for ruc in pendientes}}
+
+    pendientes.sort()
+    for inicio in range(0, len(pendientes), TAMANO_LOTE_RUCS):
+        lote_rucs = pendientes[inicio:inicio + TAMANO_LOTE_RUCS]
+        try:
+            response = cliente.table(TABLA_DIRECTORIO).select('*').in_('RUC', lote_rucs).execute()
+        except Exception as e:
+            # Sin respuesta no se guarda nada en caché: el próximo intento vuelve a consultar
+            print(f"[ERROR en obtener_empresas]: {e}")
+            empresas.update({ruc: None for ruc in lote_rucs})
+            continue
+        encontradas = {_normalizar_ruc(fila.get('RUC')): fila for fila in response.data or []}
+        for ruc in lote_rucs:
+            fila = encontradas.get(ruc)
+            if fila is None:
+                cache_directorio.guardar(ruc, _NO_ENCONTRADO, ttl_segundos=TTL_NO_ENCONTRADO_SEGUNDOS)
+            else:
+                cache_directorio.guardar(ruc, fila)
+            empresas[ruc] = fila
+    return empresas
+
+def obtener_empresa(ruc, fabrica_cliente):
+    """Fila de EMISORES.DEUDORES para un RUC (o None), pasando por la caché compartida."""
+    if not ruc:
+        return None
+    return obtener_empresas([ruc], fabrica_cliente).get(_normalizar_ruc(ruc))
+
+def precargar_directorio(cliente, tamano_pagina: int = TAMANO_PAGINA_PRECARGA) -> int:
+    """
+    Carga la tabla completa en la caché, página por página, para que las búsquedas
+    posteriores no salgan a la red. Devuelve el número de empresas cargadas.
+    El intento queda registrado en 'ultima_precarga' aunque falle o no haya cliente,
+    para no repetirlo en cada recarga de la página.
+    """
+    cargadas = 0
+    inicio = 0
+    try:
+        while cliente:
+            response = cliente.table(TABLA_DIRECTORIO).select('*').order('RUC').range(inicio, inicio + tamano_pagina - 1).execute()
+            filas = response.data or []
+            for fila in filas:
+                cache_directorio.guardar(_normalizar_ruc(fila.get('RUC')), fila)
+            cargadas += len(filas)
+            if len(filas) < tamano_pagina:
+                break
+            inicio += tamano_pagina
+    except Exception as e:
+        print(f"[ERROR en precargar_directorio]: {e}")
+    finally:
+        cache_directorio.ultima_precarga = time.time()
+    return cargadas
+
+_hilo_precarga = None
+_lock_precarga = threading.Lock()
+
+def precargar_directorio_en_segundo_plano(fabrica_cliente) -> threading.Thread:
+    """
+    Lanza la precarga en un hilo aparte, una sola vez por proceso, y devuelve ese hilo.
+    Mientras tanto las búsquedas siguen funcionando: las que no encuentran la empresa en caché
+    la consultan directamente. 'fabrica_cliente' se invoca ya dentro del hilo.
+    """
+    global _hilo_precarga
+    with _lock_precarga:
+        if _hilo_precarga is None:
+            _hilo_precarga = threading.Thread(
+                target=lambda: precargar_directorio(fabrica_cliente()), name="precarga-directorio", daemon=True
+            )
+            _hilo_precarga.start()
+        return _hilo_precarga
+
+def estadisticas_directorio() -> dict:
+    return cache_directorio.estadisticas()
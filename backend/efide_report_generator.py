@@ -11,31 +11,17 @@ except ImportError:
     exit(1)
 
 # --- Start of get_emisor_deudor_data function (moved from supabase_queries.py) ---
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import sys
 
-def get_emisor_deudor_data(ruc):
-    dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'supabase', '.env') # Adjusted path
-    load_dotenv(dotenv_path=dotenv_path)
-
-    SUPABASE_URL = os.environ.get("SUPABASE_URL")
-    SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
-
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        print(f"Error: No se pudieron cargar las variables de entorno desde {dotenv_path}")
-        return None
+# Add the backend directory to the path to import the shared client and company directory cache
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cliente_supabase import obtener_cliente_supabase
+from directorio_empresas import obtener_empresa
 
+def get_emisor_deudor_data(ruc):
+    # The shared client is only created when the RUC is not already in the shared cache
     try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        table_name = "EMISORES.DEUDORES"
-
-        response = supabase.table(table_name).select("*").eq('RUC', ruc).limit(1).execute()
-
-        if response.data:
-            return response.data[0]
-        else:
-            return None
-
+        return obtener_empresa(ruc, obtener_cliente_supabase)
     except Exception as e:
         print(f"Ocurrió un error al conectar o consultar Supabase: {e}")
         return None
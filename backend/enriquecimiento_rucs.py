@@ -0,0 +1,116 @@
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Añadir el directorio 'backend' al path para importar los scrapers y utilidades compartidas
+sys.path.append(os.path.dirname(__file__))
+from cache_ruc import ENCONTRADO, NO_ENCONTRADO, ERROR
+from cliente_http import LimitadorTasa
+import ruc_lookup
+import sunat_query
+
+# --- Enriquecimiento de RUCs en Lote ---
+# Consulta muchos RUCs (p. ej. la cartera de deudores de un cliente) en un pool de hilos.
+# Los RUCs repetidos se consultan una sola vez; los errores se reintentan con espera exponencial;
+# y los resultados se entregan a medida que terminan, sin esperar al lote completo. Cada consulta
+# pasa por la caché de RUCs, así que repetir un lote solo consulta lo que falta.
+# El ritmo hacia datosperu.org lo fija solo el limitador de cliente_http (SOLICITUDES_POR_SEGUNDO,
+# por página pedida); aquí no se agrega otro, para que los aciertos de caché no esperen turno.
+
+TRABAJADORES = 8
+REINTENTOS = 3
+ESPERA_BASE_SEGUNDOS = 1.0
+
+# fuente -> (función de consulta por RUC, clasificador de su resultado)
+FUENTES = {
+    'ficha': (ruc_lookup.lookup_ruc_info, ruc_lookup.classify_ruc_info),
+    'buscador': (sunat_query.get_company_data_from_datosperu, sunat_query.classify_company_data),
+}
+
+def _normalizar_rucs(rucs) -> list[str]:
+    """RUCs sin espacios, sin vacíos y sin repetidos, en el orden en que llegaron."""
+    return list(dict.fromkeys(str(ruc).strip() for ruc in rucs if ruc and str(ruc).strip()))
+
+def _es_ruc_valido(ruc: str) -> bool:
+    return ruc.isdigit() and len(ruc) == 11
+
+def _consultar_con_reintentos(ruc, consultar, clasificar, limitador, reintentos, espera_base, cancelado) -> dict:
+    intentos = 0
+    while True:
+        limitador.esperar()
+        intentos += 1
+        try:
+            resultado = consultar(ruc)
+            estado = clasificar(resultado)
+        except Exception as e:
+            resultado, estado = {"error": str(e)}, ERROR
+        if estado != ERROR or intentos > reintentos or cancelado.is_set():
+            return {"ruc": ruc, "estado": estado, "resultado": resultado, "intentos": intentos}
+        # Espera exponencial con variación aleatoria para no reintentar todos a la vez
+        time.sleep(espera_base * (2 ** (intentos - 1)) + random.uniform(0, espera_base))
+
+def enriquecer_rucs(rucs, fuente: str = 'ficha', trabajadores: int = TRABAJADORES,
+                    consultas_por_segundo: float = None, reintentos: int = REINTENTOS,
+                    espera_base: float = ESPERA_BASE_SEGUNDOS, consultar=None, clasificar=None):
+    """
+    Consulta un lote de RUCs y produce un registro por RUC único a medida que termina:
+    {'ruc', 'estado' (ENCONTRADO, NO_ENCONTRADO o ERROR), 'resultado', 'intentos'}.
+    fuente elige el scraper ('ficha': nombre y dirección; 'buscador': tabla de datos de la empresa);
+    consultar/clasificar permiten usar otra función de consulta; consultas_por_segundo limita
+    cuántas empiezan por segundo, solo para funciones propias que no pasen por cliente_http.
+    Los RUCs que no tienen 11 dígitos se reportan como ERROR sin consultarse.
+    Si se deja de iterar antes de terminar, las consultas pendientes se cancelan.
+    """
+    fuente_consultar, fuente_clasificar = FUENTES[fuente]
+    consultar = consultar or fuente_consultar
+    clasificar = clasificar or fuente_clasificar
+
+    pendientes = []
+    for ruc in _normalizar_rucs(rucs):
+        if _es_ruc_valido(ruc):
+            pendientes.append(ruc)
+        else:
+            yield {"ruc": ruc, "estado": ERROR, "resultado": {"error": "RUC inválido. Debe contener 11 dígitos."}, "intentos": 0}
+    if not pendientes:
+        return
+
+    limitador = LimitadorTasa(consultas_por_segundo or 0) # 0: sin espera
+    cancelado = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(trabajadores, len(pendientes))))
+    try:
+        futures = {
+            executor.submit(_consultar_con_reintentos, ruc, consultar, clasificar, limitador, reintentos, espera_base, cancelado): ruc
+            for ruc in pendientes
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"ruc": futures[future], "estado": ERROR, "resultado": {"error": str(e)}, "intentos": 0}
+    finally:
+        cancelado.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def resumen_enriquecimiento(registros) -> dict:
+    """Cuenta los registros producidos por enriquecer_rucs según su estado."""
+    resumen = {ENCONTRADO: 0, NO_ENCONTRADO: 0, ERROR: 0}
+    for registro in registros:
+        resumen[registro["estado"]] += 1
+    return resumen
+
+if __name__ == '__main__':
+    # Uso: python enriquecimiento_rucs.py archivo_con_un_ruc_por_linea.txt [ficha|buscador]
+    import json
+    ruta_rucs = sys.argv[1]
+    fuente = sys.argv[2] if len(sys.argv) > 2 else 'ficha'
+    with open(ruta_rucs, encoding='utf-8') as archivo:
+        rucs = archivo.read().split()
+    inicio = time.time()
+    registros = []
+    for registro in enriquecer_rucs(rucs, fuente=fuente):
+        registros.append(registro)
+        print(json.dumps(registro, ensure_ascii=False))
+    print(f"{len(registros)} RUCs en {time.time() - inicio:.1f} s: {resumen_enriquecimiento(registros)}")
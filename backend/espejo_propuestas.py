@@ -0,0 +1,159 @@
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+# Añadir el directorio 'backend' al path para importar el cliente compartido y el esquema de propuestas
+sys.path.append(os.path.dirname(__file__))
+from cache_sqlite import DIRECTORIO_CACHE
+from cliente_supabase import obtener_cliente_supabase
+from esquema_propuestas import decodificar_propuesta
+
+# --- Espejo Local de la Tabla 'propuestas' ---
+# Copia de 'propuestas' en un archivo SQLite local para los reportes: las consultas se resuelven
+# en el disco y cada sincronización solo trae las filas modificadas desde la última (marca de agua
+# sobre COLUMNA_MARCA). La columna y el trigger que la actualiza en cada cambio se crean con
+# supabase/migrations/20261018000100_propuestas_updated_at.sql; mientras no exista, cada
+# sincronización trae la tabla completa. Las filas borradas en Supabase no aparecen en los cambios:
+# 'sincronizar(completa=True)' rehace el espejo.
+
+RUTA_ESPEJO = os.path.join(DIRECTORIO_CACHE, "propuestas.sqlite3")
+TABLA_PROPUESTAS = 'propuestas'
+COLUMNA_MARCA = 'updated_at'
+TAMANO_PAGINA_SINCRONIZACION = 1000
+
+class EspejoPropuestas:
+    def __init__(self, ruta: str = RUTA_ESPEJO):
+        self.ruta = ruta
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with self._conectar() as conexion:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            # La fila completa va en 'datos' (JSON); las columnas que se filtran u ordenan se copian aparte
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS propuestas ("
+                "proposal_id TEXT PRIMARY KEY, emisor_nombre TEXT, estado TEXT, "
+                "fecha_emision_factura TEXT, marca TEXT, datos TEXT NOT NULL)"
+            )
+            conexion.execute("CREATE INDEX IF NOT EXISTS idx_propuestas_emisor ON propuestas (emisor_nombre, estado)")
+            conexion.execute("CREATE INDEX IF NOT EXISTS idx_propuestas_fecha ON propuestas (fecha_emision_factura)")
+            conexion.execute("CREATE TABLE IF NOT EXISTS sincronizacion (clave TEXT PRIMARY KEY, valor TEXT)")
+
+    @contextlib.contextmanager
+    def _conectar(self):
+        """Conexión de corta duración: confirma la transacción al salir y siempre se cierra."""
+        conexion = sqlite3.connect(self.ruta, timeout=10)
+        try:
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def _leer_estado(self, conexion: sqlite3.Connection, clave: str):
+        fila = conexion.execute("SELECT valor FROM sincronizacion WHERE clave = ?", (clave,)).fetchone()
+        return fila[0] if fila else None
+
+    def marca_de_agua(self):
+        """Valor de COLUMNA_MARCA de la fila más reciente ya copiada (None si el espejo está vacío)."""
+        with self._conectar() as conexion:
+            return self._leer_estado(conexion, 'marca')
+
+    def sincronizar(self, cliente=None, completa: bool = False, tamano_pagina: int = TAMANO_PAGINA_SINCRONIZACION) -> int:
+        """
+        Copia al espejo las filas de 'propuestas' modificadas desde la última sincronización
+        (todas si 'completa' o si el espejo está vacío). Devuelve cuántas filas se copiaron.
+        Si la tabla no tiene COLUMNA_MARCA, trae todas las filas y rehace el espejo.
+        Si Supabase no está disponible, el espejo se queda con los datos que ya tenía.
+        """
+        cliente = cliente or obtener_cliente_supabase()
+        if not cliente:
+            return 0
+
+        with self._conectar() as conexion:
+            marca = None if completa else self._leer_estado(conexion, 'marca')
+
+        try:
+            filas_nuevas = self._traer_filas(cliente, marca, tamano_pagina, usar_marca=True)
+        except Exception as e:
+            # Lo más probable es que falte COLUMNA_MARCA (migración sin aplicar): se ordena solo por proposal_id
+            print(f"[AVISO en EspejoPropuestas.sincronizar]: sin '{COLUMNA_MARCA}' ({e}); se trae la tabla completa.")
+            try:
+                filas_nuevas = self._traer_filas(cliente, None, tamano_pagina, usar_marca=False)
+            except Exception as e:
+                print(f"[ERROR en EspejoPropuestas.sincronizar]: {e}")
+                return 0
+            completa = True
+
+        with self._conectar() as conexion:
+            if completa:
+                conexion.execute("DELETE FROM propuestas")
+            conexion.executemany(
+                "INSERT OR REPLACE INTO propuestas "
+                "(proposal_id, emisor_nombre, estado, fecha_emision_factura, marca, datos) VALUES (?, ?, ?, ?, ?, ?)",
+                [(fila.get('proposal_id'), fila.get('emisor_nombre'), fila.get('estado'),
+                  fila.get('fecha_emision_factura'), fila.get(COLUMNA_MARCA), json.dumps(fila))
+                 for fila in filas_nuevas]
+            )
+            marcas = [fila.get(COLUMNA_MARCA) for fila in filas_nuevas if fila.get(COLUMNA_MARCA) is not None]
+            if marcas:
+                conexion.execute("INSERT OR REPLACE INTO sincronizacion (clave, valor) VALUES ('marca', ?)", (max(marcas),))
+            elif completa:
+                conexion.execute("DELETE FROM sincronizacion WHERE clave = 'marca'")
+            conexion.execute("INSERT OR REPLACE INTO sincronizacion (clave, valor) VALUES ('sincronizado_en', ?)", (str(time.time()),))
+        return len(filas_nuevas)
+
+    def _traer_filas(self, cliente, marca, tamano_pagina: int, usar_marca: bool) -> list[dict]:
+        """Lee de Supabase, página por página, las filas con COLUMNA_MARCA >= marca (todas si marca es None)."""
+        filas = []
+        inicio = 0
+        while True:
+            # 'gte' en lugar de 'gt': las filas con la misma marca que la última copiada se vuelven
+            # a traer (y se reemplazan), así no se pierde ninguna modificada en el mismo instante
+            consulta = cliente.table(TABLA_PROPUESTAS).select('*')
+            if marca is not None:
+                consulta = consulta.gte(COLUMNA_MARCA, marca)
+            if usar_marca:
+                consulta = consulta.order(COLUMNA_MARCA)
+            response = consulta.order('proposal_id').range(inicio, inicio + tamano_pagina - 1).execute()
+            pagina = response.data or []
+            filas.extend(pagina)
+            if len(pagina) < tamano_pagina:
+                return filas
+            inicio += tamano_pagina
+
+    def _consultar(self, condicion: str = "", parametros: tuple = (), orden: str = "proposal_id", limite: int = -1) -> list[dict]:
+        with self._conectar() as conexion:
+            filas = conexion.execute(
+                f"SELECT datos FROM propuestas {condicion} ORDER BY {orden} LIMIT ?", (*parametros, limite)
+            ).fetchall()
+        # Mismo formato que supabase_handler: fechas DD-MM-YYYY y JSON como dict
+        return [decodificar_propuesta(json.loads(datos)) for datos, in filas]
+
+    def obtener(self, proposal_id: str):
+        """Propuesta con ese proposal_id, o None si no está en el espejo."""
+        filas = self._consultar("WHERE proposal_id = ?", (proposal_id,), limite=1)
+        return filas[0] if filas else None
+
+    def ultimas(self, limite: int = 5) -> list[dict]:
+        """Las 'limite' propuestas con la fecha de emisión más reciente."""
+        return self._consultar(orden="fecha_emision_factura DESC, proposal_id", limite=limite)
+
+    def por_emisor(self, emisor_nombre: str, estado: str = 'ACTIVO') -> list[dict]:
+        """Propuestas de un emisor_nombre con el estado dado (todas si estado es None)."""
+        if estado is None:
+            return self._consultar("WHERE emisor_nombre = ?", (emisor_nombre,))
+        return self._consultar("WHERE emisor_nombre = ? AND estado = ?", (emisor_nombre, estado))
+
+    def estadisticas(self) -> dict:
+        with self._conectar() as conexion:
+            filas = conexion.execute("SELECT COUNT(*) FROM propuestas").fetchone()[0]
+            marca = self._leer_estado(conexion, 'marca')
+            sincronizado_en = self._leer_estado(conexion, 'sincronizado_en')
+        return {
+            "filas": filas,
+            "marca_de_agua": marca,
+            "segundos_desde_sincronizacion": round(time.time() - float(sincronizado_en), 1) if sincronizado_en else None
+        }
@@ -0,0 +1,216 @@
+import datetime
+import json
+
+# --- Esquema de la Tabla 'propuestas' ---
+# Declaración única de las columnas: tipo y rutas de origen en los datos de sesión de una factura
+# (claves anidadas unidas por '.'). Cuando hay varias rutas se usa la primera con valor: los
+# resultados del Paso 2 (recalculate_result) tienen prioridad sobre los del Paso 1 (initial_calc_result).
+# El esquema se compila una sola vez en un codificador (sesión -> fila) y un decodificador (fila -> datos).
+
+ESQUEMA_PROPUESTAS = (
+    # Campos directos del formulario
+    ('emisor_nombre', 'texto', ('emisor_nombre',)),
+    ('emisor_ruc', 'texto', ('emisor_ruc',)),
+    ('aceptante_nombre', 'texto', ('aceptante_nombre',)),
+    ('aceptante_ruc', 'texto', ('aceptante_ruc',)),
+    ('numero_factura', 'texto', ('numero_factura',)),
+    ('monto_total_factura', 'numero', ('monto_total_factura',)),
+    ('monto_neto_factura', 'numero', ('monto_neto_factura',)),
+    ('moneda_factura', 'texto', ('moneda_factura',)),
+    ('fecha_emision_factura', 'fecha', ('fecha_emision_factura',)),
+    ('plazo_credito_dias', 'entero', ('plazo_credito_dias',)),
+    ('fecha_desembolso_factoring', 'fecha', ('fecha_desembolso_factoring',)),
+    ('tasa_de_avance', 'numero', ('tasa_de_avance',)),
+    ('interes_mensual', 'numero', ('interes_mensual',)),
+    ('comision_de_estructuracion', 'numero', ('comision_de_estructuracion',)),
+    ('comision_minima_pen', 'numero', ('comision_minima_pen',)),
+    ('comision_minima_usd', 'numero', ('comision_minima_usd',)),
+    ('comision_afiliacion_pen', 'numero', ('comision_afiliacion_pen',)),
+    ('comision_afiliacion_usd', 'numero', ('comision_afiliacion_usd',)),
+    ('aplicar_comision_afiliacion', 'booleano', ('aplicar_comision_afiliacion',)),
+    ('detraccion_porcentaje', 'numero', ('detraccion_porcentaje',)),
+    ('anexo_number', 'entero', ('anexo_number',)),
+    ('contract_number', 'entero', ('contract_number',)),
+
+    # Campos calculados
+    ('fecha_pago_calculada', 'fecha', ('fecha_pago_calculada',)),
+    ('plazo_operacion_calculado', 'entero', ('plazo_operacion_calculado',)),
+
+    # Resultados del cálculo (Paso 2 con respaldo en el Paso 1)
+    ('capital_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.capital', 'initial_calc_result.capital')),
+    ('interes_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.interes', 'initial_calc_result.interes')),
+    ('igv_interes_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.igv_interes', 'initial_calc_result.igv_interes')),
+    ('comision_estructuracion_monto_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.comision_estructuracion', 'initial_calc_result.comision_estructuracion')),
+    ('igv_comision_estructuracion_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.igv_comision_estructuracion', 'initial_calc_result.igv_comision')),
+    ('comision_afiliacion_monto_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.comision_afiliacion', 'initial_calc_result.comision_afiliacion')),
+    ('igv_afiliacion_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.igv_afiliacion', 'initial_calc_result.igv_afiliacion')),
+    ('abono_real_calculado', 'numero', ('recalculate_result.resultado_busqueda.abono_real_calculado', 'initial_calc_result.abono_real_teorico')),
+    ('margen_seguridad_calculado', 'numero', ('recalculate_result.calculo_con_tasa_encontrada.margen_seguridad', 'initial_calc_result.margen_seguridad')),
+    ('tasa_avance_encontrada_calculada', 'numero', ('recalculate_result.resultado_busqueda.tasa_avance_encontrada',)),
+
+    # Resultado completo del Paso 2, en una columna JSONB. Una columna de texto existente se migra con
+    # supabase/migrations/20261018000000_propuestas_recalculate_result_jsonb.sql
+    ('recalculate_result_json', 'json', ('recalculate_result',)),
+)
+
+# --- Conversiones por Tipo ---
+
+def _identidad(valor):
+    return valor
+
+def _a_numero(valor):
+    """Intenta convertir un valor a float, si es posible."""
+    if valor is None:
+        return None
+    try:
+        return float(valor)
+    except (ValueError, TypeError):
+        return None
+
+def _a_entero(valor):
+    """Intenta convertir un valor a int, si es posible."""
+    if valor is None:
+        return None
+    try:
+        return int(valor)
+    except (ValueError, TypeError):
+        return None
+
+def _a_booleano(valor) -> bool:
+    return bool(valor) if valor is not None else False
+
+def _fecha_a_iso(valor):
+    """Convierte una fecha de DD-MM-YYYY a YYYY-MM-DD."""
+    if not valor or not isinstance(valor, str):
+        return None
+    try:
+        return datetime.datetime.strptime(valor, '%d-%m-%Y').strftime('%Y-%m-%d')
+    except (ValueError, TypeError):
+        return None
+
+def _fecha_desde_iso(valor):
+    """Convierte una fecha de YYYY-MM-DD a DD-MM-YYYY; si el formato ya es otro o es inválido, se deja como está."""
+    if not valor or not isinstance(valor, str):
+        return valor
+    try:
+        return datetime.datetime.strptime(valor, '%Y-%m-%d').strftime('%d-%m-%Y')
+    except ValueError:
+        return valor
+
+def _json_a_columna(valor):
+    # La columna es JSONB: se envía el dict tal cual y PostgREST lo guarda como JSON estructurado
+    return valor if valor else None
+
+def _json_desde_columna(valor):
+    """Devuelve el JSON como dict; las filas antiguas lo guardaban como texto serializado con json.dumps."""
+    if isinstance(valor, str):
+        try:
+            return json.loads(valor)
+        except json.JSONDecodeError:
+            return None
+    return valor
+
+# tipo -> (codificar para la base de datos, decodificar desde la base de datos)
+CONVERSIONES_POR_TIPO = {
+    'texto': (_identidad, _identidad),
+    'numero': (_a_numero, _identidad),
+    'entero': (_a_entero, _identidad),
+    'booleano': (_a_booleano, _identidad),
+    'fecha': (_fecha_a_iso, _fecha_desde_iso),
+    'json': (_json_a_columna, _json_desde_columna),
+}
+
+# --- Compilación del Esquema ---
+
+def _compilar_codificador():
+    return tuple(
+        (columna, tuple(tuple(ruta.split('.')) for ruta in rutas), CONVERSIONES_POR_TIPO[tipo][0])
+        for columna, tipo, rutas in ESQUEMA_PROPUESTAS
+    )
+
+def _compilar_decodificador():
+    # Solo las columnas cuya lectura requiere trabajo; el resto se devuelve tal cual
+    return tuple(
+        (columna, CONVERSIONES_POR_TIPO[tipo][1])
+        for columna, tipo, _ in ESQUEMA_PROPUESTAS
+        if CONVERSIONES_POR_TIPO[tipo][1] is not _identidad
+    )
+
+_CODIFICADOR = _compilar_codificador()
+_DECODIFICADOR = _compilar_decodificador()
+
+def codificar_propuesta(datos_sesion: dict) -> dict:
+    """Convierte los datos de sesión de una factura en una fila tipada de 'propuestas'."""
+    fila = {}
+    for columna, rutas, codificar in _CODIFICADOR:
+        valor = None
+        for ruta in rutas:
+            valor = datos_sesion
+            for clave in ruta:
+                if not isinstance(valor, dict):
+                    valor = None
+                    break
+                valor = valor.get(clave)
+            if valor is not None:
+                break
+        fila[columna] = codificar(valor)
+    return fila
+
+def decodificar_propuesta(fila: dict) -> dict:
+    """
+    Convierte en el lugar una fila leída de 'propuestas' al formato de la aplicación
+    (fechas DD-MM-YYYY y columnas JSON como dict).
+    """
+    for columna, decodificar in _DECODIFICADOR:
+        if columna in fila:
+            fila[columna] = decodificar(fila[columna])
+    return fila
+
+def proyeccion_json(columna: str, ruta: str, alias: str) -> str:
+    """
+    Proyección PostgREST de un valor dentro de una columna JSONB ('a.b' -> 'alias:columna->a->b').
+    El servidor extrae solo ese valor, sin enviar ni volver a parsear el JSON completo.
+    """
+    return f"{alias}:{columna}->" + "->".join(ruta.split('.'))
+
+def valor_en_ruta(datos, ruta: str):
+    """
+    Equivalente en Python de proyeccion_json: el valor en 'a.b' dentro de un dict ya decodificado,
+    o None si falta algún nivel. Se usa cuando la columna no es JSONB y el servidor no puede proyectar.
+    """
+    for clave in ruta.split('.'):
+        if not isinstance(datos, dict):
+            return None
+        datos = datos.get(clave)
+    return datos
+
+if __name__ == '__main__':
+    # --- Micro-benchmark: costo por fila de codificar y decodificar ---
+    import timeit
+
+    datos_sesion = {
+        'emisor_nombre': 'EMPRESA DE PRUEBA S.A.C.', 'emisor_ruc': '20123456789',
+        'aceptante_nombre': 'ACEPTANTE S.A.', 'aceptante_ruc': '20987654321',
+        'numero_factura': 'F001-1234', 'monto_total_factura': 11800.0, 'monto_neto_factura': 10000.0,
+        'moneda_factura': 'PEN', 'fecha_emision_factura': '01-08-2025', 'plazo_credito_dias': 60,
+        'fecha_desembolso_factoring': '05-08-2025', 'tasa_de_avance': 0.98, 'interes_mensual': 0.0125,
+        'comision_de_estructuracion': 0.5, 'comision_minima_pen': 100.0, 'comision_minima_usd': 30.0,
+        'comision_afiliacion_pen': 200.0, 'comision_afiliacion_usd': 60.0, 'aplicar_comision_afiliacion': True,
+        'detraccion_porcentaje': 12.0, 'fecha_pago_calculada': '30-09-2025', 'plazo_operacion_calculado': 56,
+        'anexo_number': 3, 'contract_number': 7,
+        'initial_calc_result': {'capital': 9800.0, 'interes': 230.1, 'igv_interes': 41.42, 'comision_estructuracion': 100.0,
+                                'igv_comision': 18.0, 'comision_afiliacion': 200.0, 'igv_afiliacion': 36.0,
+                                'abono_real_teorico': 9174.48, 'margen_seguridad': 200.0},
+        'recalculate_result': {'resultado_busqueda': {'tasa_avance_encontrada': 0.979, 'abono_real_calculado': 9170.0},
+                               'calculo_con_tasa_encontrada': {'capital': 9790.0, 'interes': 229.9, 'igv_interes': 41.38,
+                                                               'comision_estructuracion': 100.0, 'igv_comision_estructuracion': 18.0,
+                                                               'comision_afiliacion': 200.0, 'igv_afiliacion': 36.0,
+                                                               'margen_seguridad': 210.0}},
+    }
+    fila = codificar_propuesta(datos_sesion)
+    repeticiones = 20000
+    segundos_codificar = timeit.timeit(lambda: codificar_propuesta(datos_sesion), number=repeticiones)
+    segundos_decodificar = timeit.timeit(lambda: decodificar_propuesta(dict(fila)), number=repeticiones)
+    print(f"Columnas: {len(ESQUEMA_PROPUESTAS)}")
+    print(f"Codificar:   {segundos_codificar / repeticiones * 1e6:.1f} µs por fila")
+    print(f"Decodificar: {segundos_decodificar / repeticiones * 1e6:.1f} µs por fila")
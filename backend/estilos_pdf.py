@@ -0,0 +1,88 @@
+import functools
+import io
+import os
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image, Paragraph
+
+# --- Estilos y Recursos Compartidos de los PDFs ---
+# Todos los generadores de ReportLab (anexos, perfil, reporte consolidado) usan la misma hoja de
+# estilos y el mismo logo. Se construyen una sola vez por proceso: la hoja de estilos queda
+# congelada (no admite estilos nuevos) y el logo se lee y decodifica una vez, en lugar de repetir
+# ese trabajo por cada documento al generar cientos de anexos en lote.
+
+RUTA_LOGO = os.environ.get("INANDES_LOGO_PATH", "C:/Users/rguti/Inandes.TECH/inputs_para_generated_pdfs/LOGO.png")
+
+class HojaEstilosCongelada(StyleSheet1):
+    """Hoja de estilos compartida: se lee como cualquier StyleSheet1, pero no se le pueden añadir estilos."""
+
+    def __init__(self, base: StyleSheet1):
+        super().__init__()
+        self.byName = base.byName
+        self.byAlias = base.byAlias
+
+    def add(self, style, alias=None):
+        raise TypeError(f"La hoja de estilos compartida es de solo lectura; define '{style.name}' en estilos_pdf.py")
+
+def _construir_estilos() -> StyleSheet1:
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='RightAlign', alignment=TA_RIGHT))
+    styles.add(ParagraphStyle(name='CenterAlign', alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name='LeftAlign', alignment=TA_LEFT))
+    styles.add(ParagraphStyle(name='SmallFont', fontSize=7))
+    styles.add(ParagraphStyle(name='ExtraSmallFont', fontSize=7))
+    styles.add(ParagraphStyle(name='BoldSmallFont', fontSize=6, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle(name='BoldNormal', fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle(name='BoldSize7', fontName='Helvetica-Bold', fontSize=7))
+
+    # Variantes alineadas de los estilos en negrita
+    styles.add(ParagraphStyle(name='BoldNormalRight', parent=styles['BoldNormal'], alignment=TA_RIGHT))
+    styles.add(ParagraphStyle(name='BoldNormalCenter', parent=styles['BoldNormal'], alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name='BoldSmallFontRight', parent=styles['BoldSmallFont'], alignment=TA_RIGHT))
+    styles.add(ParagraphStyle(name='BoldSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name='BoldExtraSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER, fontSize=6, textColor=colors.blue))
+    styles.add(ParagraphStyle(name='BoldExtraExtraSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER, fontSize=5, textColor=colors.blue))
+    styles.add(ParagraphStyle(name='BoldSize7Right', parent=styles['BoldSize7'], alignment=TA_RIGHT))
+    styles.add(ParagraphStyle(name='SmallFontCenter', parent=styles['SmallFont'], alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name='SmallFontRight', parent=styles['SmallFont'], alignment=TA_RIGHT))
+
+    styles.add(ParagraphStyle(name='BlueSmallFont', fontSize=7, fontName='Helvetica', textColor=colors.blue))
+    styles.add(ParagraphStyle(name='TinyFont', fontSize=5))
+    styles.add(ParagraphStyle(name='SmallTinyFont', fontSize=5, leading=5))
+    return styles
+
+@functools.lru_cache(maxsize=None)
+def obtener_estilos() -> StyleSheet1:
+    """Hoja de estilos de los PDFs (la de ejemplo de ReportLab más los estilos propios), construida una vez por proceso."""
+    return HojaEstilosCongelada(_construir_estilos())
+
+@functools.lru_cache(maxsize=None)
+def lector_logo():
+    """
+    Logo de INANDES leído y decodificado una sola vez por proceso, como ImageReader (sirve para
+    canvas.drawImage). Devuelve None si el archivo no existe.
+    """
+    if not os.path.exists(RUTA_LOGO):
+        print(f"Warning: Logo not found at {RUTA_LOGO}. Using placeholder text.")
+        return None
+    with open(RUTA_LOGO, 'rb') as archivo:
+        datos = archivo.read()
+    lector = ImageReader(io.BytesIO(datos))
+    lector.getRGBData() # Decodifica ya: ReportLab guarda el resultado en el lector y lo reutiliza en cada PDF
+    return lector
+
+def logo_inandes(width=1.5*inch, height=0.5*inch):
+    """
+    Flowable con el logo para la cabecera de un documento, o un texto de reemplazo si no hay logo.
+    Los flowables guardan estado de maquetación, así que se crea uno nuevo por documento; lo que se
+    comparte es la imagen ya decodificada.
+    """
+    lector = lector_logo()
+    if lector is None:
+        return Paragraph("INANDES Logo Placeholder", obtener_estilos()['RightAlign'])
+    logo = Image(RUTA_LOGO, width=width, height=height)
+    logo._img = lector # Evita que Image vuelva a abrir el archivo
+    return logo
@@ -0,0 +1,49 @@
+import functools
+import numpy as np
+
+# --- Tabla de Factores de Interés Compuesto ---
+# El libro usa pocas tasas mensuales y plazos de 0 a 360 días, así que unas pocas
+# combinaciones (tasa, plazo) se repiten en todos los cálculos. La caché LRU está
+# acotada para que una tasa atípica no la haga crecer sin límite.
+TAMANO_MAXIMO_CACHE = 4096
+
+@functools.lru_cache(maxsize=TAMANO_MAXIMO_CACHE)
+def factor_interes_compuesto(interes_mensual: float, plazo: int) -> float:
+    """
+    Devuelve el factor de interés compuesto diario ((1 + interes_mensual / 30) ** plazo) - 1,
+    memorizado por (interes_mensual, plazo).
+    """
+    tasa_diaria = interes_mensual / 30
+    return ((1 + tasa_diaria) ** plazo) - 1
+
+def factores_interes_compuesto(interes_mensual, plazo) -> np.ndarray:
+    """
+    Versión por columnas: obtiene el factor para cada par (interes_mensual, plazo) de los arreglos,
+    consultando la caché una sola vez por combinación distinta del lote.
+    """
+    interes_mensual, plazo = np.broadcast_arrays(np.asarray(interes_mensual, dtype=float), np.asarray(plazo))
+    forma = interes_mensual.shape
+    pares = np.stack([interes_mensual.ravel(), plazo.ravel().astype(float)], axis=1)
+    pares_unicos, inverso = np.unique(pares, axis=0, return_inverse=True)
+
+    factores_unicos = np.array(
+        [factor_interes_compuesto(tasa, dias) for tasa, dias in pares_unicos.tolist()],
+        dtype=float
+    )
+    return factores_unicos[inverso.reshape(-1)].reshape(forma)
+
+def estadisticas_cache() -> dict:
+    """Devuelve los contadores de aciertos/fallos de la caché para verificar su rendimiento."""
+    info = factor_interes_compuesto.cache_info()
+    consultas = info.hits + info.misses
+    return {
+        "aciertos": info.hits,
+        "fallos": info.misses,
+        "tasa_aciertos": round(info.hits / consultas, 4) if consultas else 0.0,
+        "entradas": info.currsize,
+        "tamano_maximo": info.maxsize
+    }
+
+def limpiar_cache() -> None:
+    """Vacía la caché y reinicia sus contadores."""
+    factor_interes_compuesto.cache_clear()
@@ -17,6 +17,10 @@ st.set_page_config(
     page_icon="📊",
 )
 
+# --- Precarga del directorio de empresas (una vez por proceso; todas las sesiones comparten la caché) ---
+# Corre en segundo plano para no bloquear la primera carga de la página
+supabase_handler.precargar_directorio_empresas_en_segundo_plano()
+
 # --- Funciones de Ayuda y Callbacks ---
 def update_date_calculations(invoice, changed_field=None):
     try:
@@ -101,17 +105,8 @@ def flatten_db_proposal(proposal):
     print(f"--- [DEBUG] flatten_db_proposal: Initial invoice_net_amount: {proposal.get('invoice_net_amount')} ---")
     print(f"--- [DEBUG] flatten_db_proposal: Initial advance_rate: {proposal.get('advance_rate')} ---")
 
-    recalc_result = proposal.get('recalculate_result', {})
-
-    # --- ROBUSTNESS FIX: Ensure recalc_result is a dictionary ---
-    if isinstance(recalc_result, str):
-        try:
-            recalc_result = json.loads(recalc_result)
-            print(f"--- [DEBUG] flatten_db_proposal: Parsed recalc_result from string. ---")
-        except json.JSONDecodeError:
-            recalc_result = {}
-            print(f"--- [DEBUG] flatten_db_proposal: Failed to parse recalc_result string. ---")
-    # --- END FIX ---
+    # Las propuestas leídas de la base traen el resultado del Paso 2 ya como dict en 'recalculate_result_json'
+    recalc_result = proposal.get('recalculate_result') or proposal.get('recalculate_result_json') or {}
 
     desglose = recalc_result.get('desglose_final_detallado', {})
     calculos = recalc_result.get('calculo_con_tasa_encontrada', {})
@@ -307,57 +302,83 @@ with st.expander("", expanded=True):
             st.session_state.pdf_datos_cargados = False # Reset this flag
 
         if not st.session_state.pdf_datos_cargados: # Process only if not already processed for current files
+            # Parseo concurrente de todos los PDFs directamente desde el buffer del uploader (sin archivos temporales);
+            # los resultados llegan a medida que terminan
+            archivos_por_id = {uploaded_file.file_id: uploaded_file for uploaded_file in uploaded_pdf_files}
+            parsed_por_id = {}
+            barra_progreso = st.progress(0.0, text=f"Procesando {len(archivos_por_id)} PDF(s)...")
+            try:
+                for procesados, (file_id, parsed_data) in enumerate(
+                    pdf_parser.extract_fields_from_pdfs(
+                        {file_id: uploaded_file.getbuffer() for file_id, uploaded_file in archivos_por_id.items()},
+                        lazy=True, # Los datos de la factura están en la primera página; los anexos no se leen
+                        use_cache=True # Las re-cargas del mismo PDF se resuelven desde la caché en disco
+                    ),
+                    start=1
+                ):
+                    parsed_por_id[file_id] = parsed_data
+                    barra_progreso.progress(
+                        procesados / len(archivos_por_id),
+                        text=f"{archivos_por_id[file_id].name} procesado ({procesados}/{len(archivos_por_id)})"
+                    )
+            except Exception as e:
+                st.error(f"Error al parsear los PDFs: {e}")
+            barra_progreso.empty()
+
+            # Razones sociales de todos los RUCs de la carga en una sola consulta
+            with st.spinner("Consultando base de datos..."):
+                razones_sociales = supabase_handler.get_razones_sociales_by_rucs(
+                    ruc
+                    for parsed_data in parsed_por_id.values()
+                    for ruc in (parsed_data.get('emisor_ruc'), parsed_data.get('aceptante_ruc'))
+                )
+
+            # Se conserva el orden de carga, sin importar el orden en que terminaron los procesos
             for uploaded_file in uploaded_pdf_files:
-                temp_file_path = os.path.join("C:/Users/rguti/Inandes.TECH/backend", f"temp_uploaded_pdf_{uploaded_file.file_id}.pdf")
-                with open(temp_file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
+                parsed_data = parsed_por_id.get(uploaded_file.file_id)
+                if parsed_data is None:
+                    continue
+                try:
+                    if parsed_data.get("error"):
+                        st.error(f"Error al procesar el PDF {uploaded_file.name}: {parsed_data['error']}")
+                    else:
+                        invoice_entry = {
+                            'emisor_ruc': parsed_data.get('emisor_ruc', ''),
+                            'aceptante_ruc': parsed_data.get('aceptante_ruc', ''),
+                            'fecha_emision_factura': parsed_data.get('fecha_emision', ''),
+                            'monto_total_factura': parsed_data.get('monto_total', 0.0),
+                            'monto_neto_factura': parsed_data.get('monto_neto', 0.0),
+                            'moneda_factura': parsed_data.get('moneda', 'PEN'),
+                            'numero_factura': parsed_data.get('invoice_id', ''),
+                            'parsed_pdf_name': uploaded_file.name,
+                            'file_id': uploaded_file.file_id,
+                            'emisor_nombre': '',
+                            'aceptante_nombre': '',
+                            'plazo_credito_dias': None,
+                            'fecha_desembolso_factoring': '',
+                            'tasa_de_avance': st.session_state.default_tasa_de_avance,
+                            'interes_mensual': st.session_state.default_interes_mensual,
+                            'comision_afiliacion_pen': st.session_state.default_comision_afiliacion_pen,
+                            'comision_afiliacion_usd': st.session_state.default_comision_afiliacion_usd,
+                            'aplicar_comision_afiliacion': False,
+                            'detraccion_porcentaje': 0.0, # Will be calculated later
+                            'fecha_pago_calculada': '', # Will be calculated later
+                            'plazo_operacion_calculado': 0, # Will be calculated later
+                            'initial_calc_result': None,
+                            'recalculate_result': None,
+                            'dias_minimos_interes_individual': 15,
+                        }
 
-                with st.spinner(f"Procesando {uploaded_file.name} y consultando base de datos..."):
-                    try:
-                        parsed_data = pdf_parser.extract_fields_from_pdf(temp_file_path)
-                        if parsed_data.get("error"):
-                            st.error(f"Error al procesar el PDF {uploaded_file.name}: {parsed_data['error']}")
-                        else:
-                            invoice_entry = {
-                                'emisor_ruc': parsed_data.get('emisor_ruc', ''),
-                                'aceptante_ruc': parsed_data.get('aceptante_ruc', ''),
-                                'fecha_emision_factura': parsed_data.get('fecha_emision', ''),
-                                'monto_total_factura': parsed_data.get('monto_total', 0.0),
-                                'monto_neto_factura': parsed_data.get('monto_neto', 0.0),
-                                'moneda_factura': parsed_data.get('moneda', 'PEN'),
-                                'numero_factura': parsed_data.get('invoice_id', ''),
-                                'parsed_pdf_name': uploaded_file.name,
-                                'file_id': uploaded_file.file_id,
-                                'emisor_nombre': '',
-                                'aceptante_nombre': '',
-                                'plazo_credito_dias': None,
-                                'fecha_desembolso_factoring': '',
-                                'tasa_de_avance': st.session_state.default_tasa_de_avance,
-                                'interes_mensual': st.session_state.default_interes_mensual,
-                                'comision_afiliacion_pen': st.session_state.default_comision_afiliacion_pen,
-                                'comision_afiliacion_usd': st.session_state.default_comision_afiliacion_usd,
-                                'aplicar_comision_afiliacion': False,
-                                'detraccion_porcentaje': 0.0, # Will be calculated later
-                                'fecha_pago_calculada': '', # Will be calculated later
-                                'plazo_operacion_calculado': 0, # Will be calculated later
-                                'initial_calc_result': None,
-                                'recalculate_result': None,
-                                'dias_minimos_interes_individual': 15,
-                            }
-
-                            if invoice_entry['emisor_ruc']:
-                                invoice_entry['emisor_nombre'] = supabase_handler.get_razon_social_by_ruc(invoice_entry['emisor_ruc'])
-                            if invoice_entry['aceptante_ruc']:
-                                invoice_entry['aceptante_nombre'] = supabase_handler.get_razon_social_by_ruc(invoice_entry['aceptante_ruc'])
-                            
-                            st.session_state.invoices_data.append(invoice_entry)
-                            st.success(f"Datos de {uploaded_file.name} cargados y enriquecidos. Revisa el formulario.")
-
-                    except Exception as e:
-                        st.error(f"Error al parsear el PDF {uploaded_file.name}: {e}")
-                    finally:
-                        if os.path.exists(temp_file_path):
-                            os.remove(temp_file_path)
+                        if invoice_entry['emisor_ruc']:
+                            invoice_entry['emisor_nombre'] = razones_sociales.get(invoice_entry['emisor_ruc'], '')
+                        if invoice_entry['aceptante_ruc']:
+                            invoice_entry['aceptante_nombre'] = razones_sociales.get(invoice_entry['aceptante_ruc'], '')
+                        
+                        st.session_state.invoices_data.append(invoice_entry)
+                        st.success(f"Datos de {uploaded_file.name} cargados y enriquecidos. Revisa el formulario.")
+
+                except Exception as e:
+                    st.error(f"Error al parsear el PDF {uploaded_file.name}: {e}")
             st.session_state.pdf_datos_cargados = True
 
     elif "invoices_data" not in st.session_state:
@@ -514,75 +535,65 @@ if st.session_state.invoices_data:
         if not all_valid:
             st.warning("No se pueden calcular todas las facturas. Por favor, revisa los errores mencionados arriba.")
         else:
-            # 2. If all are valid, proceed with calculation for each
+            # 2. If all are valid, build the whole lote and calculate it in a single API call
             st.success("Todas las facturas son válidas. Iniciando cálculos...")
+            num_invoices = len(st.session_state.invoices_data)
+            lote_api_data = []
             for idx, invoice in enumerate(st.session_state.invoices_data):
-                with st.spinner(f"Calculando Factura {idx + 1}/{len(st.session_state.invoices_data)}..."):
-                    num_invoices = len(st.session_state.invoices_data)
-                    
-                    # --- Lógica de Prorrateo ---
-                    comision_pen_apportioned = st.session_state.get('comision_afiliacion_pen_global', 0.0) / num_invoices if num_invoices > 0 else 0
-                    comision_usd_apportioned = st.session_state.get('comision_afiliacion_usd_global', 0.0) / num_invoices if num_invoices > 0 else 0
-                    comision_estructuracion_pct = st.session_state.comision_estructuracion_pct_global
-                    comision_min_pen_apportioned_struct = st.session_state.comision_estructuracion_min_pen_global / num_invoices if num_invoices > 0 else 0
-                    comision_min_usd_apportioned_struct = st.session_state.comision_estructuracion_min_usd_global / num_invoices if num_invoices > 0 else 0
-
-                    # --- Lógica de Selección de Moneda (NUEVO) ---
-                    if invoice['moneda_factura'] == 'USD':
-                        comision_minima_aplicable = comision_min_usd_apportioned_struct
-                        comision_afiliacion_aplicable = comision_usd_apportioned
-                    else: # Default to PEN
-                        comision_minima_aplicable = comision_min_pen_apportioned_struct
-                        comision_afiliacion_aplicable = comision_pen_apportioned
-
-                    # --- Determinación del Plazo para la API (Lógica Actualizada) ---
-                    plazo_real = invoice.get('plazo_operacion_calculado', 0)
-                    plazo_para_api = plazo_real
-                    if st.session_state.get('aplicar_dias_interes_minimo_global', False):
-                        dias_minimos_a_usar = invoice.get('dias_minimos_interes_individual', 15)
-                        plazo_para_api = max(plazo_real, dias_minimos_a_usar)
-
-                    # --- Payload para /calcular_desembolso (ACTUALIZADO) ---
-                    api_data = {
-                        "plazo_operacion": plazo_para_api,
-                        "mfn": invoice['monto_neto_factura'],
-                        "tasa_avance": invoice['tasa_de_avance'] / 100,
-                        "interes_mensual": invoice['interes_mensual'] / 100,
-                        "comision_estructuracion_pct": comision_estructuracion_pct / 100,
-                        "comision_minima_aplicable": comision_minima_aplicable,
-                        "igv_pct": 0.18,
-                        "comision_afiliacion_aplicable": comision_afiliacion_aplicable,
-                        "aplicar_comision_afiliacion": st.session_state.get('aplicar_comision_afiliacion_global', False)
-                    }
-                    try:
-                        response = requests.post(f"{API_BASE_URL}/calcular_desembolso", json=api_data)
-                        response.raise_for_status()
-                        invoice['initial_calc_result'] = response.json()
-
-                        if invoice['initial_calc_result'] and 'abono_real_teorico' in invoice['initial_calc_result']:
-                            abono_real_teorico = invoice['initial_calc_result']['abono_real_teorico']
-                            monto_desembolsar_objetivo = (abono_real_teorico // 10) * 10
-
-                            # --- Payload para /encontrar_tasa (ACTUALIZADO) ---
-                            api_data_recalculate = {
-                                "plazo_operacion": plazo_para_api,
-                                "mfn": invoice['monto_neto_factura'],
-                                "interes_mensual": invoice['interes_mensual'] / 100,
-                                "comision_estructuracion_pct": comision_estructuracion_pct / 100,
-                                "igv_pct": 0.18,
-                                "monto_objetivo": monto_desembolsar_objetivo,
-                                "comision_minima_aplicable": comision_minima_aplicable,
-                                "comision_afiliacion_aplicable": comision_afiliacion_aplicable,
-                                "aplicar_comision_afiliacion": st.session_state.get('aplicar_comision_afiliacion_global', False)
-                            }
-                            response_recalculate = requests.post(f"{API_BASE_URL}/encontrar_tasa", json=api_data_recalculate)
-                            response_recalculate.raise_for_status()
-                            invoice['recalculate_result'] = response_recalculate.json()
-                        else:
-                            invoice['recalculate_result'] = None
-                    except requests.exceptions.RequestException as e:
-                        st.error(f"Error de conexión con la API para Factura {idx + 1}: {e}")
-                        break 
+                # --- Lógica de Prorrateo ---
+                comision_pen_apportioned = st.session_state.get('comision_afiliacion_pen_global', 0.0) / num_invoices if num_invoices > 0 else 0
+                comision_usd_apportioned = st.session_state.get('comision_afiliacion_usd_global', 0.0) / num_invoices if num_invoices > 0 else 0
+                comision_estructuracion_pct = st.session_state.comision_estructuracion_pct_global
+                comision_min_pen_apportioned_struct = st.session_state.comision_estructuracion_min_pen_global / num_invoices if num_invoices > 0 else 0
+                comision_min_usd_apportioned_struct = st.session_state.comision_estructuracion_min_usd_global / num_invoices if num_invoices > 0 else 0
+
+                # --- Lógica de Selección de Moneda (NUEVO) ---
+                if invoice['moneda_factura'] == 'USD':
+                    comision_minima_aplicable = comision_min_usd_apportioned_struct
+                    comision_afiliacion_aplicable = comision_usd_apportioned
+                else: # Default to PEN
+                    comision_minima_aplicable = comision_min_pen_apportioned_struct
+                    comision_afiliacion_aplicable = comision_pen_apportioned
+
+                # --- Determinación del Plazo para la API (Lógica Actualizada) ---
+                plazo_real = invoice.get('plazo_operacion_calculado', 0)
+                plazo_para_api = plazo_real
+                if st.session_state.get('aplicar_dias_interes_minimo_global', False):
+                    dias_minimos_a_usar = invoice.get('dias_minimos_interes_individual', 15)
+                    plazo_para_api = max(plazo_real, dias_minimos_a_usar)
+
+                # --- Payload de la factura para /calcular_y_recalcular_lote ---
+                lote_api_data.append({
+                    "plazo_operacion": plazo_para_api,
+                    "mfn": invoice['monto_neto_factura'],
+                    "tasa_avance": invoice['tasa_de_avance'] / 100,
+                    "interes_mensual": invoice['interes_mensual'] / 100,
+                    "comision_estructuracion_pct": comision_estructuracion_pct / 100,
+                    "comision_minima_aplicable": comision_minima_aplicable,
+                    "igv_pct": 0.18,
+                    "comision_afiliacion_aplicable": comision_afiliacion_aplicable,
+                    "aplicar_comision_afiliacion": st.session_state.get('aplicar_comision_afiliacion_global', False)
+                })
+
+            with st.spinner(f"Calculando {num_invoices} factura(s)..."):
+                try:
+                    # El redondeo del monto objetivo y la búsqueda de tasa se hacen en el servidor.
+                    # La comisión se sigue decidiendo por factura, como con /calcular_desembolso + /encontrar_tasa.
+                    response = requests.post(
+                        f"{API_BASE_URL}/calcular_y_recalcular_lote",
+                        json={"facturas": lote_api_data, "decision_comision": "factura"}
+                    )
+                    response.raise_for_status()
+                    resultado_lote = response.json()
+
+                    if resultado_lote.get("error"):
+                        st.error(f"Error en el cálculo del lote: {resultado_lote['error']}")
+                    else:
+                        for invoice, resultado_factura in zip(st.session_state.invoices_data, resultado_lote.get("resultados_por_factura", [])):
+                            invoice['initial_calc_result'] = resultado_factura.get('initial_calc_result')
+                            invoice['recalculate_result'] = resultado_factura.get('recalculate_result')
+                except requests.exceptions.RequestException as e:
+                    st.error(f"Error de conexión con la API al calcular el lote: {e}")
             st.success("¡Cálculo de todas las facturas completado!")
 
 
@@ -866,66 +877,72 @@ with col_paso3:
 
     if st.button("GRABAR Propuesta en Base de Datos", disabled=not can_save_proposal):
         if can_save_proposal:
-            for idx, invoice in enumerate(st.session_state.invoices_data):
+            # Obtener los valores de los inputs
+            anexo_number_str = st.session_state.anexo_number
+            contract_number_str = st.session_state.contract_number
+
+            # Convertir a entero o None si está vacío
+            anexo_number_int = int(anexo_number_str) if anexo_number_str else None
+            contract_number_int = int(contract_number_str) if contract_number_str else None
+
+            lote_session_data = []
+            for invoice in st.session_state.invoices_data:
                 if invoice.get('recalculate_result'):
-                    with st.spinner(f"Guardando propuesta para Factura {idx + 1}..."):
-                        # Obtener los valores de los inputs
-                        anexo_number_str = st.session_state.anexo_number
-                        contract_number_str = st.session_state.contract_number
-
-                        # Convertir a entero o None si está vacío
-                        anexo_number_int = int(anexo_number_str) if anexo_number_str else None
-                        contract_number_int = int(contract_number_str) if contract_number_str else None
-                        
-                        temp_session_data = {
-                            'emisor_nombre': invoice.get('emisor_nombre'),
-                            'emisor_ruc': invoice.get('emisor_ruc'),
-                            'aceptante_nombre': invoice.get('aceptante_nombre'),
-                            'aceptante_ruc': invoice.get('aceptante_ruc'),
-                            'numero_factura': invoice.get('numero_factura'),
-                            'monto_total_factura': invoice.get('monto_total_factura'),
-                            'monto_neto_factura': invoice.get('monto_neto_factura'),
-                            'moneda_factura': invoice.get('moneda_factura'),
-                            'fecha_emision_factura': invoice.get('fecha_emision_factura'),
-                            'plazo_credito_dias': invoice.get('plazo_credito_dias'),
-                            'fecha_desembolso_factoring': invoice.get('fecha_desembolso_factoring'),
-                            'tasa_de_avance': invoice.get('tasa_de_avance'),
-                            'interes_mensual': invoice.get('interes_mensual'),
-                            'comision_de_estructuracion': invoice.get('comision_de_estructuracion'),
-                            'comision_minima_pen': invoice.get('comision_minima_pen'),
-                            'comision_minima_usd': invoice.get('comision_minima_usd'),
-                            'comision_afiliacion_pen': invoice.get('comision_afiliacion_pen'),
-                            'comision_afiliacion_usd': invoice.get('comision_afiliacion_usd'),
-                            'aplicar_comision_afiliacion': invoice.get('aplicar_comision_afiliacion'),
-                            'detraccion_porcentaje': invoice.get('detraccion_porcentaje'),
-                            'fecha_pago_calculada': invoice.get('fecha_pago_calculada'),
-                            'plazo_operacion_calculado': invoice.get('plazo_operacion_calculado'),
-                            'initial_calc_result': invoice.get('initial_calc_result'),
-                            'recalculate_result': invoice.get('recalculate_result'),
-                            'anexo_number': anexo_number_int,
-                            'contract_number': contract_number_int,
-                        }
-                        success, message = supabase_handler.save_proposal(temp_session_data)
-                        if success:
-                            st.success(message)
-                            if "Propuesta con ID" in message:
-                                start_index = message.find("ID ") + 3
-                                end_index = message.find(" guardada")
-                                newly_saved_id = message[start_index:end_index]
-                                st.session_state.last_saved_proposal_id = newly_saved_id
-
-                                # --- MEJORA: Añadir automáticamente a la lista de impresión ---
-                                if 'accumulated_proposals' not in st.session_state:
-                                    st.session_state.accumulated_proposals = []
-                                
-                                full_proposal_details = supabase_handler.get_proposal_details_by_id(newly_saved_id)
-                                if full_proposal_details and 'proposal_id' in full_proposal_details:
-                                    if not any(p.get('proposal_id') == newly_saved_id for p in st.session_state.accumulated_proposals):
-                                        st.session_state.accumulated_proposals.append(full_proposal_details)
-                                        st.success(f"Propuesta {newly_saved_id} añadida a la lista de impresión.")
-                                # --- FIN MEJORA ---
-                        else:
-                            st.error(message)
+                    lote_session_data.append({
+                        'emisor_nombre': invoice.get('emisor_nombre'),
+                        'emisor_ruc': invoice.get('emisor_ruc'),
+                        'aceptante_nombre': invoice.get('aceptante_nombre'),
+                        'aceptante_ruc': invoice.get('aceptante_ruc'),
+                        'numero_factura': invoice.get('numero_factura'),
+                        'monto_total_factura': invoice.get('monto_total_factura'),
+                        'monto_neto_factura': invoice.get('monto_neto_factura'),
+                        'moneda_factura': invoice.get('moneda_factura'),
+                        'fecha_emision_factura': invoice.get('fecha_emision_factura'),
+                        'plazo_credito_dias': invoice.get('plazo_credito_dias'),
+                        'fecha_desembolso_factoring': invoice.get('fecha_desembolso_factoring'),
+                        'tasa_de_avance': invoice.get('tasa_de_avance'),
+                        'interes_mensual': invoice.get('interes_mensual'),
+                        'comision_de_estructuracion': invoice.get('comision_de_estructuracion'),
+                        'comision_minima_pen': invoice.get('comision_minima_pen'),
+                        'comision_minima_usd': invoice.get('comision_minima_usd'),
+                        'comision_afiliacion_pen': invoice.get('comision_afiliacion_pen'),
+                        'comision_afiliacion_usd': invoice.get('comision_afiliacion_usd'),
+                        'aplicar_comision_afiliacion': invoice.get('aplicar_comision_afiliacion'),
+                        'detraccion_porcentaje': invoice.get('detraccion_porcentaje'),
+                        'fecha_pago_calculada': invoice.get('fecha_pago_calculada'),
+                        'plazo_operacion_calculado': invoice.get('plazo_operacion_calculado'),
+                        'initial_calc_result': invoice.get('initial_calc_result'),
+                        'recalculate_result': invoice.get('recalculate_result'),
+                        'anexo_number': anexo_number_int,
+                        'contract_number': contract_number_int,
+                    })
+
+            # Todas las propuestas se graban en una sola inserción en bloque
+            with st.spinner(f"Guardando {len(lote_session_data)} propuesta(s)..."):
+                save_results = supabase_handler.save_proposals_batch(lote_session_data)
+
+            saved_ids = [result['proposal_id'] for result in save_results if result['success']]
+            for result in save_results:
+                if result['success']:
+                    st.success(f"Propuesta con ID {result['proposal_id']} guardada exitosamente.")
+                else:
+                    st.error(result['error'])
+
+            if saved_ids:
+                st.session_state.last_saved_proposal_id = saved_ids[-1]
+
+                # --- MEJORA: Añadir automáticamente a la lista de impresión ---
+                if 'accumulated_proposals' not in st.session_state:
+                    st.session_state.accumulated_proposals = []
+
+                saved_proposals = supabase_handler.get_proposal_details_by_ids(saved_ids)
+                for newly_saved_id in saved_ids:
+                    full_proposal_details = saved_proposals.get(newly_saved_id)
+                    if full_proposal_details and 'proposal_id' in full_proposal_details:
+                        if not any(p.get('proposal_id') == newly_saved_id for p in st.session_state.accumulated_proposals):
+                            st.session_state.accumulated_proposals.append(full_proposal_details)
+                            st.success(f"Propuesta {newly_saved_id} añadida a la lista de impresión.")
+                # --- FIN MEJORA ---
         else:
             st.warning("No hay resultados de cálculo para guardar.")
 
@@ -1170,15 +1187,16 @@ with col_consulta:
                     st.info(f"No se encontró ninguna propuesta con el ID: {st.session_state.search_proposal_id}")
             
             elif st.session_state.search_emisor_nombre:
-                found_proposals_partial = supabase_handler.get_active_proposals_by_emisor_nombre(st.session_state.search_emisor_nombre)
-                if found_proposals_partial:
-                    for proposal_partial in found_proposals_partial:
-                        full_proposal_details = supabase_handler.get_proposal_details_by_id(proposal_partial['proposal_id'])
-                        if full_proposal_details and 'proposal_id' in full_proposal_details:
-                            if not any(p['proposal_id'] == full_proposal_details['proposal_id'] for p in st.session_state.accumulated_proposals):
-                                # Flatten the proposal before adding it to the list
-                                st.session_state.accumulated_proposals.append(flatten_db_proposal(full_proposal_details))
-                                search_found = True
+                # Una sola consulta paginada trae las propuestas completas (sin una llamada por propuesta)
+                found_proposals = supabase_handler.get_active_proposal_details_by_emisor_nombre(st.session_state.search_emisor_nombre)
+                if found_proposals:
+                    accumulated_ids = {p['proposal_id'] for p in st.session_state.accumulated_proposals}
+                    for full_proposal_details in found_proposals:
+                        if full_proposal_details['proposal_id'] not in accumulated_ids:
+                            # Flatten the proposal before adding it to the list
+                            st.session_state.accumulated_proposals.append(flatten_db_proposal(full_proposal_details))
+                            accumulated_ids.add(full_proposal_details['proposal_id'])
+                            search_found = True
                 else:
                     st.info(f"No se encontraron propuestas activas para: {st.session_state.search_emisor_nombre}")
             else:
@@ -2,19 +2,23 @@
 import sys
 import os
 from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
 from fastapi.middleware.cors import CORSMiddleware
 
 # --- Configuración de Path para Módulos ---
 # Añadir el directorio raíz del proyecto al path de Python
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
+# Los módulos de 'backend' se importan entre sí por nombre simple (ej. 'factor_interes');
+# se añade su directorio para compartir una sola instancia de cada módulo.
+sys.path.append(os.path.join(project_root, 'backend'))
 
 # Importar las funciones de los módulos usando rutas relativas al proyecto
-from backend.calculadora_factoring_V_CLI import calcular_desembolso_inicial, encontrar_tasa_de_avance
+from backend.calculadora_factoring_V_CLI import calcular_desembolso_inicial, encontrar_tasa_de_avance, procesar_lote_encontrar_tasa, procesar_lote_calcular_y_recalcular, TOLERANCIA_MAXIMA
 from liquidacion.backend.calculadora_liquidacion import calcular_liquidacion
-from backend.supabase_handler import get_proposal_details_by_id
+from factor_interes import estadisticas_cache
+import supabase_async
 
 
 app = FastAPI(
@@ -56,6 +60,23 @@ class EncontrarTasaRequest(BaseModel):
     comision_minima_aplicable: float
     comision_afiliacion_aplicable: float = 0.0
     aplicar_comision_afiliacion: bool = False
+    tasa_avance_min: float = 0.90
+    tasa_avance_max: float = 1.00
+    # Ventana del modo exacto: más de un céntimo ya no garantiza reproducir el objetivo al céntimo
+    tolerancia: float = Field(0.01, gt=0, le=TOLERANCIA_MAXIMA)
+    max_iteraciones: int = 100
+    modo: Literal["cerrado", "exacto"] = "cerrado"
+
+class CalcularDesembolsoLoteRequest(BaseModel):
+    facturas: List[CalcularDesembolsoRequest]
+    modo: Literal["cerrado", "exacto"] = "cerrado"
+    # "factura": comisión decidida por factura (como /calcular_desembolso + /encontrar_tasa)
+    # "lote": decisión agregada del lote, la misma en el cálculo inicial y en la búsqueda
+    decision_comision: Literal["factura", "lote"] = "factura"
+
+class EncontrarTasaLoteRequest(BaseModel):
+    facturas: List[EncontrarTasaRequest]
+    modo: Literal["cerrado", "exacto"] = "cerrado"
 
 class LiquidarFacturaRequest(BaseModel):
     proposal_id: str
@@ -70,6 +91,13 @@ class LiquidarFacturaRequest(BaseModel):
 async def read_root():
     return {"message": "Bienvenido a la API de la Calculadora de Factoring v2"}
 
+@app.get("/estadisticas_cache_interes")
+async def estadisticas_cache_interes_endpoint():
+    """
+    Contadores de la caché de factores de interés compuesto (aciertos, fallos, entradas).
+    """
+    return estadisticas_cache()
+
 @app.post("/calcular_desembolso")
 async def calcular_desembolso_endpoint(request: CalcularDesembolsoRequest):
     """
@@ -86,34 +114,38 @@ async def encontrar_tasa_endpoint(request: EncontrarTasaRequest):
     resultado = encontrar_tasa_de_avance(**request.dict(exclude_unset=False))
     return resultado
 
+@app.post("/encontrar_tasa_lote")
+async def encontrar_tasa_lote_endpoint(request: EncontrarTasaLoteRequest):
+    """
+    Endpoint para el Modo 2 por lotes: resuelve la tasa de avance de todas las facturas
+    en una sola llamada, con la decisión de comisión agregada del lote.
+    """
+    lote_datos = [factura.dict(exclude_unset=False, exclude={"modo"}) for factura in request.facturas]
+    resultado = procesar_lote_encontrar_tasa(lote_datos, modo=request.modo)
+    return resultado
+
+@app.post("/calcular_y_recalcular_lote")
+async def calcular_y_recalcular_lote_endpoint(request: CalcularDesembolsoLoteRequest):
+    """
+    Endpoint del pipeline completo: cálculo inicial, redondeo del monto objetivo y
+    búsqueda de tasa para todo el lote en un solo viaje de ida y vuelta.
+    """
+    lote_datos = [factura.dict(exclude_unset=False) for factura in request.facturas]
+    resultado = procesar_lote_calcular_y_recalcular(lote_datos, modo=request.modo, decision_comision=request.decision_comision)
+    return resultado
+
 @app.post("/liquidar_factura")
 async def liquidar_factura_endpoint(request: LiquidarFacturaRequest):
     """
     Endpoint para el Módulo de Liquidación.
     """
-    # 1. Obtener los datos de la operación desde Supabase
-    datos_operacion = get_proposal_details_by_id(request.proposal_id)
+    # 1. Obtener los datos de la operación desde Supabase (en un hilo, sin bloquear el event loop).
+    # Solo se traen los campos de la liquidación; capital, interés y margen se leen del JSONB del Paso 2.
+    datos_operacion = await supabase_async.get_proposal_for_liquidation(request.proposal_id)
 
     if not datos_operacion or 'error' in datos_operacion:
         return {"error": f"No se pudieron obtener los datos para la propuesta con ID {request.proposal_id}"}
 
-    # --- INICIO DEL PARCHEO DE DATOS ---
-    import json
-    recalc_json_str = datos_operacion.get('recalculate_result_json')
-    if recalc_json_str:
-        try:
-            recalc_data = json.loads(recalc_json_str)
-            calculos = recalc_data.get('calculo_con_tasa_encontrada', {})
-            desglose = recalc_data.get('desglose_final_detallado', {})
-            
-            datos_operacion['capital_calculado'] = calculos.get('capital')
-            datos_operacion['interes_calculado'] = desglose.get('interes', {}).get('monto')
-            datos_operacion['margen_seguridad_calculado'] = desglose.get('margen_seguridad', {}).get('monto')
-        except json.JSONDecodeError:
-            # No hacer nada si el JSON está corrupto, la función de cálculo manejará los errores
-            pass
-    # --- FIN DEL PARCHEO DE DATOS ---
-
     # 2. Ejecutar la liquidación
     resultado = calcular_liquidacion(
         datos_operacion=datos_operacion,
@@ -1,45 +1,24 @@
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from reportlab.pdfgen import canvas
 from reportlab.platypus import PageBreak
 import os
+import sys
 import datetime
 import random
 
+# Styles and logo shared by every PDF generator (built once per process)
+sys.path.append(os.path.dirname(__file__))
+from estilos_pdf import obtener_estilos, logo_inandes
+
 def generate_pdf(output_filepath, data):
     doc = SimpleDocTemplate(output_filepath, pagesize=letter, leftMargin=0.5*inch, rightMargin=0.5*inch, topMargin=0.375*inch, bottomMargin=0.375*inch)
-    styles = getSampleStyleSheet()
+    styles = obtener_estilos()
     story = []
 
-    # Custom styles
-    styles.add(ParagraphStyle(name='RightAlign', alignment=TA_RIGHT))
-    styles.add(ParagraphStyle(name='CenterAlign', alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='LeftAlign', alignment=TA_LEFT))
-    styles.add(ParagraphStyle(name='SmallFont', fontSize=7))
-    styles.add(ParagraphStyle(name='BoldSmallFont', fontSize=6, fontName='Helvetica-Bold'))
-    styles.add(ParagraphStyle(name='BoldNormal', fontName='Helvetica-Bold'))
-
-    # New styles for alignment with bold fonts
-    styles.add(ParagraphStyle(name='BoldNormalRight', parent=styles['BoldNormal'], alignment=TA_RIGHT))
-    styles.add(ParagraphStyle(name='BoldSmallFontRight', parent=styles['BoldSmallFont'], alignment=TA_RIGHT))
-    styles.add(ParagraphStyle(name='BoldSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='BoldExtraSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER, fontSize=6, textColor=colors.blue))
-    styles.add(ParagraphStyle(name='BoldNormalCenter', parent=styles['BoldNormal'], alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='SmallFontCenter', parent=styles['SmallFont'], alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='BlueSmallFont', fontSize=7, fontName='Helvetica', textColor=colors.blue))
-    styles.add(ParagraphStyle(name='TinyFont', fontSize=5))
-    styles.add(ParagraphStyle(name='SmallTinyFont', fontSize=5, leading=5))
-    logo_path = "C:/Users/rguti/Inandes.TECH/inputs_para_generated_pdfs/LOGO.png"
-    inandes_logo = None
-    if os.path.exists(logo_path):
-        inandes_logo = Image(logo_path, width=1.5*inch, height=0.5*inch)
-    else:
-        print(f"Warning: Logo not found at {logo_path}. Using placeholder text.")
-        inandes_logo = Paragraph("INANDES Logo Placeholder", styles['RightAlign'])
+    inandes_logo = logo_inandes()
 
     # Left column content (Main Title + Client Info)
     left_column_content = []
@@ -86,8 +65,6 @@ def generate_pdf(output_filepath, data):
     story.append(Spacer(1, 0.05 * inch))
 
     # Anexo and Date
-    styles.add(ParagraphStyle(name='BoldSize7', fontName='Helvetica-Bold', fontSize=7))
-    styles.add(ParagraphStyle(name='BoldSize7Right', parent=styles['BoldSize7'], alignment=TA_RIGHT))
 
     anexo_date_data = [
         [Paragraph(f"<b>ANEXO {data.get('anexo_number', '31')}</b>", styles['BoldSize7']),
@@ -120,7 +97,6 @@ def generate_pdf(output_filepath, data):
 
     # Table Data (Example - replace with actual data from 'data' dictionary)
     table1_data = [table1_headers]
-    styles.add(ParagraphStyle(name='ExtraSmallFont', fontSize=7))
     for item in data.get('facturas_comision', []):
         table1_data.append([
             Paragraph(item.get('nro_factura', ''), styles['ExtraSmallFont']),
@@ -1,6 +1,76 @@
 import pdfplumber
 import re
+import io
+import os
+import sys
+import time
+import hashlib
 import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add the backend directory to the path to import the shared SQLite cache
+sys.path.append(os.path.dirname(__file__))
+from cache_sqlite import CacheSQLite, DIRECTORIO_CACHE
+
+REQUIRED_FIELDS = ['emisor_ruc', 'aceptante_ruc', 'invoice_id', 'fecha_emision', 'moneda', 'monto_total', 'monto_neto']
+
+# Bump whenever a change can alter the extracted fields: cached results from other versions are discarded.
+PARSER_VERSION = "3"
+RESULT_CACHE_PATH = os.path.join(DIRECTORIO_CACHE, "pdf_parser.sqlite3")
+RESULT_CACHE_MAX_ENTRIES = 5000
+
+# --- Spanish number words ---
+NUM_MAP = {
+    "CERO": 0, "UN": 1, "UNO": 1, "DOS": 2, "TRES": 3, "CUATRO": 4, "CINCO": 5,
+    "SEIS": 6, "SIETE": 7, "OCHO": 8, "NUEVE": 9, "DIEZ": 10,
+    "ONCE": 11, "DOCE": 12, "TRECE": 13, "CATORCE": 14, "QUINCE": 15,
+    "DIECISEIS": 16, "DIECISIETE": 17, "DIECIOCHO": 18, "DIECINUEVE": 19,
+    "VEINTE": 20, "VEINTIUN": 21, "VEINTIUNO": 21, "VEINTIDOS": 22, "VEINTITRES": 23,
+    "VEINTICUATRO": 24, "VEINTICINCO": 25, "VEINTISEIS": 26, "VEINTISIETE": 27,
+    "VEINTIOCHO": 28, "VEINTINUEVE": 29,
+    "TREINTA": 30, "CUARENTA": 40, "CINCUENTA": 50, "SESENTA": 60, "SETENTA": 70,
+    "OCHENTA": 80, "NOVENTA": 90,
+    "CIEN": 100, "CIENTO": 100, "DOSCIENTOS": 200, "TRESCIENTOS": 300,
+    "CUATROCIENTOS": 400, "QUINIENTOS": 500, "SEISCIENTOS": 600,
+    "SETECIENTOS": 700, "OCHOCIENTOS": 800, "NOVECIENTOS": 900
+}
+
+# --- Compiled patterns (compiled once at import, shared by every call) ---
+WHITESPACE_RE = re.compile(r'\s+')
+FRACTION_RE = re.compile(r'(Y|CON)\s*(\d+)/100')
+Y_SEPARATOR_RE = re.compile(r'\s+Y\s+')
+RUC_RE = re.compile(r'\b(20\d{9}|10\d{9})\b')
+INVOICE_ID_RE = re.compile(r'\b([EF][A-Z0-9]{3}-\d{1,8})\b')
+# Dates in DD/MM/YYYY, DD-MM-YYYY, or YYYY-MM-DD formats, preferring the ones after "Fecha de Emisión".
+LABELED_DATE_RE = re.compile(r'Fecha de Emisi[oó]n\s*:?\s*(\d{2}[-/]\d{2}[-/]\d{4}|\d{4}[-/]\d{2}[-/]\d{2})', re.IGNORECASE)
+ANY_DATE_RE = re.compile(r'\b(\d{2}[-/]\d{2}[-/]\d{4}|\d{4}[-/]\d{2}[-/]\d{2})\b')
+SON_CURRENCY_RE = re.compile(r'SON:.*?((?:SOLES|PEN)|(?:DOLAR|DOLARES|USD|US\$))', re.IGNORECASE)
+PEN_RE = re.compile(r'(S/|SOLES|PEN)', re.IGNORECASE)
+USD_RE = re.compile(r'(\$|USD|DOLARES|DOLAR AMERICANO)', re.IGNORECASE)
+TOTAL_NUMERIC_RE = re.compile(r'Importe Total\s*:\s*(?:S/|\$)?\s*([\d,]+\.\d{2})', re.IGNORECASE)
+SON_AMOUNT_RE = re.compile(r'SON:\s*(.*?)(?:SOLES|D[OÓ]LAR|USD|PEN)', re.IGNORECASE)
+NET_AMOUNT_RE = re.compile(r'(Monto neto pendiente de pago|SUBTOTAL VENTA)\s*:\s*(?:S/|\$)?\s*([\d,]+\.\d{2})', re.IGNORECASE)
+
+# --- Per-field timing counters ---
+# Counters are per process: with extract_fields_from_pdfs each pool worker keeps its own.
+_field_timings = {}
+
+def _record_timing(name: str, elapsed: float) -> None:
+    calls, total = _field_timings.get(name, (0, 0.0))
+    _field_timings[name] = (calls + 1, total + elapsed)
+
+def get_extraction_stats() -> dict:
+    """
+    Returns {name: {"calls", "total_ms", "avg_ms"}} for the text extraction step and each field extractor.
+    """
+    return {
+        name: {"calls": calls, "total_ms": round(total * 1000, 3), "avg_ms": round(total * 1000 / calls, 3)}
+        for name, (calls, total) in _field_timings.items()
+    }
+
+def reset_extraction_stats() -> None:
+    """Clears the timing counters."""
+    _field_timings.clear()
 
 def text_to_float(text_number: str) -> float:
     """
@@ -11,7 +81,7 @@ def text_to_float(text_number: str) -> float:
 
     # Handle fractional part like "Y 40/100" or "CON 40/100"
     fractional_part = 0.0
-    fraction_match = re.search(r'(Y|CON)\s*(\d+)/100', text_number)
+    fraction_match = FRACTION_RE.search(text_number)
     if fraction_match:
         try:
             fractional_part = float(fraction_match.group(2)) / 100
@@ -19,36 +89,21 @@ def text_to_float(text_number: str) -> float:
         except (ValueError, IndexError):
             fractional_part = 0.0
 
-    num_map = {
-        "CERO": 0, "UN": 1, "UNO": 1, "DOS": 2, "TRES": 3, "CUATRO": 4, "CINCO": 5,
-        "SEIS": 6, "SIETE": 7, "OCHO": 8, "NUEVE": 9, "DIEZ": 10,
-        "ONCE": 11, "DOCE": 12, "TRECE": 13, "CATORCE": 14, "QUINCE": 15,
-        "DIECISEIS": 16, "DIECISIETE": 17, "DIECIOCHO": 18, "DIECINUEVE": 19,
-        "VEINTE": 20, "VEINTIUN": 21, "VEINTIUNO": 21, "VEINTIDOS": 22, "VEINTITRES": 23,
-        "VEINTICUATRO": 24, "VEINTICINCO": 25, "VEINTISEIS": 26, "VEINTISIETE": 27,
-        "VEINTIOCHO": 28, "VEINTINUEVE": 29,
-        "TREINTA": 30, "CUARENTA": 40, "CINCUENTA": 50, "SESENTA": 60, "SETENTA": 70,
-        "OCHENTA": 80, "NOVENTA": 90,
-        "CIEN": 100, "CIENTO": 100, "DOSCIENTOS": 200, "TRESCIENTOS": 300,
-        "CUATROCIENTOS": 400, "QUINIENTOS": 500, "SEISCIENTOS": 600,
-        "SETECIENTOS": 700, "OCHOCIENTOS": 800, "NOVECIENTOS": 900
-    }
-    
-    text_number = re.sub(r'\s+Y\s+', ' ', text_number)
+    text_number = Y_SEPARATOR_RE.sub(' ', text_number)
 
     words = text_number.split()
     total_sum = 0
     current_number = 0
 
     for word in words:
-        if word in num_map:
-            current_number += num_map[word]
+        if word in NUM_MAP:
+            current_number += NUM_MAP[word]
         elif word == "MIL":
             if current_number == 0:
                 current_number = 1
             total_sum += current_number * 1000
             current_number = 0
-        elif word in ["MILLON", "MILLONES"]:
+        elif word in ("MILLON", "MILLONES"):
             if current_number == 0:
                 current_number = 1
             total_sum += current_number * 1000000
@@ -57,81 +112,225 @@ def text_to_float(text_number: str) -> float:
     total_sum += current_number
     return float(total_sum + fractional_part)
 
-def extract_fields_from_pdf(pdf_path: str) -> dict:
+# --- Field extractors ---
+# Each extractor takes the normalized text and returns (fields, strong). A strong match is final
+# (e.g. a labeled "Fecha de Emisión"); a weak one is a fallback (any date in the text) that a strong
+# match on a later page, read before lazy extraction stops, still replaces.
+
+def _extract_rucs(text: str) -> tuple[dict, bool]:
+    fields = {}
+    all_rucs = RUC_RE.findall(text)
+    if all_rucs:
+        fields['emisor_ruc'] = all_rucs[0]
+        if len(all_rucs) > 1:
+            fields['aceptante_ruc'] = all_rucs[1]
+    return fields, True
+
+def _extract_invoice_id(text: str) -> tuple[dict, bool]:
+    invoice_match = INVOICE_ID_RE.search(text)
+    return ({'invoice_id': invoice_match.group(1)} if invoice_match else {}), True
+
+def _extract_fecha_emision(text: str) -> tuple[dict, bool]:
+    date_match = LABELED_DATE_RE.search(text)
+    strong = date_match is not None
+    if not date_match:
+        date_match = ANY_DATE_RE.search(text)
+    if not date_match:
+        return {}, False
+    date_str = date_match.group(1).replace('/', '-')
+    try:
+        # YYYY-MM-DD is reformatted to DD-MM-YYYY; anything else is already DD-MM-YYYY
+        return {'fecha_emision': datetime.datetime.strptime(date_str, '%Y-%m-%d').strftime('%d-%m-%Y')}, strong
+    except ValueError:
+        return {'fecha_emision': date_str}, strong
+
+def _extract_moneda(text: str) -> tuple[dict, bool]:
+    son_line_match = SON_CURRENCY_RE.search(text)
+    if son_line_match:
+        currency_name = son_line_match.group(1).upper()
+        if "SOL" in currency_name or "PEN" in currency_name:
+            return {'moneda': "PEN"}, True
+        if "DOLAR" in currency_name or "USD" in currency_name:
+            return {'moneda': "USD"}, True
+        return {}, True
+    if PEN_RE.search(text):
+        return {'moneda': "PEN"}, False
+    if USD_RE.search(text):
+        return {'moneda': "USD"}, False
+    return {}, False
+
+def _extract_monto_total(text: str) -> tuple[dict, bool]:
+    total_match_numeric = TOTAL_NUMERIC_RE.search(text)
+    if total_match_numeric:
+        return {'monto_total': float(total_match_numeric.group(1).replace(',', ''))}, True
+    son_match = SON_AMOUNT_RE.search(text)
+    if son_match:
+        return {'monto_total': text_to_float(son_match.group(1).strip())}, False
+    return {}, False
+
+def _extract_monto_neto(text: str) -> tuple[dict, bool]:
+    net_amount_match = NET_AMOUNT_RE.search(text)
+    return ({'monto_neto': float(net_amount_match.group(2).replace(',', ''))} if net_amount_match else {}), True
+
+# Registry of (fields resolved, extractor), run in order over the normalized text.
+FIELD_EXTRACTORS = [
+    (('emisor_ruc', 'aceptante_ruc'), _extract_rucs),
+    (('invoice_id',), _extract_invoice_id),
+    (('fecha_emision',), _extract_fecha_emision),
+    (('moneda',), _extract_moneda),
+    (('monto_total',), _extract_monto_total),
+    (('monto_neto',), _extract_monto_neto),
+]
+
+def run_field_extractors(normalized_text: str, extracted_data: dict, strong_fields: set = None) -> bool:
+    """
+    Runs the registered extractors over normalized_text, filling extracted_data in place.
+    strong_fields tracks the fields resolved by a strong match; weak values are overwritten
+    by later runs. Extractors whose fields are all strongly resolved are skipped, and the loop
+    stops as soon as every required field is. Returns True when all required fields are strong.
+    """
+    if strong_fields is None:
+        strong_fields = set()
+    for fields, extractor in FIELD_EXTRACTORS:
+        if all(field in strong_fields for field in fields):
+            continue
+        start = time.perf_counter()
+        found, strong = extractor(normalized_text)
+        for field, value in found.items():
+            if field not in strong_fields:
+                extracted_data[field] = value
+                if strong:
+                    strong_fields.add(field)
+        _record_timing(extractor.__name__.lstrip('_'), time.perf_counter() - start)
+        if all(field in strong_fields for field in REQUIRED_FIELDS):
+            return True
+    return False
+
+class _MemoryviewReader(io.RawIOBase):
+    """
+    Read-only, seekable stream over a buffer (bytes, bytearray, memoryview) that slices the
+    memoryview instead of copying it, so pdfplumber can read the uploader buffer in place.
+    """
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+def open_pdf_source(pdf_source):
+    """
+    Normalizes the accepted PDF inputs into something pdfplumber.open understands:
+    a filesystem path, bytes / bytearray / memoryview (read in place, no disk I/O)
+    or a seekable file-like object such as Streamlit's UploadedFile.
+    """
+    if isinstance(pdf_source, (str, os.PathLike)):
+        return pdf_source
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return _MemoryviewReader(pdf_source)
+    if hasattr(pdf_source, "read"):
+        if hasattr(pdf_source, "seek"):
+            pdf_source.seek(0)
+        return pdf_source
+    raise TypeError(f"Unsupported PDF source type: {type(pdf_source).__name__}")
+
+def _to_picklable(pdf_source):
+    """Buffers and file objects cannot cross process boundaries; paths and bytes can."""
+    if isinstance(pdf_source, (str, os.PathLike, bytes)):
+        return pdf_source
+    if isinstance(pdf_source, (bytearray, memoryview)):
+        return bytes(pdf_source)
+    if hasattr(pdf_source, "getvalue"):
+        return pdf_source.getvalue()
+    if hasattr(pdf_source, "seek"):
+        pdf_source.seek(0)
+    return pdf_source.read()
+
+def merge_page_fields(page_text: str, extracted_data: dict, strong_fields: set) -> bool:
+    """
+    Runs the extractors over the normalized text of a single page and merges the result into
+    extracted_data: missing fields are filled and weak values are only replaced by strong ones,
+    so earlier pages win as they do in the full text. RUCs continue across pages: when only the
+    emisor was found so far, the first RUC of this page is the aceptante.
+    Returns True once every required field has a value, strong or not.
+    """
+    for fields, extractor in FIELD_EXTRACTORS:
+        if all(field in strong_fields for field in fields):
+            continue
+        start = time.perf_counter()
+        found, strong = extractor(page_text)
+        if extractor is _extract_rucs and 'emisor_ruc' in extracted_data and 'emisor_ruc' in found:
+            found = {'aceptante_ruc': found['emisor_ruc']}
+        for field, value in found.items():
+            if field not in extracted_data or (strong and field not in strong_fields):
+                extracted_data[field] = value
+                if strong:
+                    strong_fields.add(field)
+        _record_timing(extractor.__name__.lstrip('_'), time.perf_counter() - start)
+    return all(field in extracted_data for field in REQUIRED_FIELDS)
+
+def _extract_lazily(pdf, extracted_data: dict, max_pages: int = None) -> None:
+    """
+    Reads pages one at a time and merges the fields found on each one, stopping as soon as every
+    required field has a value. Each page is parsed once and pages after that are never read.
+    """
+    strong_fields = set()
+    for page in pdf.pages[:max_pages]:
+        start = time.perf_counter()
+        page_text = WHITESPACE_RE.sub(' ', page.extract_text() or "").strip()
+        page.flush_cache()
+        _record_timing("text_extraction", time.perf_counter() - start)
+        if merge_page_fields(page_text, extracted_data, strong_fields):
+            return
+
+def extract_fields_from_pdf(pdf_source, lazy: bool = False, max_pages: int = None) -> dict:
     """
     Extracts key fields from a PDF invoice based on updated user requirements.
+    pdf_source can be a filesystem path, bytes / bytearray / memoryview or a file-like object.
+    With lazy=True pages are read on demand and parsing stops once all required fields are
+    found (they are almost always on page 1); max_pages caps how many pages are read.
     Detraction logic has been removed.
     """
     extracted_data = {}
-    full_text = ""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                full_text += page.extract_text() + "\n"
-            
-        normalized_text = re.sub(r'\s+', ' ', full_text).strip()
-
-        # --- RUC Data ---
-        all_rucs = re.findall(r'\b(20\d{9}|10\d{9})\b', normalized_text)
-        if all_rucs:
-            extracted_data['emisor_ruc'] = all_rucs[0]
-            if len(all_rucs) > 1:
-                extracted_data['aceptante_ruc'] = all_rucs[1]
-
-        # --- Invoice ID ---
-        invoice_match = re.search(r'\b([EF][A-Z0-9]{3}-\d{1,8})\b', normalized_text)
-        if invoice_match:
-            extracted_data['invoice_id'] = invoice_match.group(1)
-
-        # --- Emission Date ---
-        # Regex to find dates in DD/MM/YYYY, DD-MM-YYYY, or YYYY-MM-DD formats.
-        # It prioritizes dates following "Fecha de Emisión".
-        date_match = re.search(r'Fecha de Emisi[oó]n\s*:?\s*(\d{2}[-/]\d{2}[-/]\d{4}|\d{4}[-/]\d{2}[-/]\d{2})', normalized_text, re.IGNORECASE)
-        if not date_match:
-            # If not found, search for any date in the document with the specified formats.
-            date_match = re.search(r'\b(\d{2}[-/]\d{2}[-/]\d{4}|\d{4}[-/]\d{2}[-/]\d{2})\b', normalized_text)
-
-        if date_match:
-            date_str = date_match.group(1).replace('/', '-')
-            try:
-                # Attempt to parse as YYYY-MM-DD first
-                dt_object = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-                # If successful, format to DD-MM-YYYY
-                extracted_data['fecha_emision'] = dt_object.strftime('%d-%m-%Y')
-            except ValueError:
-                # If it fails, it's likely already in DD-MM-YYYY, so just store it.
-                extracted_data['fecha_emision'] = date_str
-
-        # --- Currency ---
-        son_line_match = re.search(r'SON:.*?((?:SOLES|PEN)|(?:DOLAR|DOLARES|USD|US\$))', normalized_text, re.IGNORECASE)
-        if son_line_match:
-            currency_name = son_line_match.group(1).upper()
-            if "SOL" in currency_name or "PEN" in currency_name:
-                extracted_data['moneda'] = "PEN"
-            elif "DOLAR" in currency_name or "USD" in currency_name:
-                extracted_data['moneda'] = "USD"
-        else:
-            if re.search(r'(S/|SOLES|PEN)', normalized_text, re.IGNORECASE):
-                 extracted_data['moneda'] = "PEN"
-            elif re.search(r'(\$|USD|DOLARES|DOLAR AMERICANO)', normalized_text, re.IGNORECASE):
-                 extracted_data['moneda'] = "USD"
-
-        # --- Total Amount ---
-        total_match_numeric = re.search(r'Importe Total\s*:\s*(?:S/|\$)?\s*([\d,]+\.\d{2})', normalized_text, re.IGNORECASE)
-        if total_match_numeric:
-            total_amount_str = total_match_numeric.group(1).replace(',', '')
-            extracted_data['monto_total'] = float(total_amount_str)
-        else:
-            son_match = re.search(r'SON:\s*(.*?)(?:SOLES|D[OÓ]LAR|USD|PEN)', normalized_text, re.IGNORECASE)
-            if son_match:
-                text_amount = son_match.group(1).strip()
-                extracted_data['monto_total'] = text_to_float(text_amount)
+        with pdfplumber.open(open_pdf_source(pdf_source)) as pdf:
+            if lazy:
+                _extract_lazily(pdf, extracted_data, max_pages)
+            else:
+                start = time.perf_counter()
+                full_text = "\n".join(page.extract_text() or "" for page in pdf.pages[:max_pages])
+                _record_timing("text_extraction", time.perf_counter() - start)
 
-        # --- Net Amount ---
-        net_amount_match = re.search(r'(Monto neto pendiente de pago|SUBTOTAL VENTA)\s*:\s*(?:S/|\$)?\s*([\d,]+\.\d{2})', normalized_text, re.IGNORECASE)
-        if net_amount_match:
-            net_amount_str = net_amount_match.group(2).replace(',', '')
-            extracted_data['monto_neto'] = float(net_amount_str)
+                # Single normalization pass shared by every extractor
+                normalized_text = WHITESPACE_RE.sub(' ', full_text).strip()
+                run_field_extractors(normalized_text, extracted_data)
 
         # --- Final Logic for Amounts (Simplified) ---
         # If monto_neto is not found, it defaults to monto_total.
@@ -142,9 +341,105 @@ def extract_fields_from_pdf(pdf_path: str) -> dict:
         extracted_data["error"] = str(e)
     
     # Ensure all required fields are present, defaulting to None
-    required_fields = ['emisor_ruc', 'aceptante_ruc', 'invoice_id', 'fecha_emision', 'moneda', 'monto_total', 'monto_neto']
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if field not in extracted_data:
             extracted_data[field] = None
             
-    return extracted_data
\ No newline at end of file
+    return extracted_data
+
+# --- Content-hash result cache ---
+_result_cache = None
+
+def get_result_cache() -> CacheSQLite:
+    """Opens the on-disk result cache on first use (dropping entries from older parser versions)."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = CacheSQLite(RESULT_CACHE_PATH, version=PARSER_VERSION, max_entradas=RESULT_CACHE_MAX_ENTRIES)
+    return _result_cache
+
+def invalidate_result_cache() -> None:
+    """Drops every cached result, e.g. after fixing a parsing bug without bumping PARSER_VERSION."""
+    get_result_cache().limpiar()
+
+def content_hash(pdf_source) -> str:
+    """SHA-256 of the PDF bytes. Buffers are hashed in place; paths are read in chunks."""
+    digest = hashlib.sha256()
+    if isinstance(pdf_source, (str, os.PathLike)):
+        with open(pdf_source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    elif isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        digest.update(pdf_source)
+    elif hasattr(pdf_source, "getbuffer"):
+        digest.update(pdf_source.getbuffer())
+    else:
+        pdf_source.seek(0)
+        digest.update(pdf_source.read())
+    return digest.hexdigest()
+
+def _cache_key(pdf_source, lazy: bool = False, max_pages: int = None) -> str:
+    # A lazy parse stops at the first page that completes the fields and a page limit skips the
+    # rest, so either can give different fields than a full parse of the same file
+    return f"{content_hash(pdf_source)}:{'lazy' if lazy else 'full'}:{max_pages or 'all'}"
+
+def _parse_pdf_job(key, pdf_source, lazy: bool = False, max_pages: int = None) -> tuple:
+    """Worker entry point for the process pool. Must stay at module level so it can be pickled."""
+    return key, extract_fields_from_pdf(pdf_source, lazy=lazy, max_pages=max_pages)
+
+def extract_fields_from_pdfs(pdf_sources, max_workers: int = None, lazy: bool = False, max_pages: int = None,
+                            use_cache: bool = False):
+    """
+    Parses many PDFs concurrently in a process pool and yields (key, extracted_data)
+    as each file finishes, so callers can report progress per file.
+    pdf_sources is a dict or an iterable of (key, pdf_source) pairs, with any source accepted by
+    extract_fields_from_pdf; the key is returned untouched.
+    A single file (or max_workers=1) is parsed in-process, reading buffers in place; otherwise
+    buffers are copied once to bytes to be sent to the workers.
+    lazy and max_pages are passed through to extract_fields_from_pdf.
+    With use_cache=True, files already parsed (same SHA-256 and PARSER_VERSION) are yielded first
+    from the on-disk cache, and successful new parses are stored in it.
+    """
+    if isinstance(pdf_sources, dict):
+        pdf_sources = pdf_sources.items()
+    pdf_sources = list(pdf_sources)
+
+    if use_cache:
+        cache = get_result_cache()
+        cache_keys = {}
+        pending_sources = []
+        for key, pdf_source in pdf_sources:
+            cache_key = _cache_key(pdf_source, lazy, max_pages)
+            cached_data = cache.obtener(cache_key)
+            if cached_data is not None:
+                yield key, cached_data
+            else:
+                cache_keys[key] = cache_key
+                pending_sources.append((key, pdf_source))
+
+        for key, extracted_data in extract_fields_from_pdfs(pending_sources, max_workers, lazy, max_pages):
+            if not extracted_data.get("error"):
+                cache.guardar(cache_keys[key], extracted_data)
+            yield key, extracted_data
+        return
+
+    if not pdf_sources:
+        return
+
+    if max_workers is None:
+        max_workers = min(len(pdf_sources), os.cpu_count() or 1)
+
+    if max_workers <= 1 or len(pdf_sources) == 1:
+        for key, pdf_source in pdf_sources:
+            yield _parse_pdf_job(key, pdf_source, lazy, max_pages)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_parse_pdf_job, key, _to_picklable(pdf_source), lazy, max_pages): key for key, pdf_source in pdf_sources}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # The worker itself died (e.g. broken pool); report it like a parse error
+                extracted_data = {field: None for field in REQUIRED_FIELDS}
+                extracted_data["error"] = str(e)
+                yield futures[future], extracted_data
\ No newline at end of file
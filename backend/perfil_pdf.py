@@ -1,37 +1,21 @@
 from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from reportlab.pdfgen import canvas
 import os
+import sys
 import datetime
 
+# Styles and logo shared by every PDF generator (built once per process)
+sys.path.append(os.path.dirname(__file__))
+from estilos_pdf import obtener_estilos, lector_logo
+
 def generate_perfil_pdf(output_filepath, invoice_data, print_date_str):
     doc = SimpleDocTemplate(output_filepath, pagesize=landscape(letter), leftMargin=0.5*inch, rightMargin=0.5*inch, topMargin=1.2*inch, bottomMargin=1*inch)
-    styles = getSampleStyleSheet()
+    styles = obtener_estilos()
     story = []
-    logo_path = "C:/Users/rguti/Inandes.TECH/inputs_para_generated_pdfs/LOGO.png"
-
-    # Custom styles
-    styles.add(ParagraphStyle(name='RightAlign', alignment=TA_RIGHT))
-    styles.add(ParagraphStyle(name='CenterAlign', alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='LeftAlign', alignment=TA_LEFT))
-    styles.add(ParagraphStyle(name='SmallFont', fontSize=7))
-    styles.add(ParagraphStyle(name='BoldSmallFont', fontSize=6, fontName='Helvetica-Bold'))
-    styles.add(ParagraphStyle(name='BoldNormal', fontName='Helvetica-Bold'))
-    styles.add(ParagraphStyle(name='BoldNormalRight', parent=styles['BoldNormal'], alignment=TA_RIGHT))
-    styles.add(ParagraphStyle(name='BoldSmallFontRight', parent=styles['BoldSmallFont'], alignment=TA_RIGHT))
-    styles.add(ParagraphStyle(name='BoldSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='BoldExtraSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER, fontSize=6, textColor=colors.blue))
-    styles.add(ParagraphStyle(name='BoldNormalCenter', parent=styles['BoldNormal'], alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='SmallFontCenter', parent=styles['SmallFont'], alignment=TA_CENTER))
-    styles.add(ParagraphStyle(name='BlueSmallFont', fontSize=7, fontName='Helvetica', textColor=colors.blue))
-    styles.add(ParagraphStyle(name='TinyFont', fontSize=5))
-    styles.add(ParagraphStyle(name='SmallTinyFont', fontSize=5, leading=5))
-    styles.add(ParagraphStyle(name='BoldExtraExtraSmallFontCenter', parent=styles['BoldSmallFont'], alignment=TA_CENTER, fontSize=5, textColor=colors.blue))
+    logo = lector_logo()
 
     # Header and Footer callback function
     def header_and_footer(canvas, doc):
@@ -39,12 +23,12 @@ def generate_perfil_pdf(output_filepath, invoice_data, print_date_str):
         canvas.saveState()
         
         # Header
-        if os.path.exists(logo_path):
+        if logo is not None:
             # Draw image on the top right. landscape(letter) is 11 x 8.5 inches.
             # Page width is doc.width + doc.leftMargin + doc.rightMargin
             page_width = doc.width + doc.leftMargin + doc.rightMargin
             # Draw on the right side of the page
-            canvas.drawImage(logo_path, page_width - doc.rightMargin - 1*inch, doc.height + 0.5*inch, 
+            canvas.drawImage(logo, page_width - doc.rightMargin - 1*inch, doc.height + 0.5*inch, 
                            width=1*inch, height=1*inch, preserveAspectRatio=True, mask='auto')
 
         # Footer
@@ -0,0 +1,174 @@
+import atexit
+import contextlib
+import functools
+import os
+import queue
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+# --- Pool de Navegadores Headless ---
+# Abrir Chrome cuesta varios segundos y resolver el chromedriver con ChromeDriverManager otro tanto.
+# El pool mantiene hasta 'tamano' navegadores abiertos que se prestan para una consulta a la vez y
+# se devuelven al terminar; cada uno se cierra y se reemplaza tras 'usos_maximos' préstamos (o si
+# la consulta falló), para no arrastrar memoria ni estado de sesiones largas.
+
+TAMANO_POOL = int(os.environ.get("RUC_POOL_NAVEGADORES", "3"))
+USOS_MAXIMOS = int(os.environ.get("RUC_USOS_POR_NAVEGADOR", "50"))
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+
+@functools.lru_cache(maxsize=None)
+def resolver_ruta_chromedriver() -> str:
+    """Ruta del ejecutable de chromedriver, resuelta una sola vez por proceso."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    ruta = ChromeDriverManager().install()
+    # En algunas versiones install() devuelve otro archivo de la carpeta del driver (p. ej. THIRD_PARTY_NOTICES)
+    if not os.path.basename(ruta).startswith("chromedriver"):
+        ruta = os.path.join(os.path.dirname(ruta), "chromedriver.exe" if os.name == "nt" else "chromedriver")
+    return ruta
+
+def opciones_chrome() -> Options:
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--ignore-certificate-errors')
+    options.add_argument('--allow-running-insecure-content')
+    options.add_argument(f'--user-agent="{USER_AGENT}"')
+    return options
+
+def crear_navegador():
+    return webdriver.Chrome(service=Service(resolver_ruta_chromedriver()), options=opciones_chrome())
+
+def _cerrar_navegador(driver) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"[ERROR al cerrar navegador]: {e}")
+
+class PoolNavegadores:
+    def __init__(self, tamano: int = TAMANO_POOL, usos_maximos: int = USOS_MAXIMOS, fabrica=crear_navegador):
+        """
+        tamano: navegadores abiertos como máximo (y consultas simultáneas).
+        usos_maximos: préstamos tras los cuales un navegador se cierra y se reemplaza.
+        fabrica: función que abre un navegador nuevo.
+        """
+        self.tamano = tamano
+        self.usos_maximos = usos_maximos
+        self._fabrica = fabrica
+        self._libres = queue.LifoQueue() # El más recién usado primero: sigue "caliente"
+        self._cupos = threading.BoundedSemaphore(tamano)
+        self._usos = {}
+        self._lock = threading.Lock()
+        self._cerrado = False
+        self.creados = 0
+        self.reciclados = 0
+        self.descartados = 0
+
+    def _crear(self):
+        driver = self._fabrica()
+        with self._lock:
+            self._usos[id(driver)] = 0
+            self.creados += 1
+        return driver
+
+    def precalentar(self, cantidad: int = None) -> int:
+        """Abre navegadores por adelantado (hasta 'tamano') para que las primeras consultas no esperen."""
+        cantidad = self.tamano if cantidad is None else min(cantidad, self.tamano)
+        abiertos = 0
+        while self._libres.qsize() < cantidad:
+            with self._lock:
+                if len(self._usos) >= self.tamano:
+                    break
+            self._libres.put(self._crear())
+            abiertos += 1
+        return abiertos
+
+    def _tomar(self, timeout: float = None):
+        if self._cerrado:
+            raise RuntimeError("El pool de navegadores está cerrado.")
+        if not self._cupos.acquire(timeout=timeout):
+            raise TimeoutError("No hay navegadores libres en el pool.")
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._crear()
+        except Exception:
+            self._cupos.release()
+            raise
+
+    def _devolver(self, driver, sano: bool) -> None:
+        with self._lock:
+            usos = self._usos.get(id(driver), 0) + 1
+            self._usos[id(driver)] = usos
+            reciclar = not sano or usos >= self.usos_maximos or self._cerrado
+            if reciclar:
+                self._usos.pop(id(driver), None)
+                if sano:
+                    self.reciclados += 1
+                else:
+                    self.descartados += 1
+        if reciclar:
+            _cerrar_navegador(driver)
+        else:
+            self._libres.put(driver)
+        self._cupos.release()
+
+    @contextlib.contextmanager
+    def prestar(self, timeout: float = None):
+        """
+        Presta un navegador del pool mientras dura el bloque 'with'. Si el bloque lanza una
+        excepción, el navegador se descarta en lugar de volver al pool.
+        """
+        driver = self._tomar(timeout)
+        sano = False
+        try:
+            yield driver
+            sano = True
+        finally:
+            self._devolver(driver, sano)
+
+    def cerrar(self) -> None:
+        """Cierra los navegadores libres; los prestados se cierran al devolverse."""
+        self._cerrado = True
+        while True:
+            try:
+                driver = self._libres.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._usos.pop(id(driver), None)
+            _cerrar_navegador(driver)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            abiertos = len(self._usos)
+        libres = self._libres.qsize()
+        return {
+            "tamano": self.tamano,
+            "usos_maximos": self.usos_maximos,
+            "abiertos": abiertos,
+            "libres": libres,
+            "prestados": abiertos - libres,
+            "creados": self.creados,
+            "reciclados": self.reciclados,
+            "descartados": self.descartados
+        }
+
+_pool = None
+_lock_pool = threading.Lock()
+
+def obtener_pool_navegadores() -> PoolNavegadores:
+    """Pool compartido del proceso, creado en el primer uso y cerrado al salir."""
+    global _pool
+    if _pool is None:
+        with _lock_pool:
+            if _pool is None:
+                _pool = PoolNavegadores()
+                atexit.register(_pool.cerrar)
+    return _pool
@@ -1,94 +1,122 @@
+import asyncio
 import os
 import re
-import time
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import sys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-def lookup_ruc_info(ruc: str) -> dict:
+# Add the 'backend' directory to the path to import the RUC cache and the browser pool
+sys.path.append(os.path.dirname(__file__))
+from cache_ruc import consultar_con_cache, ENCONTRADO, NO_ENCONTRADO, ERROR
+from datosperu_parser import parse_search_page, parse_detail_page
+from cliente_http import descargar_pagina, esperar_turno_datosperu, RequiereNavegador, CONEXIONES_POR_HOST
+from pool_navegadores import obtener_pool_navegadores
+
+# Override to point the scrapers at a local stand-in serving saved datosperu pages
+DATOSPERU_BASE_URL = os.environ.get("DATOSPERU_BASE_URL", "https://www.datosperu.org").rstrip("/")
+
+SLUG_CLEAN_RE = re.compile(r'[^a-zA-Z0-9 ]')
+
+def classify_ruc_info(info: dict) -> str:
+    if info.get("name") == "Error":
+        return ERROR
+    return NO_ENCONTRADO if info.get("name") == "N/A" else ENCONTRADO
+
+# "http" downloads the pages with the shared HTTP session, "browser" always uses Selenium and
+# "auto" uses HTTP and falls back to the browser only when the page needs JavaScript
+FETCH_MODE = os.environ.get("DATOSPERU_FETCH_MODE", "auto")
+
+def lookup_ruc_info(ruc: str, use_cache: bool = True, mode: str = None) -> dict:
+    """
+    Looks up RUC information (name, address and status) from datosperu.org.
+    Results are served from the persistent RUC cache when available; the site is only queried on a miss.
+    With mode="http", RequiereNavegador is raised (and nothing is cached) when the site only serves
+    the page to a browser, instead of being reported as an "Error" result.
+    """
+    if not use_cache:
+        return _lookup_ruc_info_remote(ruc, mode)
+    return consultar_con_cache('datosperu_ficha', ruc, lambda r: _lookup_ruc_info_remote(r, mode), classify_ruc_info)
+
+async def lookup_ruc_info_async(ruc: str, use_cache: bool = True, mode: str = None) -> dict:
+    """Same as lookup_ruc_info, run in a worker thread so it can be awaited."""
+    return await asyncio.to_thread(lookup_ruc_info, ruc, use_cache, mode)
+
+async def lookup_ruc_infos_async(rucs, max_concurrency: int = CONEXIONES_POR_HOST, use_cache: bool = True, mode: str = None) -> dict:
     """
-    Looks up RUC information (name and address) from datosperu.org using Selenium.
+    Looks up several RUCs concurrently (at most max_concurrency at a time; the requests are
+    paced by the shared limiter in cliente_http). Returns {ruc: info}.
     """
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--ignore-certificate-errors')
-    options.add_argument('--allow-running-insecure-content')
-    options.add_argument('--user-agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"')
-
-    driver = None
-    name = "N/A"
-    address = "N/A"
+    semaphore = asyncio.Semaphore(max_concurrency)
+    unique_rucs = list(dict.fromkeys(rucs))
 
+    async def lookup(ruc):
+        async with semaphore:
+            return await lookup_ruc_info_async(ruc, use_cache, mode)
+
+    results = await asyncio.gather(*(lookup(ruc) for ruc in unique_rucs))
+    return dict(zip(unique_rucs, results))
+
+def _lookup_ruc_info_remote(ruc: str, mode: str = None) -> dict:
+    mode = mode or FETCH_MODE
     try:
-        driver_path_raw = ChromeDriverManager().install()
-        chromedriver_executable_path = os.path.join(os.path.dirname(driver_path_raw), "chromedriver.exe")
-        print(f"[DEBUG] Constructed ChromeDriver executable path: {chromedriver_executable_path}")
-        service = Service(chromedriver_executable_path)
-        driver = webdriver.Chrome(service=service, options=options)
-
-        # Start with the search page to get the company name
-        search_url = f"https://www.datosperu.org/buscador_empresas.php?buscar={ruc}"
-        driver.get(search_url)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        soup_search = BeautifulSoup(driver.page_source, 'html.parser')
-
-        # Extract name from the search results page directly using regex on the entire text
-        full_text_search = soup_search.get_text()
-        name_match_search = re.search(f"(.*?)\\s*\\(RUC: {ruc}\\)", full_text_search, re.DOTALL)
-        if name_match_search:
-            name_from_search = name_match_search.group(1).strip()
-            # Clean the name for URL slug (remove special chars, replace spaces with hyphens)
-            name_slug = re.sub(r'[^a-zA-Z0-9 ]', '', name_from_search).replace(' ', '-').lower()
-            
-            # Construct the detailed page URL
-            detailed_page_url = f"https://www.datosperu.org/empresa-{name_slug}-{ruc}.php"
-            print(f"[DEBUG] Constructed detailed page URL: {detailed_page_url}")
-            driver.get(detailed_page_url)
+        if mode != "browser":
+            try:
+                return _lookup_ruc_info_with(descargar_pagina, ruc)
+            except RequiereNavegador as e:
+                if mode == "http":
+                    raise
+                print(f"[DEBUG] {e}; falling back to the browser for {ruc}")
+        return _lookup_ruc_info_selenium(ruc)
+    except RequiereNavegador:
+        # Only raised with mode="http": the caller asked not to use the browser and must know why it failed
+        raise
+    except Exception as e:
+        print(f"Error fetching RUC info for {ruc}: {e}")
+        return {"name": "Error", "address": "Error", "status": "Error"}
+
+def _lookup_ruc_info_selenium(ruc: str) -> dict:
+    """
+    Looks up RUC information from datosperu.org using a pooled Selenium browser.
+    """
+    with obtener_pool_navegadores().prestar() as driver:
+        def fetch_page(url: str) -> str:
+            esperar_turno_datosperu()
+            driver.get(url)
             WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
-            soup_detailed = BeautifulSoup(driver.page_source, 'html.parser')
+            return driver.page_source
 
-            # Extract name and address from the detailed page using regex on the text content
-            detailed_text = soup_detailed.get_text()
-            print(f"[DEBUG] Detailed Page Text for {ruc}:\n{detailed_text[:500]}...") # Print first 500 chars
+        return _lookup_ruc_info_with(fetch_page, ruc)
 
-            name_match = re.search(r'NOMBRE\\s*(.*?)(?:RUC|INICIO)', detailed_text, re.DOTALL)
-            print(f"[DEBUG] Name Match for {ruc}: {name_match}")
-            if name_match:
-                name = name_match.group(1).strip()
-            
-            address_match = re.search(r'DIRECCIÓN\\s*(.*?)(?:DEPARTAMENTO|PAÍS|TELÉFONO)', detailed_text, re.DOTALL)
-            print(f"[DEBUG] Address Match for {ruc}: {address_match}")
-            if address_match:
-                address = address_match.group(1).strip()
+def _lookup_ruc_info_with(fetch_page, ruc: str) -> dict:
+    """
+    Scrapes name, address and status for a RUC; fetch_page(url) returns the HTML of a page,
+    so the same parsing runs for both the HTTP and the browser backends.
+    """
+    # Start with the search page to get the company name
+    search_url = f"{DATOSPERU_BASE_URL}/buscador_empresas.php?buscar={ruc}"
+    name_from_search = parse_search_page(fetch_page(search_url), ruc)
+    if not name_from_search:
+        return {"name": "N/A", "address": "N/A", "status": "N/A"}
 
-        return {"name": name, "address": address}
+    # Clean the name for URL slug (remove special chars, replace spaces with hyphens)
+    name_slug = SLUG_CLEAN_RE.sub('', name_from_search).replace(' ', '-').lower()
+    detailed_page_url = f"{DATOSPERU_BASE_URL}/empresa-{name_slug}-{ruc}.php"
+    details = parse_detail_page(fetch_page(detailed_page_url))
 
-    except Exception as e:
-        print(f"Error fetching RUC info for {ruc} with Selenium: {e}")
-        return {"name": "Error", "address": "Error"}
-    finally:
-        if driver:
-            time.sleep(1) # Give some time for the browser to close properly
-            driver.quit()
+    return {
+        "name": details["name"] or name_from_search,
+        "address": details["address"] or "N/A",
+        "status": details["status"] or "N/A"
+    }
 
 if __name__ == '__main__':
     ruc_example = "20563361761"  # ZEN HOLDINGS SAC
     info = lookup_ruc_info(ruc_example)
-    print(f"RUC: {ruc_example}, Name: {info['name']}, Address: {info['address']}")
+    print(f"RUC: {ruc_example}, Name: {info['name']}, Address: {info['address']}, Status: {info['status']}")
 
     ruc_example_2 = "20600079070" # Example RUC that might not have a direct page
     info_2 = lookup_ruc_info(ruc_example_2)
-    print(f"RUC: {ruc_example_2}, Name: {info_2['name']}, Address: {info_2['address']}")
\ No newline at end of file
+    print(f"RUC: {ruc_example_2}, Name: {info_2['name']}, Address: {info_2['address']}, Status: {info_2['status']}")
\ No newline at end of file
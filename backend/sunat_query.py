@@ -1,58 +1,89 @@
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+import os
+import sys
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-def get_company_data_from_datosperu(ruc):
+# Add the 'backend' directory to the path to import the RUC cache and the browser pool
+sys.path.append(os.path.dirname(__file__))
+from cache_ruc import consultar_con_cache, ENCONTRADO, NO_ENCONTRADO, ERROR
+from cliente_http import descargar_pagina, esperar_turno_datosperu, RequiereNavegador
+from datosperu_parser import has_no_results_marker, parse_company_table
+from pool_navegadores import obtener_pool_navegadores
+from ruc_lookup import DATOSPERU_BASE_URL, FETCH_MODE
+
+NOT_FOUND_MESSAGE = "No se encontraron datos para el RUC proporcionado."
+
+def classify_company_data(data: dict) -> str:
+    if "error" not in data:
+        return ENCONTRADO
+    return NO_ENCONTRADO if data["error"] == NOT_FOUND_MESSAGE else ERROR
+
+def get_company_data_from_datosperu(ruc, use_cache=True, mode=None):
     """
-    This function scrapes company data from datosperu.org using a RUC number
-    with Selenium to handle potential anti-scraping measures.
+    This function scrapes company data from datosperu.org using a RUC number.
+    The page is downloaded over HTTP and a (pooled) Selenium browser is only used when it needs
+    JavaScript (see ruc_lookup.FETCH_MODE). Results are served from the persistent RUC cache when available.
+    With mode="http", RequiereNavegador is raised instead of falling back to the browser.
     """
     if not ruc or not ruc.isdigit() or len(ruc) != 11:
         return {"error": "RUC inválido. Debe contener 11 dígitos."}
 
-    search_url = f"https://www.datosperu.org/buscador_empresas.php?buscar={ruc}"
-    
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
+    if not use_cache:
+        return _scrape_company_data(ruc, mode)
+    return consultar_con_cache('datosperu_buscador', ruc, lambda r: _scrape_company_data(r, mode), classify_company_data)
 
-    driver = None
-    try:
-        service = ChromeService(executable_path=ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        
+def _fetch_company_page_selenium(search_url):
+    with obtener_pool_navegadores().prestar() as driver:
+        esperar_turno_datosperu()
         driver.get(search_url)
-        
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "empresa"))
-        )
-        
-        data = {}
-        table = driver.find_element(By.CLASS_NAME, 'empresa')
-        rows = table.find_elements(By.TAG_NAME, 'tr')
-        for row in rows:
-            cols = row.find_elements(By.TAG_NAME, 'td')
-            if len(cols) == 2:
-                key = cols[0].text.strip().replace(':', '')
-                value = cols[1].text.strip()
-                data[key] = value
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "empresa"))
+            )
+        except TimeoutException:
+            # The page loaded without a company table: the browser is fine and goes back to the pool
+            return None
+        return driver.page_source
+
+def _scrape_company_data(ruc, mode=None):
+    mode = mode or FETCH_MODE
+    search_url = f"{DATOSPERU_BASE_URL}/buscador_empresas.php?buscar={ruc}"
+
+    try:
+        data = None
+        if mode != "browser":
+            try:
+                html = descargar_pagina(search_url)
+                data = parse_company_table(html)
+                if data is None:
+                    if has_no_results_marker(html):
+                        # The server answered that the RUC is not listed: the browser would see the same
+                        return {"error": NOT_FOUND_MESSAGE}
+                    # The table may be rendered with JavaScript: only the browser can wait for it
+                    raise RequiereNavegador(f"No 'empresa' table in {search_url}")
+            except RequiereNavegador as e:
+                if mode == "http":
+                    raise
+                print(f"[DEBUG] {e}; falling back to the browser for {ruc}")
+        if data is None:
+            html = _fetch_company_page_selenium(search_url)
+            if html is None:
+                return {"error": f"Ocurrió un error: no se encontró la tabla de la empresa para {ruc}"}
+            data = parse_company_table(html)
 
         if data:
             return data
         else:
-            return {"error": "No se encontraron datos para el RUC proporcionado."}
+            return {"error": NOT_FOUND_MESSAGE}
 
+    except RequiereNavegador:
+        # Only raised with mode="http": the caller asked not to use the browser and must know why it failed
+        raise
     except Exception as e:
         return {"error": f"Ocurrió un error: {e}"}
-    finally:
-        if driver:
-            driver.quit()
 
 if __name__ == '__main__':
     # Example usage:
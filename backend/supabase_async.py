@@ -0,0 +1,29 @@
+import asyncio
+import functools
+import os
+import sys
+
+# Añadir el directorio 'backend' al path para importar supabase_handler
+sys.path.append(os.path.dirname(__file__))
+import supabase_handler
+
+# --- Acceso Asíncrono a Supabase ---
+# El cliente de Supabase es síncrono: llamarlo desde un endpoint 'async' bloquea el event loop
+# y encola a todas las demás solicitudes detrás de la consulta. Estas versiones ejecutan las
+# funciones de supabase_handler en el pool de hilos de asyncio y se usan con 'await'.
+
+def _en_hilo(funcion):
+    @functools.wraps(funcion)
+    async def envoltura(*args, **kwargs):
+        return await asyncio.to_thread(funcion, *args, **kwargs)
+    return envoltura
+
+get_razon_social_by_ruc = _en_hilo(supabase_handler.get_razon_social_by_ruc)
+get_razones_sociales_by_rucs = _en_hilo(supabase_handler.get_razones_sociales_by_rucs)
+save_proposal = _en_hilo(supabase_handler.save_proposal)
+save_proposals_batch = _en_hilo(supabase_handler.save_proposals_batch)
+get_proposal_details_by_id = _en_hilo(supabase_handler.get_proposal_details_by_id)
+get_proposal_details_by_ids = _en_hilo(supabase_handler.get_proposal_details_by_ids)
+get_proposal_for_liquidation = _en_hilo(supabase_handler.get_proposal_for_liquidation)
+get_active_proposals_by_emisor_nombre = _en_hilo(supabase_handler.get_active_proposals_by_emisor_nombre)
+get_active_proposal_details_by_emisor_nombre = _en_hilo(supabase_handler.get_active_proposal_details_by_emisor_nombre)
@@ -1,225 +1,157 @@
 import os
 import datetime
-from dotenv import load_dotenv
-from supabase import create_client, Client
 import sys
-import json
 
-# Añadir el directorio 'backend' al path para importar flatten_dict
+# Añadir el directorio 'backend' al path para importar el cliente compartido y el directorio de empresas
 sys.path.append(os.path.dirname(__file__))
-from variable_data_pdf_generator import flatten_dict
+from cliente_supabase import obtener_cliente_supabase
+from directorio_empresas import obtener_empresa, obtener_empresas, precargar_directorio, precargar_directorio_en_segundo_plano, estadisticas_directorio
+from esquema_propuestas import codificar_propuesta, decodificar_propuesta, proyeccion_json, valor_en_ruta
 
 # --- Conexión Segura a Supabase ---
-dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'supabase_client', '.env')
-load_dotenv(dotenv_path=dotenv_path)
-
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
-
-supabase: Client = None
-if SUPABASE_URL and SUPABASE_KEY:
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    except Exception as e:
-        print(f"Error al inicializar Supabase: {e}")
-
-# --- Mapeo de Claves Aplanadas a Columnas de Supabase ---
-# Este mapeo es crucial para traducir las claves generadas por flatten_dict
-# a los nombres de columnas de tu tabla 'propuestas' en Supabase.
-# Asegúrate de que estos nombres coincidan exactamente con tus columnas de Supabase.
-FLATTENED_TO_SUPABASE_MAPPING = {
-    # Campos directos del formulario
-    'emisor_nombre': 'emisor_nombre',
-    'emisor_ruc': 'emisor_ruc',
-    'aceptante_nombre': 'aceptante_nombre',
-    'aceptante_ruc': 'aceptante_ruc',
-    'numero_factura': 'numero_factura',
-    'monto_total_factura': 'monto_total_factura',
-    'monto_neto_factura': 'monto_neto_factura',
-    'moneda_factura': 'moneda_factura',
-    'fecha_emision_factura': 'fecha_emision_factura',
-    'plazo_credito_dias': 'plazo_credito_dias',
-    'fecha_desembolso_factoring': 'fecha_desembolso_factoring',
-    'tasa_de_avance': 'tasa_de_avance',
-    'interes_mensual': 'interes_mensual',
-    'comision_de_estructuracion': 'comision_de_estructuracion',
-    'comision_minima_pen': 'comision_minima_pen',
-    'comision_minima_usd': 'comision_minima_usd',
-    'comision_afiliacion_pen': 'comision_afiliacion_pen',
-    'comision_afiliacion_usd': 'comision_afiliacion_usd',
-    'aplicar_comision_afiliacion': 'aplicar_comision_afiliacion',
-    'detraccion_porcentaje': 'detraccion_porcentaje',
-    'anexo_number': 'anexo_number',
-    'contract_number': 'contract_number',
-
-    # Campos calculados (de initial_calc_result o recalculate_result)
-    'fecha_pago_calculada': 'fecha_pago_calculada',
-    'plazo_operacion_calculado': 'plazo_operacion_calculado',
-
-    # Resultados del Paso 1 (initial_calc_result)
-    'initial_calc_result.capital': 'capital_calculado',
-    'initial_calc_result.interes': 'interes_calculado',
-    'initial_calc_result.igv_interes': 'igv_interes_calculado',
-    'initial_calc_result.comision_estructuracion': 'comision_estructuracion_monto_calculado',
-    'initial_calc_result.igv_comision': 'igv_comision_estructuracion_calculado',
-    'initial_calc_result.comision_afiliacion': 'comision_afiliacion_monto_calculado',
-    'initial_calc_result.igv_afiliacion': 'igv_afiliacion_calculado',
-    'initial_calc_result.abono_real_teorico': 'abono_real_calculado', # Mapeo específico
-    'initial_calc_result.margen_seguridad': 'margen_seguridad_calculado',
-
-    # Resultados del Paso 2 (recalculate_result)
-    'recalculate_result.resultado_busqueda.tasa_avance_encontrada': 'tasa_avance_encontrada_calculada',
-    'recalculate_result.resultado_busqueda.abono_real_calculado': 'abono_real_calculado', # Mapeo específico
-
-    'recalculate_result.calculo_con_tasa_encontrada.capital': 'capital_calculado',
-    'recalculate_result.calculo_con_tasa_encontrada.interes': 'interes_calculado',
-    'recalculate_result.calculo_con_tasa_encontrada.igv_interes': 'igv_interes_calculado',
-    'recalculate_result.calculo_con_tasa_encontrada.comision_estructuracion': 'comision_estructuracion_monto_calculado',
-    'recalculate_result.calculo_con_tasa_encontrada.igv_comision_estructuracion': 'igv_comision_estructuracion_calculado',
-    'recalculate_result.calculo_con_tasa_encontrada.comision_afiliacion': 'comision_afiliacion_monto_calculado',
-    'recalculate_result.calculo_con_tasa_encontrada.igv_afiliacion': 'igv_afiliacion_calculado',
-    'recalculate_result.calculo_con_tasa_encontrada.margen_seguridad': 'margen_seguridad_calculado',
-    'recalculate_result': 'recalculate_result_json',
-    # 'recalculate_result.calculo_con_tasa_encontrada.abono_real': 'abono_real_calculado', # Si existe este campo en tu API
-}
-
-# --- Funciones de Ayuda ---
-
-def _format_date(date_str: str) -> str | None:
-    """Convierte una fecha de DD-MM-YYYY a YYYY-MM-DD."""
-    if not date_str or not isinstance(date_str, str):
-        return None
-    try:
-        return datetime.datetime.strptime(date_str, '%d-%m-%Y').strftime('%Y-%m-%d')
-    except (ValueError, TypeError):
-        return None
-
-def _convert_to_numeric(value):
-    """Intenta convertir un valor a float, si es posible."""
-    if value is None:
-        return None
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
+# El cliente se crea en el primer uso (ver cliente_supabase) y se comparte con el resto del backend.
+# Las columnas de 'propuestas', sus tipos y conversiones están declarados en esquema_propuestas.
 
 # --- Funciones Públicas ---
 
 def get_razon_social_by_ruc(ruc: str) -> str:
-    """Busca la razón social de una empresa por su RUC."""
-    if not supabase or not ruc:
+    """Busca la razón social de una empresa por su RUC (a través de la caché del directorio)."""
+    if not ruc:
         return ""
-    try:
-        response = supabase.table('EMISORES.DEUDORES').select('"Razon Social"').eq('RUC', ruc).single().execute()
-        if response.data:
-            return response.data.get('Razon Social', '')
-    except Exception as e:
-        print(f"[ERROR en get_razon_social_by_ruc]: {e}")
-    return ""
+    empresa = obtener_empresa(ruc, obtener_cliente_supabase)
+    return (empresa or {}).get('Razon Social') or ''
 
-def save_proposal(session_data: dict) -> tuple[bool, str]:
+def get_razones_sociales_by_rucs(rucs) -> dict[str, str]:
     """
-    Guarda una propuesta completa en la tabla 'propuestas' de Supabase,
-    serializando los resultados completos de cálculo como JSON.
+    Busca la razón social de varias empresas: las que no están en la caché del directorio
+    se consultan juntas con 'in'. Devuelve {ruc: razon_social}; los RUCs no encontrados quedan con "".
+    """
+    empresas = obtener_empresas(rucs, obtener_cliente_supabase)
+    return {ruc: (empresa or {}).get('Razon Social') or '' for ruc, empresa in empresas.items()}
+
+def precargar_directorio_empresas() -> int:
+    """Carga EMISORES.DEUDORES completa en la caché del directorio. Devuelve el número de empresas."""
+    return precargar_directorio(obtener_cliente_supabase())
+
+def precargar_directorio_empresas_en_segundo_plano():
+    """Inicia la precarga del directorio en un hilo aparte (una vez por proceso) sin bloquear al llamador."""
+    return precargar_directorio_en_segundo_plano(obtener_cliente_supabase)
+
+def get_estadisticas_directorio() -> dict:
+    """Aciertos, fallos y antigüedad de los datos de la caché del directorio de empresas."""
+    return estadisticas_directorio()
+
+# Filas por solicitud de inserción en bloque, e IDs por consulta 'in' (largo de URL de PostgREST)
+PROPOSALS_INSERT_CHUNK_SIZE = 500
+PROPOSALS_IN_CHUNK_SIZE = 200
+
+def _proposal_to_row(session_data: dict, fecha_propuesta: str) -> dict:
+    """Convierte los datos de sesión de una factura en la fila a insertar en 'propuestas'."""
+    data_to_insert = codificar_propuesta(session_data)
+
+    # Generar proposal_id y estado (campos especiales)
+    emisor_nombre_id = (data_to_insert.get('emisor_nombre') or 'SIN_NOMBRE').replace(' ', '_').replace('.', '').replace(',', '')
+    numero_factura = data_to_insert.get('numero_factura') or 'SIN_FACTURA'
+    data_to_insert['proposal_id'] = f"{emisor_nombre_id}-{numero_factura}-{fecha_propuesta}"
+    data_to_insert['estado'] = 'ACTIVO'
+    return data_to_insert
+
+def _insert_proposal_rows(rows: list[dict]) -> None:
+    response = obtener_cliente_supabase().table('propuestas').insert(rows).execute()
+    if hasattr(response, 'error') and response.error:
+        raise Exception(response.error.message)
+
+def save_proposals_batch(lote_session_data: list[dict], chunk_size: int = PROPOSALS_INSERT_CHUNK_SIZE) -> list[dict]:
     """
+    Guarda un lote de propuestas en la tabla 'propuestas' con una inserción en bloque por cada
+    chunk_size filas. Si un bloque falla, sus filas se reintentan una a una para aislar el error.
+    Devuelve, en el orden recibido, {'proposal_id', 'success', 'error'} por propuesta.
+    """
+    supabase = obtener_cliente_supabase()
     if not supabase:
-        return False, "Error crítico: La conexión con Supabase no pudo ser establecida."
-
-    try:
-        # Extraer y serializar los resultados completos de cálculo como JSON
-        recalculate_result_full = session_data.get('recalculate_result')
-
-        # Crear una copia de session_data para aplanar, excluyendo los objetos JSON completos
-        session_data_for_flattening = {k: v for k, v in session_data.items() if k not in ['recalculate_result']}
-        flattened_session_data = flatten_dict(session_data_for_flattening)
-
-        # Construir el diccionario para insertar en Supabase
-        data_to_insert = {}
-
-        # Añadir los resultados JSON completos como strings
-        data_to_insert['recalculate_result_json'] = json.dumps(recalculate_result_full) if recalculate_result_full else None
-
-        # Mapear campos directos y calculados (desde los datos aplanados)
-        for flattened_key, supabase_column_name in FLATTENED_TO_SUPABASE_MAPPING.items():
-            # Saltar las claves JSON completas ya que se manejan arriba
-            if flattened_key in ['recalculate_result']:
-                continue
-
-            value = flattened_session_data.get(flattened_key)
-            
-            # Convertir tipos de datos según sea necesario
-            if 'fecha' in supabase_column_name: # Asumiendo que las columnas de fecha contienen 'fecha'
-                data_to_insert[supabase_column_name] = _format_date(value)
-            elif 'monto' in supabase_column_name or 'comision' in supabase_column_name or \
-                 'interes' in supabase_column_name or 'capital' in supabase_column_name or \
-                 'margen' in supabase_column_name or 'tasa' in supabase_column_name or \
-                 'igv' in supabase_column_name or 'abono' in supabase_column_name:
-                data_to_insert[supabase_column_name] = _convert_to_numeric(value)
-            elif 'plazo' in supabase_column_name and 'dias' in supabase_column_name:
+        return [{"proposal_id": None, "success": False,
+                 "error": "Error crítico: La conexión con Supabase no pudo ser establecida."} for _ in lote_session_data]
+
+    results = []
+    rows = []
+    fecha_propuesta = datetime.datetime.now().strftime('%d-%m-%y-%H-%M-%S')
+    used_ids = set()
+    for session_data in lote_session_data:
+        try:
+            row = _proposal_to_row(session_data, fecha_propuesta)
+            # Dos facturas iguales del mismo emisor en el mismo segundo tendrían el mismo ID
+            proposal_id = row['proposal_id']
+            suffix = 2
+            while row['proposal_id'] in used_ids:
+                row['proposal_id'] = f"{proposal_id}-{suffix}"
+                suffix += 1
+            used_ids.add(row['proposal_id'])
+            results.append({"proposal_id": row['proposal_id'], "success": True, "error": None})
+            rows.append((len(results) - 1, row))
+        except Exception as e:
+            results.append({"proposal_id": None, "success": False, "error": f"Error al preparar la propuesta: {e}"})
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            _insert_proposal_rows([row for _, row in chunk])
+        except Exception as e:
+            print(f"[ERROR en save_proposals_batch]: {e}. Reintentando fila por fila.")
+            for index, row in chunk:
                 try:
-                    data_to_insert[supabase_column_name] = int(value) if value is not None else None
-                except (ValueError, TypeError):
-                    data_to_insert[supabase_column_name] = None
-            elif 'aplicar_comision_afiliacion' == supabase_column_name:
-                data_to_insert[supabase_column_name] = bool(value) if value is not None else False
-            else:
-                data_to_insert[supabase_column_name] = value
-
-        # 3. Generar proposal_id y estado (campos especiales)
-        emisor_nombre_id = data_to_insert.get('emisor_nombre', 'SIN_NOMBRE').replace(' ', '_').replace('.', '').replace(',', '')
-        numero_factura = data_to_insert.get('numero_factura', 'SIN_FACTURA')
-        fecha_propuesta = datetime.datetime.now().strftime('%d-%m-%y-%H-%M-%S')
-        data_to_insert['proposal_id'] = f"{emisor_nombre_id}-{numero_factura}-{fecha_propuesta}"
-        data_to_insert['estado'] = 'ACTIVO'
-
-        # Asegurarse de que los campos que no se mapearon explícitamente pero existen en Supabase
-        # y son requeridos, tengan un valor por defecto o null si es apropiado.
-        # Esto es una medida de seguridad si el mapeo no es 100% exhaustivo.
-        # Por ejemplo, si 'tasa_avance_encontrada_calculada' no se encuentra en flattened_session_data
-        # pero es una columna en Supabase, asegúrate de que se añada como None o 0.0
-        if 'tasa_avance_encontrada_calculada' not in data_to_insert:
-            data_to_insert['tasa_avance_encontrada_calculada'] = None
-        if 'abono_real_calculado' not in data_to_insert:
-            data_to_insert['abono_real_calculado'] = None
-        if 'capital_calculado' not in data_to_insert:
-            data_to_insert['capital_calculado'] = None
-        # ... y así para otros campos calculados que puedan faltar si no se ejecutó el cálculo completo
-
-        # 4. Ejecutar la inserción
-        response = supabase.table('propuestas').insert(data_to_insert).execute()
-
-        if hasattr(response, 'error') and response.error:
-            raise Exception(response.error.message)
-
-        return True, f"Propuesta con ID {data_to_insert['proposal_id']} guardada exitosamente."
+                    _insert_proposal_rows([row])
+                except Exception as row_error:
+                    results[index]["success"] = False
+                    results[index]["error"] = f"Error al guardar la propuesta: {row_error}"
+    return results
 
-    except Exception as e:
-        print(f"[ERROR en save_proposal]: {e}")
-        return False, f"Error al guardar la propuesta: {e}"
+def save_proposal(session_data: dict) -> tuple[bool, str]:
+    """
+    Guarda una propuesta completa en la tabla 'propuestas' de Supabase,
+    con el resultado completo del Paso 2 en la columna JSONB recalculate_result_json.
+    """
+    result = save_proposals_batch([session_data])[0]
+    if result["success"]:
+        return True, f"Propuesta con ID {result['proposal_id']} guardada exitosamente."
+    return False, result["error"]
 
-def get_proposal_details_by_id(proposal_id: str) -> dict:
+def get_proposal_details_by_ids(proposal_ids: list[str]) -> dict[str, dict]:
+    """
+    Recupera varias propuestas con una consulta 'in' por cada PROPOSALS_IN_CHUNK_SIZE IDs.
+    Devuelve {proposal_id: propuesta} con las fechas en DD-MM-YYYY.
+    """
+    proposals = {}
+    supabase = obtener_cliente_supabase()
+    if not supabase:
+        return proposals
+    proposal_ids = list(dict.fromkeys(proposal_id for proposal_id in proposal_ids if proposal_id))
+    for start in range(0, len(proposal_ids), PROPOSALS_IN_CHUNK_SIZE):
+        try:
+            response = supabase.table('propuestas').select('*').in_('proposal_id', proposal_ids[start:start + PROPOSALS_IN_CHUNK_SIZE]).execute()
+            for proposal_data in response.data or []:
+                proposals[proposal_data['proposal_id']] = decodificar_propuesta(proposal_data)
+        except Exception as e:
+            print(f"[ERROR en get_proposal_details_by_ids]: {e}")
+    return proposals
+
+def get_proposal_details_by_id(proposal_id: str, columns="*") -> dict:
     """
     Recupera todos los detalles de una propuesta de factoring desde Supabase usando su proposal_id.
+    columns es la proyección a traer ('*' o una lista/cadena de columnas, que puede incluir rutas JSON).
     """
+    supabase = obtener_cliente_supabase()
     if not supabase:
         print("Error: La conexión con Supabase no está disponible.")
         return {"error": "No hay conexión con Supabase"}
 
+    if not isinstance(columns, str):
+        columns = ", ".join(dict.fromkeys(['proposal_id', *columns]))
+
     try:
-        response = supabase.table('propuestas').select('*').eq('proposal_id', proposal_id).single().execute()
+        response = supabase.table('propuestas').select(columns).eq('proposal_id', proposal_id).single().execute()
 
         if response.data:
-            proposal_data = response.data
-            
-            # Formatear las fechas de YYYY-MM-DD a DD-MM-YYYY para consistencia
-            for key in ['fecha_emision_factura', 'fecha_pago_calculada', 'fecha_desembolso_factoring']:
-                if proposal_data.get(key) and isinstance(proposal_data[key], str):
-                    try:
-                        proposal_data[key] = datetime.datetime.strptime(proposal_data[key], '%Y-%m-%d').strftime('%d-%m-%Y')
-                    except ValueError:
-                        # Si el formato ya es correcto o es inválido, se deja como está
-                        pass
-            return proposal_data
+            return decodificar_propuesta(response.data)
         else:
             print(f"No se encontró ninguna propuesta con el ID: {proposal_id}")
             return {"error": f"No se encontró la propuesta con ID {proposal_id}"}
@@ -228,10 +160,70 @@ def get_proposal_details_by_id(proposal_id: str) -> dict:
         print(f"[ERROR en get_proposal_details_by_id]: {e}")
         return {"error": f"Error de base de datos al buscar la propuesta: {e}"}
 
+# Campos que usa la liquidación. Los montos del Paso 2 se extraen de recalculate_result_json en el
+# servidor (solo esos valores viajan) y tienen prioridad sobre las columnas planas si existen.
+LIQUIDATION_COLUMNS = (
+    'monto_neto_factura', 'moneda_factura', 'fecha_pago_calculada', 'plazo_operacion_calculado', 'interes_mensual',
+    'capital_calculado', 'interes_calculado', 'margen_seguridad_calculado',
+)
+LIQUIDATION_JSON_FIELDS = {
+    'capital_calculado': 'calculo_con_tasa_encontrada.capital',
+    'interes_calculado': 'desglose_final_detallado.interes.monto',
+    'margen_seguridad_calculado': 'desglose_final_detallado.margen_seguridad.monto',
+}
+
+# None hasta la primera lectura; False si la columna JSON no admite rutas '->' (no se migró a JSONB)
+_liquidation_json_projection = None
+# Error de Postgres (vía PostgREST) al aplicar '->' sobre una columna de texto: "operator does not exist: text -> unknown"
+_JSON_PROJECTION_ERRORS = ('42883', 'operator does not exist')
+
+def _is_json_projection_error(proposal: dict) -> bool:
+    """True si la consulta falló porque la columna no admite rutas '->', no por red u otra causa."""
+    error = str(proposal.get('error', ''))
+    return any(marker in error for marker in _JSON_PROJECTION_ERRORS)
+
+def get_proposal_for_liquidation(proposal_id: str) -> dict:
+    """
+    Recupera solo los datos de una propuesta que necesita calcular_liquidacion, leyendo los
+    montos del resultado del Paso 2 directamente de la columna JSONB. Si la columna todavía es
+    de texto (PostgREST rechaza las rutas '->'), trae la columna completa y extrae los montos en Python.
+    """
+    global _liquidation_json_projection
+    if _liquidation_json_projection is not False:
+        json_columns = [proyeccion_json('recalculate_result_json', ruta, f"{column}_json")
+                        for column, ruta in LIQUIDATION_JSON_FIELDS.items()]
+        proposal = get_proposal_details_by_id(proposal_id, columns=[*LIQUIDATION_COLUMNS, *json_columns])
+        if 'error' not in proposal:
+            _liquidation_json_projection = True
+            json_values = {column: proposal.pop(f"{column}_json", None) for column in LIQUIDATION_JSON_FIELDS}
+            return _apply_liquidation_json_values(proposal, json_values)
+        # Un fallo transitorio (red, propuesta inexistente) no dice nada del tipo de la columna:
+        # se devuelve tal cual y la próxima llamada vuelve a intentar la proyección
+        if _liquidation_json_projection or not _is_json_projection_error(proposal):
+            return proposal
+
+    proposal = get_proposal_details_by_id(proposal_id, columns=[*LIQUIDATION_COLUMNS, 'recalculate_result_json'])
+    if 'error' in proposal:
+        return proposal
+    if _liquidation_json_projection is None:
+        print("Aviso: recalculate_result_json no es JSONB; se lee la columna completa (ver supabase/migrations).")
+        _liquidation_json_projection = False
+    recalc_result = proposal.pop('recalculate_result_json', None)
+    json_values = {column: valor_en_ruta(recalc_result, ruta) for column, ruta in LIQUIDATION_JSON_FIELDS.items()}
+    return _apply_liquidation_json_values(proposal, json_values)
+
+def _apply_liquidation_json_values(proposal: dict, json_values: dict) -> dict:
+    """Los montos del Paso 2 reemplazan a las columnas planas cuando existen."""
+    for column, json_value in json_values.items():
+        if json_value is not None:
+            proposal[column] = json_value
+    return proposal
+
 def get_active_proposals_by_emisor_nombre(emisor_nombre: str) -> list[dict]:
     """
     Recupera una lista de propuestas activas desde Supabase para un emisor_nombre dado.
     """
+    supabase = obtener_cliente_supabase()
     if not supabase:
         print("Error: La conexión con Supabase no está disponible.")
         return []
@@ -250,4 +242,44 @@ def get_active_proposals_by_emisor_nombre(emisor_nombre: str) -> list[dict]:
 
     except Exception as e:
         print(f"[ERROR en get_active_proposals_by_emisor_nombre]: {e}")
-        return []
\ No newline at end of file
+        return []
+
+# Filas por página al leer propuestas en bloque (PostgREST limita el tamaño de cada respuesta)
+PROPOSALS_PAGE_SIZE = 500
+
+def get_active_proposal_details_by_emisor_nombre(emisor_nombre: str, columns="*", page_size: int = PROPOSALS_PAGE_SIZE) -> list[dict]:
+    """
+    Recupera las propuestas activas completas de un emisor_nombre en una sola consulta paginada,
+    con el filtro por emisor y estado aplicado en el servidor.
+    columns es la proyección a traer ('*' o una lista/cadena de columnas); se incluye siempre proposal_id.
+    Las fechas se devuelven en DD-MM-YYYY, igual que get_proposal_details_by_id.
+    """
+    supabase = obtener_cliente_supabase()
+    if not supabase:
+        print("Error: La conexión con Supabase no está disponible.")
+        return []
+
+    if not isinstance(columns, str):
+        columns = ", ".join(dict.fromkeys(['proposal_id', *columns]))
+
+    proposals = []
+    start = 0
+    try:
+        while True:
+            # Orden estable por proposal_id para que las páginas no se solapen
+            response = supabase.table('propuestas')\
+                .select(columns)\
+                .eq('emisor_nombre', emisor_nombre)\
+                .eq('estado', 'ACTIVO')\
+                .order('proposal_id')\
+                .range(start, start + page_size - 1)\
+                .execute()
+
+            page = response.data or []
+            proposals.extend(decodificar_propuesta(proposal_data) for proposal_data in page)
+            if len(page) < page_size:
+                break
+            start += page_size
+    except Exception as e:
+        print(f"[ERROR en get_active_proposal_details_by_emisor_nombre]: {e}")
+    return proposals
@@ -1,23 +1,21 @@
 
 import os
 import datetime
-from supabase import create_client, Client
-from dotenv import load_dotenv
 from pdf_generator_v_cli import generate_pdf
-
-# Cargar variables de entorno desde el .env en el directorio 'supabase'
-dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'supabase', '.env')
-load_dotenv(dotenv_path=dotenv_path)
-
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+from cliente_supabase import obtener_cliente_supabase
+from espejo_propuestas import EspejoPropuestas
 
 def fetch_latest_proposals(supabase_client, limit=5):
-    """Fetches the most recent proposals from Supabase."""
+    """
+    Fetches the most recent proposals from the local mirror, syncing only the changes from Supabase first.
+    Rows come decoded like supabase_handler returns them (dates as DD-MM-YYYY, JSON columns as dicts).
+    """
     try:
-        response = supabase_client.table('propuestas').select('*').order('fecha_emision_factura', desc=True).limit(limit).execute()
-        if response.data:
-            return response.data
+        espejo = EspejoPropuestas()
+        espejo.sincronizar(supabase_client)
+        proposals = espejo.ultimas(limit)
+        if proposals:
+            return proposals
         else:
             print("No proposals found in Supabase.")
             return []
@@ -87,11 +85,11 @@ def create_consolidated_pdf_data(proposals):
 
 def main():
     """Main function to fetch data and generate the PDF."""
-    if not SUPABASE_URL or not SUPABASE_KEY:
+    supabase_client = obtener_cliente_supabase()
+    if not supabase_client:
         print("Supabase URL and Key are required. Check your .env file.")
         return
 
-    supabase_client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
     proposals = fetch_latest_proposals(supabase_client)
 
     if not proposals:
@@ -0,0 +1,15 @@
+import pytest
+
+from cache_sqlite import CacheSQLite
+
+def test_guarda_y_obtiene(tmp_path):
+    cache = CacheSQLite(str(tmp_path / "cache.sqlite3"), version="1", tabla="ruc_2")
+    cache.guardar("20100047218", {"nombre": "ACME"})
+    assert cache.obtener("20100047218") == {"nombre": "ACME"}
+    assert cache.obtener("otra") is None
+
+@pytest.mark.parametrize("tabla", ["", "1cache", "cache; DROP TABLE x", "cache-2", "caché", "cache\n", None])
+def test_nombre_de_tabla_no_valido(tmp_path, tabla):
+    with pytest.raises(ValueError):
+        CacheSQLite(str(tmp_path / "cache.sqlite3"), version="1", tabla=tabla)
+    assert not (tmp_path / "cache.sqlite3").exists()
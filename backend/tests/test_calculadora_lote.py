@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from calculadora_factoring_V_CLI import (
+    _calcular_desglose_factura,
+    calcular_desembolso_inicial,
+    procesar_lote_desembolso_inicial,
+)
+
+def _factura(rng, comision_estructuracion_pct):
+    return {
+        "plazo_operacion": rng.randint(0, 360),
+        "mfn": round(rng.uniform(100, 250000), 2),
+        "tasa_avance": rng.choice([0.90, 0.95, 0.98, 1.0]),
+        "interes_mensual": rng.choice([0.0125, 0.015, 0.02, 0.025]),
+        "comision_estructuracion_pct": comision_estructuracion_pct,
+        "comision_minima_aplicable": rng.choice([10.0, 66.67, 200.0]),
+        "igv_pct": 0.18,
+        "comision_afiliacion_aplicable": rng.choice([0.0, 200.0]),
+        "aplicar_comision_afiliacion": rng.random() < 0.3,
+    }
+
+def _lote_escalar(lote):
+    """Referencia: el procesamiento factura por factura con el cálculo escalar."""
+    pct = lote[0]["comision_estructuracion_pct"]
+    capital_total = sum(f["mfn"] * f["tasa_avance"] for f in lote)
+    porcentaje = capital_total * pct > sum(f["comision_minima_aplicable"] for f in lote)
+    return [
+        _calcular_desglose_factura(
+            plazo_operacion=f["plazo_operacion"],
+            mfn=f["mfn"],
+            tasa_avance=f["tasa_avance"],
+            interes_mensual=f["interes_mensual"],
+            comision_estructuracion_fija=f["mfn"] * f["tasa_avance"] * pct if porcentaje else f["comision_minima_aplicable"],
+            igv_pct=f["igv_pct"],
+            comision_afiliacion_aplicable=f["comision_afiliacion_aplicable"],
+            aplicar_comision_afiliacion=f["aplicar_comision_afiliacion"],
+        )
+        for f in lote
+    ]
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_lote_columnar_igual_al_escalar(semilla):
+    rng = random.Random(semilla)
+    pct = rng.choice([0.001, 0.005, 0.015])
+    lote = [_factura(rng, pct) for _ in range(rng.randint(1, 40))]
+
+    columnar = procesar_lote_desembolso_inicial(lote)["resultados_por_factura"]
+    escalar = _lote_escalar(lote)
+
+    assert len(columnar) == len(escalar)
+    for fila_columnar, fila_escalar in zip(columnar, escalar):
+        assert fila_columnar.keys() == fila_escalar.keys()
+        for campo, valor in fila_escalar.items():
+            assert fila_columnar[campo] == pytest.approx(valor, abs=0.01), campo
+        assert fila_columnar["monto_desembolsado"] == fila_escalar["monto_desembolsado"]
+
+def test_plazo_negativo_se_reporta_por_factura():
+    rng = random.Random(1)
+    lote = [_factura(rng, 0.005), dict(_factura(rng, 0.005), plazo_operacion=-1)]
+    resultados = procesar_lote_desembolso_inicial(lote)["resultados_por_factura"]
+    assert "error" not in resultados[0]
+    assert resultados[1] == {"error": "El plazo de operación no puede ser negativo."}
+
+@pytest.mark.parametrize("semilla", range(10))
+def test_una_factura_igual_que_lote_de_una(semilla):
+    factura = _factura(random.Random(semilla), 0.005)
+    argumentos = {clave: valor for clave, valor in factura.items() if clave != "comision_estructuracion_pct"}
+    individual = calcular_desembolso_inicial(comision_estructuracion_pct=factura["comision_estructuracion_pct"], **argumentos)
+    assert individual == procesar_lote_desembolso_inicial([factura])["resultados_por_factura"][0]
+
+def test_valores_nulos_se_rechazan():
+    factura = _factura(random.Random(0), 0.005)
+    with pytest.raises(TypeError):
+        procesar_lote_desembolso_inicial([dict(factura, interes_mensual=None)])
+    with pytest.raises(TypeError):
+        _calcular_desglose_factura(30, 1000.0, 0.9, None, 10.0, 0.18)
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from calculadora_factoring_V_CLI import (
+    calcular_desembolso_inicial,
+    calcular_monto_objetivo_desembolso,
+    encontrar_tasa_de_avance,
+    procesar_lote_calcular_y_recalcular,
+)
+
+# Factura en el umbral: la comisión porcentual del cálculo inicial (10.00) supera la mínima (9.99),
+# pero el capital de la búsqueda, con el objetivo redondeado hacia abajo, ya no la supera
+FACTURA_UMBRAL = {
+    "plazo_operacion": 30, "mfn": 1000.0, "tasa_avance": 1.0, "interes_mensual": 0.02,
+    "comision_estructuracion_pct": 0.01, "comision_minima_aplicable": 9.99, "igv_pct": 0.18,
+}
+
+def _lote(semilla):
+    rng = random.Random(semilla)
+    return [
+        {
+            "plazo_operacion": rng.randint(1, 180),
+            "mfn": round(rng.uniform(500, 80000), 2),
+            "tasa_avance": rng.choice([0.90, 0.95, 0.98]),
+            "interes_mensual": rng.choice([0.015, 0.02]),
+            "comision_estructuracion_pct": 0.005,
+            "comision_minima_aplicable": rng.choice([10.0, 66.67]),
+            "igv_pct": 0.18,
+            "comision_afiliacion_aplicable": 100.0,
+            "aplicar_comision_afiliacion": rng.random() < 0.5,
+        }
+        for _ in range(rng.randint(1, 8))
+    ]
+
+@pytest.mark.parametrize("semilla", range(10))
+def test_decision_por_factura_igual_que_los_endpoints_individuales(semilla):
+    lote = _lote(semilla)
+    resultado = procesar_lote_calcular_y_recalcular(lote)
+    assert resultado["decision_comision"] == "factura"
+
+    for factura, fila in zip(lote, resultado["resultados_por_factura"]):
+        inicial = calcular_desembolso_inicial(**factura)
+        argumentos = {clave: valor for clave, valor in factura.items() if clave != "tasa_avance"}
+        recalculo = encontrar_tasa_de_avance(
+            monto_objetivo=calcular_monto_objetivo_desembolso(inicial["abono_real_teorico"]), **argumentos
+        )
+        assert fila["initial_calc_result"] == inicial
+        assert fila["recalculate_result"] == recalculo
+
+def test_decision_por_factura_informa_ambos_metodos():
+    fila = procesar_lote_calcular_y_recalcular([FACTURA_UMBRAL])["resultados_por_factura"][0]
+    assert fila["metodo_comision_inicial"] == "PORCENTAJE"
+    assert fila["metodo_comision_recalculo"] == "PRORRATEADO"
+
+@pytest.mark.parametrize("modo", ["cerrado", "exacto"])
+def test_decision_de_lote_usa_el_mismo_metodo_en_ambos_pasos(modo):
+    resultado = procesar_lote_calcular_y_recalcular([FACTURA_UMBRAL], modo=modo, decision_comision="lote")
+    assert resultado["metodo_comision_inicial"] == resultado["metodo_comision_recalculo"] == "PORCENTAJE"
+    fila = resultado["resultados_por_factura"][0]
+    capital = fila["recalculate_result"]["calculo_con_tasa_encontrada"]["capital"]
+    comision = fila["recalculate_result"]["calculo_con_tasa_encontrada"]["comision_estructuracion"]
+    assert comision == pytest.approx(capital * FACTURA_UMBRAL["comision_estructuracion_pct"], abs=0.01)
+
+def test_decision_desconocida_se_rechaza():
+    with pytest.raises(ValueError):
+        procesar_lote_calcular_y_recalcular([FACTURA_UMBRAL], decision_comision="global")
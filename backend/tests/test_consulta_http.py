@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+import ruc_lookup
+import sunat_query
+from cliente_http import RequiereNavegador
+
+RUC = "20563361761"
+TABLA = '<html><body><table class="empresa"><tr><td>RUC:</td><td>20563361761</td></tr></table></body></html>'
+SIN_RESULTADOS = '<html><body><form action="buscador_empresas.php"></form><p>No se encontraron resultados para 20563361761</p></body></html>'
+SIN_TABLA = '<html><body><div id="resultados"></div><script>cargar()</script></body></html>'
+
+@pytest.fixture
+def navegador(monkeypatch):
+    """Registra las páginas pedidas al navegador en lugar de abrir uno."""
+    pedidas = []
+
+    def fetch(url):
+        pedidas.append(url)
+        return TABLA
+    monkeypatch.setattr(sunat_query, "_fetch_company_page_selenium", fetch)
+    return pedidas
+
+def _servir(monkeypatch, modulo, html):
+    def descargar(url):
+        if isinstance(html, Exception):
+            raise html
+        return html
+    monkeypatch.setattr(modulo, "descargar_pagina", descargar)
+
+def test_ruc_no_listado_no_usa_el_navegador(monkeypatch, navegador):
+    _servir(monkeypatch, sunat_query, SIN_RESULTADOS)
+    for modo in ("auto", "http"):
+        assert sunat_query.get_company_data_from_datosperu(RUC, use_cache=False, mode=modo) == {"error": sunat_query.NOT_FOUND_MESSAGE}
+    assert navegador == []
+
+def test_pagina_sin_tabla_ni_mensaje_usa_el_navegador(monkeypatch, navegador):
+    _servir(monkeypatch, sunat_query, SIN_TABLA)
+    assert sunat_query.get_company_data_from_datosperu(RUC, use_cache=False, mode="auto") == {"RUC": RUC}
+    assert len(navegador) == 1
+
+def test_modo_http_propaga_requiere_navegador(monkeypatch, navegador):
+    _servir(monkeypatch, sunat_query, SIN_TABLA)
+    with pytest.raises(RequiereNavegador):
+        sunat_query.get_company_data_from_datosperu(RUC, use_cache=False, mode="http")
+
+    _servir(monkeypatch, ruc_lookup, RequiereNavegador("HTTP 403"))
+    with pytest.raises(RequiereNavegador):
+        ruc_lookup.lookup_ruc_info(RUC, use_cache=False, mode="http")
+    assert navegador == []
+
+def test_otros_errores_siguen_siendo_resultado_de_error(monkeypatch):
+    _servir(monkeypatch, ruc_lookup, ConnectionError("sin red"))
+    assert ruc_lookup.lookup_ruc_info(RUC, use_cache=False, mode="http") == {"name": "Error", "address": "Error", "status": "Error"}
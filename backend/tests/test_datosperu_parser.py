@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from datosperu_parser import has_no_results_marker, parse_company_table, parse_detail_page, parse_search_page
+
+# Páginas de datosperu.org guardadas y anonimizadas (direcciones y datos de contacto reemplazados),
+# con los dos formatos de ficha que maneja el parser: etiqueta y valor en celdas separadas, y "Etiqueta: valor"
+CARPETA_PAGINAS = os.path.join(os.path.dirname(__file__), "fixtures", "datosperu")
+
+def _pagina(nombre):
+    with open(os.path.join(CARPETA_PAGINAS, nombre), encoding="utf-8") as archivo:
+        return archivo.read()
+
+@pytest.mark.parametrize("ruc, nombre", [
+    ("20563361761", "ZEN HOLDINGS SAC"),
+    ("20512345678", "COMERCIAL ANDINA DEL SUR S.A.C."), # el nombre está en el elemento anterior al RUC
+    ("20600079070", None),
+])
+def test_buscador(ruc, nombre):
+    assert parse_search_page(_pagina(f"buscador_{ruc}.html"), ruc) == nombre
+
+def test_buscador_no_confunde_rucs_parecidos():
+    assert parse_search_page(_pagina("buscador_20512345678.html"), "20512345679") == "COMERCIAL ANDINA EIRL"
+
+@pytest.mark.parametrize("pagina, esperado", [
+    ("empresa-zen-holdings-sac-20563361761.html", {
+        "name": "ZEN HOLDINGS SAC",
+        "address": "AV. EJEMPLO NRO. 100 LIMA - LIMA - MIRAFLORES",
+        "status": "ACTIVO",
+    }),
+    ("empresa-comercial-andina-del-sur-sac-20512345678.html", {
+        "name": "COMERCIAL ANDINA DEL SUR S.A.C.",
+        "address": "JR. DE PRUEBA NRO. 250 AREQUIPA - AREQUIPA - CERCADO",
+        "status": "BAJA DE OFICIO",
+    }),
+])
+def test_ficha(pagina, esperado):
+    # La primera ficha usa la etiqueta NOMBRE sola en su celda: la expresión anterior (r'NOMBRE\\s*')
+    # buscaba una barra invertida literal y nunca leía el nombre ni la dirección
+    assert parse_detail_page(_pagina(pagina)) == esperado
+
+def test_tabla_empresa():
+    assert parse_company_table(_pagina("buscador_20563361761.html")) == {
+        "RUC": "20563361761",
+        "Razón Social": "ZEN HOLDINGS SAC",
+        "Tipo Contribuyente": "SOCIEDAD ANONIMA CERRADA",
+        "Estado": "ACTIVO",
+        "Condición": "HABIDO",
+        "Dirección": "AV. EJEMPLO NRO. 100 LIMA - LIMA - MIRAFLORES",
+    }
+    assert parse_company_table(_pagina("buscador_20600079070.html")) is None
+
+@pytest.mark.parametrize("pagina, sin_resultados", [
+    ("buscador_20600079070.html", True),
+    ("buscador_20563361761.html", False),
+    ("buscador_20512345678.html", False),
+])
+def test_mensaje_sin_resultados(pagina, sin_resultados):
+    assert has_no_results_marker(_pagina(pagina)) is sin_resultados
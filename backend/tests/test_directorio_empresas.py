@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+import directorio_empresas
+from directorio_empresas import cache_directorio, obtener_empresa, precargar_directorio
+
+class _Consulta:
+    """Imita la cadena table().select().order().range().execute() de supabase-py sobre una lista de filas."""
+    def __init__(self, cliente):
+        self.cliente = cliente
+        self.rango = None
+
+    def select(self, *_):
+        return self
+
+    def order(self, *_):
+        return self
+
+    def range(self, inicio, fin):
+        self.rango = (inicio, fin)
+        return self
+
+    def execute(self):
+        self.cliente.consultas += 1
+        if self.cliente.error:
+            raise self.cliente.error
+        inicio, fin = self.rango
+        return type("Respuesta", (), {"data": self.cliente.filas[inicio:fin + 1]})()
+
+class _Cliente:
+    def __init__(self, filas=(), error=None):
+        self.filas = list(filas)
+        self.error = error
+        self.consultas = 0
+
+    def table(self, nombre):
+        assert nombre == directorio_empresas.TABLA_DIRECTORIO
+        return _Consulta(self)
+
+@pytest.fixture(autouse=True)
+def cache_limpia(monkeypatch):
+    cache_directorio.limpiar()
+    monkeypatch.setattr(directorio_empresas, "_hilo_precarga", None)
+    yield
+    cache_directorio.limpiar()
+
+def test_precarga_por_paginas():
+    filas = [{"RUC": f"20{n:09d}", "Razon Social": f"EMPRESA {n}"} for n in range(25)]
+    cliente = _Cliente(filas)
+    assert precargar_directorio(cliente, tamano_pagina=10) == 25
+    assert cliente.consultas == 3
+    assert obtener_empresa("20000000007", lambda: pytest.fail("no debería consultar"))["Razon Social"] == "EMPRESA 7"
+    assert cache_directorio.estadisticas()["segundos_desde_precarga"] is not None
+
+@pytest.mark.parametrize("cliente", [None, _Cliente(error=RuntimeError("sin red"))])
+def test_el_intento_fallido_tambien_se_registra(cliente):
+    assert precargar_directorio(cliente) == 0
+    assert cache_directorio.estadisticas()["segundos_desde_precarga"] is not None
+
+def test_precarga_en_segundo_plano_una_vez_por_proceso():
+    liberar = threading.Event()
+    llamadas = []
+
+    def fabrica_cliente():
+        llamadas.append(1)
+        liberar.wait(5)
+        return _Cliente([{"RUC": "20100047218", "Razon Social": "ACME"}])
+
+    hilo = directorio_empresas.precargar_directorio_en_segundo_plano(fabrica_cliente)
+    assert directorio_empresas.precargar_directorio_en_segundo_plano(fabrica_cliente) is hilo
+    liberar.set()
+    hilo.join(5)
+    assert llamadas == [1]
+    assert cache_directorio.estadisticas()["entradas"] == 1
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from cache_ruc import ENCONTRADO, ERROR, NO_ENCONTRADO
+from enriquecimiento_rucs import enriquecer_rucs, resumen_enriquecimiento
+
+class _ConsultaStub:
+    """consultar(ruc) de prueba: cuenta las llamadas por RUC y falla las primeras 'fallos[ruc]' veces."""
+    def __init__(self, fallos=None, no_encontrados=()):
+        self.fallos = dict(fallos or {})
+        self.no_encontrados = set(no_encontrados)
+        self.llamadas = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, ruc):
+        with self._lock:
+            self.llamadas[ruc] = self.llamadas.get(ruc, 0) + 1
+            falla = self.llamadas[ruc] <= self.fallos.get(ruc, 0)
+        if falla:
+            raise ConnectionError("sin red")
+        if ruc in self.no_encontrados:
+            return {"name": "N/A", "address": "N/A", "status": "N/A"}
+        return {"name": f"EMPRESA {ruc}", "address": "LIMA", "status": "ACTIVO"}
+
+def _clasificar(resultado):
+    if "error" in resultado:
+        return ERROR
+    return NO_ENCONTRADO if resultado["name"] == "N/A" else ENCONTRADO
+
+def _enriquecer(rucs, consultar, **opciones):
+    opciones.setdefault("espera_base", 0.001)
+    return {r["ruc"]: r for r in enriquecer_rucs(rucs, consultar=consultar, clasificar=_clasificar, **opciones)}
+
+def test_repetidos_se_consultan_una_vez():
+    consultar = _ConsultaStub()
+    registros = _enriquecer(["20100047218", " 20100047218 ", "20563361761", "20100047218", "", None], consultar)
+    assert sorted(registros) == ["20100047218", "20563361761"]
+    assert consultar.llamadas == {"20100047218": 1, "20563361761": 1}
+
+def test_rucs_invalidos_no_se_consultan():
+    consultar = _ConsultaStub()
+    registros = _enriquecer(["123", "2010004721A", "20100047218"], consultar)
+    assert registros["123"]["estado"] == registros["2010004721A"]["estado"] == ERROR
+    assert registros["123"]["intentos"] == 0
+    assert consultar.llamadas == {"20100047218": 1}
+
+def test_reintenta_hasta_lograrlo():
+    consultar = _ConsultaStub(fallos={"20100047218": 2, "20563361761": 10}, no_encontrados={"20600079070"})
+    registros = _enriquecer(["20100047218", "20563361761", "20600079070"], consultar, reintentos=3)
+
+    assert registros["20100047218"]["estado"] == ENCONTRADO
+    assert registros["20100047218"]["intentos"] == 3
+    assert registros["20563361761"]["estado"] == ERROR # se rinde tras 1 + 3 reintentos
+    assert registros["20563361761"]["intentos"] == 4
+    assert registros["20600079070"]["estado"] == NO_ENCONTRADO
+    assert registros["20600079070"]["intentos"] == 1
+    assert resumen_enriquecimiento(registros.values()) == {ENCONTRADO: 1, NO_ENCONTRADO: 1, ERROR: 1}
+
+def test_sin_limite_propio_por_defecto():
+    # El único límite hacia datosperu es el de cliente_http; el lote no agrega esperas propias
+    rucs = [f"20{n:09d}" for n in range(40)]
+    inicio = time.perf_counter()
+    registros = _enriquecer(rucs, _ConsultaStub())
+    assert len(registros) == 40
+    assert time.perf_counter() - inicio < 1.0
+
+def test_limite_opcional_para_consultas_propias():
+    rucs = [f"20{n:09d}" for n in range(6)]
+    inicio = time.perf_counter()
+    _enriquecer(rucs, _ConsultaStub(), consultas_por_segundo=20)
+    assert time.perf_counter() - inicio >= 5 / 20 * 0.9
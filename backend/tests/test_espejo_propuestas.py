@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from espejo_propuestas import COLUMNA_MARCA, EspejoPropuestas
+
+class _Consulta:
+    """Imita select('*').gte().order().range().execute() de supabase-py sobre una lista de filas."""
+    def __init__(self, cliente):
+        self.cliente = cliente
+        self.filtro = None
+        self.orden = []
+
+    def _exigir_columna(self, columna):
+        if columna not in self.cliente.columnas:
+            raise RuntimeError(f"column propuestas.{columna} does not exist")
+
+    def select(self, columnas):
+        return self
+
+    def gte(self, columna, valor):
+        self._exigir_columna(columna)
+        self.filtro = (columna, valor)
+        return self
+
+    def order(self, columna):
+        self._exigir_columna(columna)
+        self.orden.append(columna)
+        return self
+
+    def range(self, inicio, fin):
+        self.rango = (inicio, fin)
+        return self
+
+    def execute(self):
+        self.cliente.consultas += 1
+        filas = [dict(fila) for fila in self.cliente.filas]
+        if self.filtro:
+            columna, valor = self.filtro
+            filas = [fila for fila in filas if fila[columna] >= valor]
+        filas.sort(key=lambda fila: tuple(fila[columna] for columna in self.orden))
+        inicio, fin = self.rango
+        return type("Respuesta", (), {"data": filas[inicio:fin + 1]})()
+
+class _Cliente:
+    def __init__(self, filas, con_marca=True):
+        self.filas = filas
+        self.columnas = {'proposal_id', *(filas[0] if filas else {})}
+        if not con_marca:
+            self.columnas.discard(COLUMNA_MARCA)
+            for fila in filas:
+                fila.pop(COLUMNA_MARCA, None)
+        self.consultas = 0
+
+    def table(self, nombre):
+        return _Consulta(self)
+
+def _fila(n, marca="2026-10-01T00:00:00"):
+    return {
+        'proposal_id': f"P{n:03d}", 'emisor_nombre': 'EMISOR', 'estado': 'ACTIVO',
+        'fecha_emision_factura': f"2025-07-{n % 28 + 1:02d}", COLUMNA_MARCA: marca,
+        'recalculate_result_json': json.dumps({'resultado_busqueda': {'tasa_avance_encontrada': 0.98}}),
+    }
+
+@pytest.fixture
+def espejo(tmp_path):
+    return EspejoPropuestas(str(tmp_path / "propuestas.sqlite3"))
+
+def test_sincronizacion_incremental(espejo):
+    cliente = _Cliente([_fila(n, marca=f"2026-10-01T00:00:{n:02d}") for n in range(25)])
+    assert espejo.sincronizar(cliente, tamano_pagina=10) == 25
+    assert espejo.marca_de_agua() == "2026-10-01T00:00:24"
+
+    cliente.filas[3][COLUMNA_MARCA] = "2026-10-02T00:00:00"
+    cliente.filas[3]['estado'] = 'CANCELADO'
+    # La fila con la última marca copiada se vuelve a traer ('gte'), junto con la modificada
+    assert espejo.sincronizar(cliente, tamano_pagina=10) == 2
+    assert espejo.obtener('P003')['estado'] == 'CANCELADO'
+    assert espejo.estadisticas()['filas'] == 25
+
+def test_sin_columna_de_marca_se_trae_la_tabla_completa(espejo):
+    cliente = _Cliente([_fila(n) for n in range(12)], con_marca=False)
+    assert espejo.sincronizar(cliente, tamano_pagina=5) == 12
+    assert espejo.marca_de_agua() is None
+
+    cliente.filas.pop()
+    assert espejo.sincronizar(cliente, tamano_pagina=5) == 11
+    assert espejo.estadisticas()['filas'] == 11 # la copia completa también quita las borradas
+    assert len(espejo.ultimas(5)) == 5
+
+def test_filas_se_devuelven_decodificadas(espejo):
+    espejo.sincronizar(_Cliente([_fila(1)]))
+    propuesta = espejo.obtener('P001')
+    assert propuesta['fecha_emision_factura'] == '02-07-2025'
+    assert propuesta['recalculate_result_json'] == {'resultado_busqueda': {'tasa_avance_encontrada': 0.98}}
+
+def test_sin_conexion_conserva_el_espejo(espejo):
+    espejo.sincronizar(_Cliente([_fila(1)]))
+
+    class _ClienteCaido:
+        def table(self, nombre):
+            raise ConnectionError("sin red")
+
+    assert espejo.sincronizar(_ClienteCaido()) == 0
+    assert espejo.obtener('P001') is not None
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+import supabase_handler
+from esquema_propuestas import codificar_propuesta, decodificar_propuesta, proyeccion_json, valor_en_ruta
+
+RECALCULO = {
+    'resultado_busqueda': {'tasa_avance_encontrada': 0.979, 'abono_real_calculado': 9170.0},
+    'calculo_con_tasa_encontrada': {'capital': 9790.0, 'interes': 229.9, 'margen_seguridad': 210.0},
+    'desglose_final_detallado': {'interes': {'monto': 229.9}, 'margen_seguridad': {'monto': 210.0}},
+}
+
+def test_codificar_y_decodificar():
+    fila = codificar_propuesta({
+        'numero_factura': 'E001-676', 'fecha_emision_factura': '09-07-2025', 'plazo_credito_dias': '60',
+        'initial_calc_result': {'capital': 9800.0}, 'recalculate_result': RECALCULO,
+    })
+    assert fila['fecha_emision_factura'] == '2025-07-09'
+    assert fila['plazo_credito_dias'] == 60
+    assert fila['capital_calculado'] == 9790.0 # el Paso 2 tiene prioridad sobre el Paso 1
+    assert fila['recalculate_result_json'] is RECALCULO
+
+    datos = decodificar_propuesta(dict(fila))
+    assert datos['fecha_emision_factura'] == '09-07-2025'
+    assert datos['recalculate_result_json'] == RECALCULO
+
+def test_json_guardado_como_texto_se_decodifica():
+    assert decodificar_propuesta({'recalculate_result_json': json.dumps(RECALCULO)})['recalculate_result_json'] == RECALCULO
+    assert decodificar_propuesta({'recalculate_result_json': 'no es json'})['recalculate_result_json'] is None
+
+def test_rutas_json():
+    assert proyeccion_json('recalculate_result_json', 'interes.monto', 'x') == 'x:recalculate_result_json->interes->monto'
+    assert valor_en_ruta(RECALCULO, 'desglose_final_detallado.interes.monto') == 229.9
+    assert valor_en_ruta(RECALCULO, 'desglose_final_detallado.abono.monto') is None
+    assert valor_en_ruta(None, 'a.b') is None
+
+class _Consulta:
+    def __init__(self, cliente):
+        self.cliente = cliente
+
+    def select(self, columnas):
+        self.columnas = columnas
+        return self
+
+    def eq(self, columna, valor):
+        return self
+
+    def single(self):
+        return self
+
+    def execute(self):
+        self.cliente.consultas.append(self.columnas)
+        if self.cliente.fallos:
+            raise self.cliente.fallos.pop(0)
+        columnas = [c.strip() for c in self.columnas.split(',')]
+        if any('->' in c for c in columnas):
+            if not self.cliente.jsonb:
+                raise RuntimeError("operator does not exist: text -> unknown")
+            datos = {}
+            for c in columnas:
+                alias, _, ruta = c.partition(':')
+                datos[alias] = valor_en_ruta(RECALCULO, '.'.join(ruta.split('->')[1:])) if ruta else self.cliente.fila.get(c)
+        else:
+            datos = {c: self.cliente.fila.get(c) for c in columnas}
+        return type("Respuesta", (), {"data": datos})()
+
+class _Cliente:
+    def __init__(self, jsonb):
+        self.jsonb = jsonb
+        self.consultas = []
+        self.fallos = []
+        recalculo = RECALCULO if jsonb else json.dumps(RECALCULO)
+        self.fila = {'proposal_id': 'P1', 'moneda_factura': 'PEN', 'capital_calculado': 1.0, 'recalculate_result_json': recalculo}
+
+    def table(self, nombre):
+        return _Consulta(self)
+
+@pytest.mark.parametrize("jsonb", [True, False])
+def test_liquidacion_con_y_sin_columna_jsonb(monkeypatch, jsonb):
+    cliente = _Cliente(jsonb)
+    monkeypatch.setattr(supabase_handler, "obtener_cliente_supabase", lambda: cliente)
+    monkeypatch.setattr(supabase_handler, "_liquidation_json_projection", None)
+
+    for _ in range(2):
+        propuesta = supabase_handler.get_proposal_for_liquidation('P1')
+        assert propuesta['capital_calculado'] == 9790.0
+        assert propuesta['interes_calculado'] == 229.9
+        assert propuesta['margen_seguridad_calculado'] == 210.0
+        assert propuesta['moneda_factura'] == 'PEN'
+        assert 'recalculate_result_json' not in propuesta
+
+    # Sin JSONB la proyección se intenta una sola vez; después se lee directamente la columna completa
+    assert len(cliente.consultas) == (2 if jsonb else 3)
+
+def test_fallo_transitorio_no_desactiva_la_proyeccion(monkeypatch):
+    cliente = _Cliente(jsonb=True)
+    cliente.fallos.append(ConnectionError("Server disconnected"))
+    monkeypatch.setattr(supabase_handler, "obtener_cliente_supabase", lambda: cliente)
+    monkeypatch.setattr(supabase_handler, "_liquidation_json_projection", None)
+
+    assert 'error' in supabase_handler.get_proposal_for_liquidation('P1')
+    assert supabase_handler._liquidation_json_projection is None
+
+    # La siguiente llamada vuelve a proyectar las rutas JSON en lugar de leer la columna completa
+    propuesta = supabase_handler.get_proposal_for_liquidation('P1')
+    assert propuesta['capital_calculado'] == 9790.0
+    assert supabase_handler._liquidation_json_projection is True
+    assert len(cliente.consultas) == 2
+    assert all('->' in consulta for consulta in cliente.consultas)
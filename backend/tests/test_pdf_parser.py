@@ -0,0 +1,134 @@
+import os
+
+import pytest
+
+from pdf_parser import _extract_lazily, extract_fields_from_pdf, run_field_extractors, text_to_float
+
+CARPETA_PDFS = os.path.join(os.path.dirname(__file__), "..", "..", "pdfs_para_pruebas")
+
+# Campos extraídos de las facturas de prueba del repositorio (mismo resultado que el parser original)
+FACTURAS = {
+    "090725 DANPER E001-676.pdf": {
+        "emisor_ruc": "20603718489", "aceptante_ruc": "20170040938", "invoice_id": "E001-676",
+        "fecha_emision": "09-07-2025", "moneda": "PEN", "monto_total": 9357.4, "monto_neto": 8983.1,
+    },
+    "090725 DANPER E001-677.pdf": {
+        "emisor_ruc": "20603718489", "aceptante_ruc": "20170040938", "invoice_id": "E001-677",
+        "fecha_emision": "15-07-2025", "moneda": "PEN", "monto_total": 8519.6, "monto_neto": 8178.82,
+    },
+    "10426266186-01-E001-248.pdf": {
+        "emisor_ruc": "10426266186", "aceptante_ruc": "20221084684", "invoice_id": "E001-248",
+        "fecha_emision": "11-11-2024", "moneda": "USD", "monto_total": 17369.6, "monto_neto": 17369.6,
+    },
+    "220725 DANPER E001-678.pdf": {
+        "emisor_ruc": "20603718489", "aceptante_ruc": "20170040938", "invoice_id": "E001-678",
+        "fecha_emision": "22-07-2025", "moneda": "PEN", "monto_total": 6726.0, "monto_neto": 6456.96,
+    },
+    "280525 DANPER E001-667 (1).pdf": {
+        "emisor_ruc": "20603718489", "aceptante_ruc": "20170040938", "invoice_id": "E001-667",
+        "fecha_emision": "28-05-2025", "moneda": "PEN", "monto_total": 7906.0, "monto_neto": 7589.76,
+    },
+    "PDF-DOC-E001-191820477995030.pdf": {
+        "emisor_ruc": "20477995030", "aceptante_ruc": "20159473148", "invoice_id": "E001-1918",
+        "fecha_emision": "28-05-2025", "moneda": "USD", "monto_total": 2841.65, "monto_neto": 2756.4,
+    },
+    "PDF-DOC-E001-9220563361761.pdf": {
+        "emisor_ruc": "20563361761", "aceptante_ruc": "20527764221", "invoice_id": "E001-92",
+        "fecha_emision": "12-06-2025", "moneda": "USD", "monto_total": 2950.0, "monto_neto": 2950.0,
+    },
+}
+
+def _ruta(nombre):
+    ruta = os.path.join(CARPETA_PDFS, nombre)
+    if not os.path.exists(ruta):
+        pytest.skip(f"Falta el PDF de prueba {nombre}")
+    return ruta
+
+@pytest.mark.parametrize("nombre", sorted(FACTURAS))
+def test_facturas_de_prueba(nombre):
+    assert extract_fields_from_pdf(_ruta(nombre)) == FACTURAS[nombre]
+
+@pytest.mark.parametrize("nombre", sorted(FACTURAS)[:2])
+def test_bytes_y_ruta_dan_lo_mismo(nombre):
+    ruta = _ruta(nombre)
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    assert extract_fields_from_pdf(contenido) == extract_fields_from_pdf(memoryview(contenido)) == FACTURAS[nombre]
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("MIL DOSCIENTOS CINCUENTA Y 40/100", 1250.40),
+    ("NUEVE MIL TRESCIENTOS CINCUENTA Y SIETE CON 40/100", 9357.40),
+    ("DOS MILLONES CIENTO UN MIL", 2101000.0),
+    ("CIEN", 100.0),
+])
+def test_text_to_float(texto, esperado):
+    assert text_to_float(texto) == pytest.approx(esperado)
+
+def test_extractores_sobre_texto():
+    texto = ("FACTURA ELECTRONICA RUC 20603718489 E001-676 Fecha de Emisión : 2025-07-09 "
+             "Cliente RUC 20170040938 Importe Total : S/ 9,357.40 SON: NUEVE MIL TRESCIENTOS CINCUENTA "
+             "Y SIETE CON 40/100 SOLES Monto neto pendiente de pago : S/ 8,983.10")
+    datos = {}
+    assert run_field_extractors(texto, datos) is True
+    assert datos == {
+        "emisor_ruc": "20603718489", "aceptante_ruc": "20170040938", "invoice_id": "E001-676",
+        "fecha_emision": "09-07-2025", "moneda": "PEN", "monto_total": 9357.4, "monto_neto": 8983.1,
+    }
+
+def test_coincidencia_debil_se_reemplaza_por_una_fuerte():
+    datos, fuertes = {}, set()
+    run_field_extractors("Emitida 01/02/2025", datos, fuertes)
+    assert datos["fecha_emision"] == "01-02-2025" and "fecha_emision" not in fuertes
+    run_field_extractors("Fecha de Emisión: 15/07/2025", datos, fuertes)
+    assert datos["fecha_emision"] == "15-07-2025" and "fecha_emision" in fuertes
+
+@pytest.mark.parametrize("nombre", sorted(FACTURAS) + ["perfiles_consolidados_20250814_204838.pdf"])
+def test_lectura_por_paginas_igual_que_completa(nombre):
+    ruta = _ruta(nombre)
+    assert extract_fields_from_pdf(ruta, lazy=True) == extract_fields_from_pdf(ruta)
+
+class _Pagina:
+    def __init__(self, texto, leidas):
+        self.texto, self.leidas = texto, leidas
+
+    def extract_text(self):
+        self.leidas.append(self.texto)
+        return self.texto
+
+    def flush_cache(self):
+        pass
+
+class _Pdf:
+    def __init__(self, *textos):
+        self.leidas = []
+        self.pages = [_Pagina(texto, self.leidas) for texto in textos]
+
+def test_campos_repartidos_en_varias_paginas():
+    pdf = _Pdf(
+        "FACTURA ELECTRONICA RUC 20603718489 E001-676 Emitida 01/07/2025",
+        "Cliente RUC 20170040938 Fecha de Emisión : 09/07/2025 Otra fecha 02/07/2025",
+        "Importe Total : S/ 9,357.40 SON: NUEVE MIL TRESCIENTOS CINCUENTA Y SIETE CON 40/100 SOLES "
+        "Monto neto pendiente de pago : S/ 8,983.10",
+    )
+    datos = {}
+    _extract_lazily(pdf, datos)
+    assert datos == {
+        "emisor_ruc": "20603718489", "aceptante_ruc": "20170040938", "invoice_id": "E001-676",
+        "fecha_emision": "09-07-2025", "moneda": "PEN", "monto_total": 9357.4, "monto_neto": 8983.1,
+    }
+
+def test_se_detiene_al_encontrar_los_campos():
+    completa = ("RUC 20603718489 RUC 20170040938 E001-676 Fecha de Emisión : 09/07/2025 "
+                "Importe Total : $ 1,000.00 SON: MIL CON 00/100 DOLARES Monto neto pendiente de pago : $ 950.00")
+    pdf = _Pdf(completa, "Anexo E002-1 20111111111", "Anexo")
+    datos = {}
+    _extract_lazily(pdf, datos)
+    assert pdf.leidas == [completa]
+    assert datos["invoice_id"] == "E001-676" and datos["moneda"] == "USD" and datos["monto_neto"] == 950.0
+
+def test_cada_pagina_se_lee_una_sola_vez():
+    pdf = _Pdf(*(f"Página {n} sin datos" for n in range(50)))
+    datos = {}
+    _extract_lazily(pdf, datos, max_pages=20)
+    assert len(pdf.leidas) == 20
+    assert datos == {}
@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from pool_navegadores import PoolNavegadores
+
+class _FabricaContadora:
+    """Fábrica de navegadores de mentira que cuenta cuántos hay abiertos a la vez."""
+    def __init__(self):
+        self.abiertos = 0
+        self.maximo_abiertos = 0
+        self.creados = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        fabrica = self
+
+        class _Navegador:
+            def quit(self):
+                with fabrica._lock:
+                    fabrica.abiertos -= 1
+
+        with self._lock:
+            self.abiertos += 1
+            self.creados += 1
+            self.maximo_abiertos = max(self.maximo_abiertos, self.abiertos)
+        return _Navegador()
+
+def test_cuarenta_prestamos_nunca_superan_el_tamano():
+    fabrica = _FabricaContadora()
+    pool = PoolNavegadores(tamano=3, usos_maximos=5, fabrica=fabrica)
+    en_uso = 0
+    maximo_en_uso = 0
+    lock = threading.Lock()
+    barrera = threading.Barrier(8)
+
+    def consulta(n):
+        nonlocal en_uso, maximo_en_uso
+        if n < 8:
+            barrera.wait(5) # Las primeras ocho consultas piden navegador a la vez
+        with pool.prestar(timeout=5):
+            with lock:
+                en_uso += 1
+                maximo_en_uso = max(maximo_en_uso, en_uso)
+            threading.Event().wait(0.002)
+            with lock:
+                en_uso -= 1
+            if n % 13 == 0:
+                raise ValueError("consulta fallida") # el navegador se descarta
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(consulta, n) for n in range(40)]
+        errores = sum(1 for future in futures if future.exception() is not None)
+
+    assert errores == 4
+    assert maximo_en_uso <= 3
+    assert fabrica.maximo_abiertos <= 3
+    estadisticas = pool.estadisticas()
+    assert estadisticas["prestados"] == 0
+    assert estadisticas["descartados"] == 4
+    assert fabrica.creados == estadisticas["creados"] > 3 # los descartados y reciclados se reemplazan
+
+    pool.cerrar()
+    assert fabrica.abiertos == 0
+
+def test_sin_cupo_el_prestamo_espera_y_vence():
+    pool = PoolNavegadores(tamano=1, fabrica=_FabricaContadora())
+    with pool.prestar():
+        with pytest.raises(TimeoutError):
+            with pool.prestar(timeout=0.05):
+                pass
+    with pool.prestar(timeout=0.05):
+        pass
@@ -0,0 +1,78 @@
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import cliente_http
+import ruc_lookup
+import sunat_query
+
+CARPETA_PAGINAS = os.path.join(os.path.dirname(__file__), "fixtures", "datosperu")
+
+class _PaginasGuardadas(SimpleHTTPRequestHandler):
+    """Sirve las páginas de fixtures/datosperu con las mismas rutas que datosperu.org."""
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/buscador_empresas.php":
+            nombre = f"buscador_{parse_qs(url.query).get('buscar', [''])[0]}.html"
+        else:
+            nombre = url.path.lstrip("/").replace(".php", ".html")
+        ruta = os.path.join(CARPETA_PAGINAS, os.path.basename(nombre))
+        if not os.path.exists(ruta):
+            self.send_error(404)
+            return
+        with open(ruta, "rb") as archivo:
+            contenido = archivo.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def servidor():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _PaginasGuardadas)
+    hilo = threading.Thread(target=httpd.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def datosperu_local(monkeypatch, servidor):
+    """Apunta los scrapers al servidor local (como DATOSPERU_BASE_URL) y prohíbe abrir navegadores."""
+    monkeypatch.setattr(ruc_lookup, "DATOSPERU_BASE_URL", servidor)
+    monkeypatch.setattr(sunat_query, "DATOSPERU_BASE_URL", servidor)
+    monkeypatch.setattr(cliente_http, "limitador_datosperu", cliente_http.LimitadorTasa(0))
+    def sin_navegador():
+        raise AssertionError("no debería abrir un navegador")
+    monkeypatch.setattr(ruc_lookup, "obtener_pool_navegadores", sin_navegador)
+    monkeypatch.setattr(sunat_query, "obtener_pool_navegadores", sin_navegador)
+    return servidor
+
+@pytest.mark.parametrize("ruc, esperado", [
+    ("20563361761", {"name": "ZEN HOLDINGS SAC", "address": "AV. EJEMPLO NRO. 100 LIMA - LIMA - MIRAFLORES", "status": "ACTIVO"}),
+    ("20512345678", {"name": "COMERCIAL ANDINA DEL SUR S.A.C.", "address": "JR. DE PRUEBA NRO. 250 AREQUIPA - AREQUIPA - CERCADO", "status": "BAJA DE OFICIO"}),
+    ("20600079070", {"name": "N/A", "address": "N/A", "status": "N/A"}),
+])
+def test_ficha_por_http(datosperu_local, ruc, esperado):
+    assert ruc_lookup.lookup_ruc_info(ruc, use_cache=False, mode="auto") == esperado
+
+def test_buscador_por_http(datosperu_local):
+    datos = sunat_query.get_company_data_from_datosperu("20563361761", use_cache=False, mode="auto")
+    assert datos["Razón Social"] == "ZEN HOLDINGS SAC"
+    assert datos["Estado"] == "ACTIVO"
+    assert sunat_query.get_company_data_from_datosperu("20600079070", use_cache=False, mode="auto") == {
+        "error": sunat_query.NOT_FOUND_MESSAGE
+    }
+
+def test_respuesta_404_es_error(datosperu_local):
+    # Sin página guardada el servidor responde 404: es un error (no se guarda en caché), no "no encontrado"
+    assert ruc_lookup.lookup_ruc_info("20512345679", use_cache=False, mode="http") == {"name": "Error", "address": "Error", "status": "Error"}
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from calculadora_factoring_V_CLI import (
+    _calcular_desglose_factura,
+    encontrar_tasa_de_avance,
+    procesar_lote_encontrar_tasa,
+)
+
+def _factura(rng):
+    mfn = round(rng.uniform(1000, 500000), 2)
+    factura = {
+        "plazo_operacion": rng.randint(1, 120),
+        "mfn": mfn,
+        "interes_mensual": rng.choice([0.0125, 0.015, 0.02]),
+        "comision_estructuracion_pct": 0.005,
+        "comision_minima_aplicable": rng.choice([10.0, 66.67]),
+        "igv_pct": 0.18,
+        "comision_afiliacion_aplicable": 200.0,
+        "aplicar_comision_afiliacion": rng.random() < 0.3,
+    }
+    # Objetivo alcanzable dentro de los límites por defecto [0.90, 1.00]
+    factura["monto_objetivo"] = (mfn * rng.uniform(0.90, 0.93) // 10) * 10
+    return factura
+
+def _desembolso_con_tasa(factura, resultado):
+    """Vuelve a calcular el desglose con la tasa encontrada y la comisión (sin redondear) de su método."""
+    tasa_avance = resultado["resultado_busqueda"]["tasa_avance_encontrada"]
+    comision_porcentual = factura["mfn"] * tasa_avance * factura["comision_estructuracion_pct"]
+    usa_porcentaje = round(comision_porcentual, 2) == resultado["calculo_con_tasa_encontrada"]["comision_estructuracion"]
+    return _calcular_desglose_factura(
+        plazo_operacion=factura["plazo_operacion"],
+        mfn=factura["mfn"],
+        tasa_avance=tasa_avance,
+        interes_mensual=factura["interes_mensual"],
+        comision_estructuracion_fija=comision_porcentual if usa_porcentaje else factura["comision_minima_aplicable"],
+        igv_pct=factura["igv_pct"],
+        comision_afiliacion_aplicable=factura["comision_afiliacion_aplicable"],
+        aplicar_comision_afiliacion=factura["aplicar_comision_afiliacion"],
+    )
+
+@pytest.mark.parametrize("semilla", range(30))
+def test_modo_exacto_cerca_de_la_solucion_cerrada(semilla):
+    factura = _factura(random.Random(semilla))
+    cerrado = encontrar_tasa_de_avance(**factura)
+    exacto = encontrar_tasa_de_avance(modo="exacto", **factura)
+
+    assert exacto["resultado_busqueda"]["convergio"]
+    assert 0.90 <= exacto["resultado_busqueda"]["tasa_avance_encontrada"] <= 1.00
+    assert exacto["resultado_busqueda"]["tasa_avance_encontrada"] == pytest.approx(
+        cerrado["resultado_busqueda"]["tasa_avance_encontrada"], abs=1e-5
+    )
+    assert exacto["resultado_busqueda"]["abono_real_calculado"] == factura["monto_objetivo"]
+
+@pytest.mark.parametrize("semilla", range(30))
+def test_modo_exacto_reproduce_el_objetivo_al_centimo(semilla):
+    factura = _factura(random.Random(semilla))
+    exacto = encontrar_tasa_de_avance(modo="exacto", **factura)
+    desglose = _desembolso_con_tasa(factura, exacto)
+    assert desglose["abono_real_teorico"] == factura["monto_objetivo"]
+    assert desglose["monto_desembolsado"] == factura["monto_objetivo"]
+
+def test_objetivo_fuera_de_los_limites_no_converge():
+    factura = _factura(random.Random(0))
+    factura["monto_objetivo"] = factura["mfn"] * 2
+    exacto = encontrar_tasa_de_avance(modo="exacto", **factura)
+    assert exacto["resultado_busqueda"]["convergio"] is False
+    assert exacto["resultado_busqueda"]["iteraciones"] == 0
+
+def test_modo_desconocido_se_rechaza():
+    factura = _factura(random.Random(0))
+    with pytest.raises(ValueError):
+        encontrar_tasa_de_avance(modo="exact", **factura)
+    with pytest.raises(ValueError):
+        procesar_lote_encontrar_tasa([factura], modo="aproximado")
+
+@pytest.mark.parametrize("tolerancia", [0.02, 0.05, 0.0, -0.01])
+def test_tolerancia_fuera_de_un_centimo_se_rechaza(tolerancia):
+    # Con una ventana de más de un céntimo el abono aceptado puede redondear por encima del objetivo
+    factura = _factura(random.Random(0))
+    with pytest.raises(ValueError):
+        encontrar_tasa_de_avance(modo="exacto", tolerancia=tolerancia, **factura)
+    with pytest.raises(ValueError):
+        procesar_lote_encontrar_tasa([dict(factura, tolerancia=tolerancia)], modo="exacto")
+
+@pytest.mark.parametrize("semilla", range(10))
+def test_tolerancia_menor_sigue_reproduciendo_el_objetivo(semilla):
+    factura = _factura(random.Random(semilla))
+    exacto = encontrar_tasa_de_avance(modo="exacto", tolerancia=0.004, **factura)
+    assert exacto["resultado_busqueda"]["convergio"]
+    assert _desembolso_con_tasa(factura, exacto)["abono_real_teorico"] == factura["monto_objetivo"]
+
+def test_lote_exacto_sin_errores():
+    lote = [_factura(random.Random(semilla)) for semilla in range(200)]
+    resultado = procesar_lote_encontrar_tasa(lote, modo="exacto")
+    assert all("error" not in r for r in resultado["resultados_por_factura"])
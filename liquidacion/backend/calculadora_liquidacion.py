@@ -1,5 +1,11 @@
 
 import datetime
+import os
+import sys
+
+# Añadir el directorio 'backend' del proyecto al path para importar la tabla de factores compartida
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'backend')))
+from factor_interes import factor_interes_compuesto
 
 def _safe_get(data: dict, key: str, default_value=0, target_type=float):
     """
@@ -56,18 +62,17 @@ def calcular_liquidacion(
 
     # 4. Lógica de cálculo principal
     if dias_diferencia > 0:  # Pago Tardío
-        interes_compensatorio = capital_desembolsado * (pow(1 + tasa_diaria_compensatoria, dias_diferencia) - 1)
+        interes_compensatorio = capital_desembolsado * factor_interes_compuesto(tasa_interes_compensatorio_pct / 100, dias_diferencia)
         igv_interes_compensatorio = interes_compensatorio * igv_pct
         base_moratorio = capital_desembolsado + interes_compensatorio
-        interes_moratorio = base_moratorio * (pow(1 + tasa_diaria_moratoria, dias_diferencia) - 1)
+        interes_moratorio = base_moratorio * factor_interes_compuesto(tasa_interes_moratorio_pct / 100, dias_diferencia)
         igv_interes_moratorio = interes_moratorio * igv_pct
 
     elif dias_diferencia < 0:  # Pago Anticipado
         dias_anticipacion = abs(dias_diferencia)
-        tasa_diaria_original = (interes_mensual_pct / 100) / 30
         plazo_real = plazo_operacion_original - dias_anticipacion
         if plazo_real < 0: plazo_real = 0
-        interes_real_calculado = capital_desembolsado * (((1 + tasa_diaria_original) ** plazo_real) - 1)
+        interes_real_calculado = capital_desembolsado * factor_interes_compuesto(interes_mensual_pct / 100, plazo_real)
         interes_a_devolver = interes_original - interes_real_calculado
         igv_interes_a_devolver = interes_a_devolver * igv_pct
 
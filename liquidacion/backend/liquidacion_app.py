@@ -1,7 +1,6 @@
 import streamlit as st
 import sys
 import os
-import json
 import requests
 from datetime import datetime
 
@@ -38,19 +37,12 @@ def display_operation_profile(data):
     """
     st.subheader("Perfil de la Operación Original")
 
-    recalc_result_json = data.get('recalculate_result_json')
-    if not recalc_result_json:
+    # get_proposal_details_by_id devuelve la columna JSONB ya convertida a dict
+    recalc_result = data.get('recalculate_result_json')
+    if not recalc_result:
         st.warning("No se encontraron datos del perfil de operación original para mostrar.")
         return
 
-    try:
-        recalc_result = json.loads(recalc_result_json)
-    except json.JSONDecodeError:
-        st.error("Error al leer los datos del perfil de operación original.")
-        with st.expander("Ver JSON con error"):
-            st.json(recalc_result_json)
-        return
-
     # Extraer datos para la cabecera y la tabla
     desglose = recalc_result.get('desglose_final_detallado', {})
     calculos = recalc_result.get('calculo_con_tasa_encontrada', {})
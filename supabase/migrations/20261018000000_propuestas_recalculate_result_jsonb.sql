@@ -0,0 +1,20 @@
+-- Resultado completo del Paso 2 como JSON estructurado.
+-- Las filas antiguas lo guardaban como texto serializado con json.dumps; el cast las convierte.
+-- Con la columna en jsonb, PostgREST puede proyectar rutas dentro de ella (recalculate_result_json->a->b),
+-- que es lo que usa get_proposal_for_liquidation. Es idempotente: no hace nada si la columna ya es jsonb.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+          AND table_name = 'propuestas'
+          AND column_name = 'recalculate_result_json'
+          AND data_type <> 'jsonb'
+    ) THEN
+        ALTER TABLE public.propuestas
+            ALTER COLUMN recalculate_result_json TYPE jsonb
+            USING NULLIF(recalculate_result_json::text, '')::jsonb;
+    END IF;
+END
+$$;
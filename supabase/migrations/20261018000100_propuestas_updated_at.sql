@@ -0,0 +1,15 @@
+-- Marca de modificación para el espejo local de propuestas (backend/espejo_propuestas.py).
+-- Cada sincronización trae solo las filas con updated_at >= la última marca copiada, así que la
+-- columna debe existir y actualizarse en cada UPDATE (trigger moddatetime).
+CREATE EXTENSION IF NOT EXISTS moddatetime SCHEMA extensions;
+
+ALTER TABLE public.propuestas
+    ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_propuestas_updated_at
+    ON public.propuestas (updated_at, proposal_id);
+
+DROP TRIGGER IF EXISTS propuestas_updated_at ON public.propuestas;
+CREATE TRIGGER propuestas_updated_at
+    BEFORE UPDATE ON public.propuestas
+    FOR EACH ROW EXECUTE PROCEDURE extensions.moddatetime (updated_at);